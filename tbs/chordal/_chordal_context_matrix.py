@@ -5,12 +5,13 @@ from ._chordal_order import chordal_order
 __all__ = ["chordal_context_matrix"]
 
 
-def chordal_context_matrix(d, order=None):
+def chordal_context_matrix(d, order=None, storage="dense"):
     """ Context Matrix of a chordal dissimilarity.
 
     Args:
         d(Diss): chordal dissimilarity
         order(list): If None an order is first searched, must be a chordal order (thus also d) otherwise.
+        storage(str): matrix storage (see :class:`tbs.contextmatrix.ContextMatrix`).
 
     The line are ordered by a chordal order (parameter order if given) and the columns by inclusion following
     the reverse order.
@@ -27,7 +28,7 @@ def chordal_context_matrix(d, order=None):
     for order_clusters in reversed(sort_clusters_by_order(clusters, order)):
         columns_clusters.extend(order_clusters)
 
-    return ContextMatrix.from_clusters(columns_clusters, order)
+    return ContextMatrix.from_clusters(columns_clusters, order, storage)
 
 
 def chordal_clusters(d, order=None):
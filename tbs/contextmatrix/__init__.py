@@ -17,12 +17,18 @@ Module content
 """
 
 from ._context_matrix import ContextMatrix
+from ._bit_matrix import BitMatrix
+from ._matrix_view import MatrixView
+from ._sparse_matrix import SparseMatrix
+from ._mapped_bit_matrix import MappedBitMatrix
+from ._overlay_matrix import OverlayMatrix
 from ._to_string import to_string
-from ._file_io import load, save
+from ._file_io import load, load_stream, save, load_binary, save_binary
 
 __author__ = 'francois'
 
-__all__ = ["ContextMatrix", "load", "save", "to_string"]
+__all__ = ["ContextMatrix", "BitMatrix", "MatrixView", "SparseMatrix", "MappedBitMatrix", "OverlayMatrix", "load",
+           "load_stream", "save", "load_binary", "save_binary", "to_string"]
 
 
 
@@ -0,0 +1,280 @@
+"""Bit-packed 0/1 matrix.
+
+Each line is stored as a python integer whose bit *j* is set iff the cell (line, *j*) is equal to 1. Columns are
+packed the same way (bit *i* for line *i*) on demand. Intersections of lines or columns are thus a single `&` and
+their size a popcount.
+"""
+
+__author__ = 'fbrucker'
+
+__all__ = ["BitMatrix", "BitLine", "pack_line", "popcount", "ones"]
+
+
+def pack_line(line):
+    """Integer whose bit j is line[j].
+
+    Args:
+        line(iterable): 0/1 values. Any :class:`BitLine` is packed in O(1).
+
+    Returns(int): the packed line.
+    """
+
+    if isinstance(line, BitLine):
+        return line.bits
+
+    bits = "".join(x and "1" or "0" for x in reversed(tuple(line)))
+    return bits and int(bits, 2) or 0
+
+
+def popcount(bits):
+    """Number of 1 in the binary representation of *bits*."""
+
+    return bin(bits).count("1")
+
+
+def ones(bits):
+    """Increasing indices of the bits set to 1 in *bits*.
+
+    Complexity is linear in the number of bits set.
+    """
+
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class BitLine(object):
+    """Read-only sequence view of a packed line."""
+
+    __slots__ = ("bits", "_length")
+
+    def __init__(self, bits, length):
+        self.bits = bits
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return tuple(self)[j]
+        if j < 0:
+            j += self._length
+        if not 0 <= j < self._length:
+            raise IndexError("line index out of range")
+        return (self.bits >> j) & 1
+
+    def __iter__(self):
+        bits = self.bits
+        for j in range(self._length):
+            yield (bits >> j) & 1
+
+    def __eq__(self, other):
+        if isinstance(other, BitLine):
+            return self._length == other._length and self.bits == other.bits
+        try:
+            return len(other) == self._length and tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class BitMatrix(object):
+    """Bit-packed 0/1 matrix.
+
+    Behaves as a read-only tuple of lines: ``matrix[i][j]``, ``len(matrix)`` and iteration work as for a tuple of
+    tuples. Reordering, transposition and insertions return new matrices.
+    """
+
+    storage = "bits"
+
+    def __init__(self, matrix, number_columns=None):
+        """Pack a 0/1 matrix.
+
+        Args:
+            matrix(iterable): list of lines. Each line is either an iterable of 0/1 or an already packed integer
+                (*number_columns* is then mandatory).
+            number_columns(int): number of columns. Length of the first line by default.
+        """
+
+        if isinstance(matrix, BitMatrix):
+            self._lines = matrix._lines
+            self._number_columns = matrix._number_columns
+            self._columns = matrix._columns
+            return
+
+        lines = []
+        for line in matrix:
+            if isinstance(line, int):
+                lines.append(line)
+            else:
+                if number_columns is None:
+                    number_columns = len(line)
+                lines.append(pack_line(line))
+
+        self._lines = tuple(lines)
+        self._number_columns = number_columns or 0
+        self._columns = None
+
+    @classmethod
+    def from_ones(cls, lines_ones, number_columns):
+        """Matrix from the column indices of each line 1.
+
+        Args:
+            lines_ones(iterable): for each line, iterable of the columns containing a 1.
+            number_columns(int): number of columns.
+        """
+
+        lines = []
+        for line_ones in lines_ones:
+            bits = 0
+            for j in line_ones:
+                bits |= 1 << j
+            lines.append(bits)
+
+        return cls(lines, number_columns)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(BitLine(bits, self._number_columns) for bits in self._lines[i])
+        return BitLine(self._lines[i], self._number_columns)
+
+    def __iter__(self):
+        for bits in self._lines:
+            yield BitLine(bits, self._number_columns)
+
+    def __eq__(self, other):
+        if isinstance(other, BitMatrix):
+            return self._number_columns == other._number_columns and self._lines == other._lines
+        try:
+            return len(other) == len(self) and all(line == other_line for line, other_line in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(tuple(tuple(line) for line in self))
+
+    @property
+    def number_columns(self):
+        return self._number_columns
+
+    def line(self, i):
+        """Packed line *i* (bit j is the cell (i, j))."""
+
+        return self._lines[i]
+
+    def column(self, j):
+        """Packed column *j* (bit i is the cell (i, j)).
+
+        All the columns are packed the first time one of them is asked for, in O(number of 1).
+        """
+
+        if self._columns is None:
+            columns = [0] * self._number_columns
+            for i, bits in enumerate(self._lines):
+                bit_i = 1 << i
+                for column in ones(bits):
+                    columns[column] |= bit_i
+            self._columns = tuple(columns)
+
+        return self._columns[j]
+
+    def ones(self, i):
+        """Increasing column indices of the 1 of line *i*."""
+
+        return ones(self._lines[i])
+
+    def count(self):
+        """Number of 1 of the matrix."""
+
+        return sum(popcount(bits) for bits in self._lines)
+
+    def lines_intersection(self, i1, i2):
+        """Number of columns with a 1 on both lines *i1* and *i2*."""
+
+        return popcount(self._lines[i1] & self._lines[i2])
+
+    def columns_intersection(self, j1, j2):
+        """Number of lines with a 1 on both columns *j1* and *j2*."""
+
+        return popcount(self.column(j1) & self.column(j2))
+
+    def transpose(self):
+        """Transposed matrix. Uses the packed columns, thus O(number of 1) the first time."""
+
+        if self._number_columns:
+            self.column(0)
+        transpose = BitMatrix(self._columns or tuple(), len(self._lines))
+        transpose._columns = self._lines
+        return transpose
+
+    def reorder_lines(self, permutation):
+        """New matrix whose line i is line permutation[i]."""
+
+        lines = self._lines
+        return BitMatrix([lines[i] for i in permutation], self._number_columns)
+
+    def reorder_columns(self, permutation):
+        """New matrix whose column j is column permutation[j].
+
+        Complexity is O(number of 1).
+        """
+
+        position = [0] * len(permutation)
+        for j, old_j in enumerate(permutation):
+            position[old_j] = j
+
+        new_lines = []
+        for bits in self._lines:
+            new_bits = 0
+            for j in ones(bits):
+                new_bits |= 1 << position[j]
+            new_lines.append(new_bits)
+
+        return BitMatrix(new_lines, self._number_columns)
+
+    def insert_line(self, position, line):
+        """New matrix with *line* (0/1 values or a packed integer) inserted at line *position*.
+
+        Complexity is O(number of lines): packed lines are shared, not copied.
+        """
+
+        bits = line if isinstance(line, int) else pack_line(line)
+        return BitMatrix(self._lines[:position] + (bits, ) + self._lines[position:], self._number_columns)
+
+    def insert_column(self, position, column):
+        """New matrix with *column* (column[i] is the new cell of line i) inserted at column *position*.
+
+        Each packed line is split at bit *position*, thus O(number of lines) integer operations. Packed columns, if
+        computed, are kept.
+        """
+
+        column = tuple(column)
+        low = (1 << position) - 1
+        matrix = BitMatrix([(bits & low) | ((x and 1) << position) | ((bits >> position) << (position + 1))
+                            for bits, x in zip(self._lines, column)], self._number_columns + 1)
+        if self._columns is not None:
+            matrix._columns = self._columns[:position] + (pack_line(column), ) + self._columns[position:]
+        return matrix
+
+    def submatrix_lines(self, line_indices):
+        """New matrix made of the lines in *line_indices* (in this order)."""
+
+        return self.reorder_lines(line_indices)
@@ -0,0 +1,134 @@
+"""Doubly lexical order by connected components.
+
+Two lines are connected if they have a 1 in a common column. Each connected component of lines, with the columns of
+its 1, forms an independent block of the matrix. Putting the zero lines and columns first, then the blocks along the
+diagonal (in any order), each one doubly lexically ordered, gives a doubly lexical order of the whole matrix: the
+lines (resp. columns) of a block are lexically smaller than the ones of the following blocks.
+
+Blocks are ordered independently, possibly in parallel processes.
+"""
+
+import concurrent.futures
+import os
+
+from ._order import doubly_lexical_order
+from ._partition_refinement import lines_ones, partition_refinement_doubly_lexical_order
+from ._sparse_matrix import SparseMatrix
+
+__author__ = 'fbrucker'
+
+__all__ = ["connected_components", "components_doubly_lexical_order"]
+
+
+def connected_components(matrix):
+    """Blocks of the matrix.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+
+    :return: (zero lines, zero columns, components) where each component is a couple (lines, columns) of increasing
+        index lists.
+    """
+
+    return _connected_components(lines_ones(matrix), len(matrix) and len(matrix[0]) or 0)
+
+
+def _connected_components(ones, number_columns):
+    parent = list(range(len(ones)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    column_line = [None] * number_columns
+    for i, line in enumerate(ones):
+        for j in line:
+            if column_line[j] is None:
+                column_line[j] = i
+            else:
+                root, other_root = find(i), find(column_line[j])
+                if root != other_root:
+                    parent[root] = other_root
+
+    components = dict()
+    zero_lines = []
+    for i, line in enumerate(ones):
+        if line:
+            components.setdefault(find(i), ([], []))[0].append(i)
+        else:
+            zero_lines.append(i)
+
+    zero_columns = []
+    for j, i in enumerate(column_line):
+        if i is None:
+            zero_columns.append(j)
+        else:
+            components[find(i)][1].append(j)
+
+    return zero_lines, zero_columns, list(components.values())
+
+
+def _block_order(engine, block_lines_ones, number_columns, order):
+    """Doubly lexical order of a block given by the (local) column indices of the 1 of its lines.
+
+    The partition refinement engine only reads the 1 of each line: its block is a :class:`SparseMatrix`, whose size
+    is proportional to the number of 1. Other engines read the block cell by cell and get a list of lists.
+    """
+
+    if engine is partition_refinement_doubly_lexical_order:
+        return engine(SparseMatrix.from_ones(block_lines_ones, number_columns), order)
+
+    block = []
+    for line_ones in block_lines_ones:
+        line = [0] * number_columns
+        for j in line_ones:
+            line[j] = 1
+        block.append(line)
+
+    return engine(block, order)
+
+
+def components_doubly_lexical_order(matrix, order=None, engine=doubly_lexical_order, max_workers=None):
+    """Return a doubly lexical order, computed independently on each block of the matrix.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+    :param order: prefered line order. A list of lists. As it can impose an order between lines of different blocks,
+        the matrix is not split into blocks if it is given: the result is `engine(matrix, order)`.
+    :param engine: doubly lexical order function (see :func:`tbs.contextmatrix._order.doubly_lexical_order`). Must
+        be picklable if blocks are ordered in parallel.
+    :param max_workers: number of processes. Blocks are ordered in the current process if equal to 1, in a
+        :class:`concurrent.futures.ProcessPoolExecutor` of *max_workers* processes otherwise (None for the number of
+        processors).
+
+    :rtype: couple of line and column permutation
+    """
+
+    if order is not None:
+        return engine(matrix, order)
+
+    ones = lines_ones(matrix)
+    zero_lines, zero_columns, components = _connected_components(ones, len(matrix) and len(matrix[0]) or 0)
+
+    tasks = []
+    for component_lines, component_columns in components:
+        local_column = {j: k for k, j in enumerate(component_columns)}
+        tasks.append(([[local_column[j] for j in ones[i]] for i in component_lines], len(component_columns), None))
+
+    if max_workers == 1 or len(tasks) <= 1:
+        block_orders = [_block_order(engine, *task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            number_workers = max_workers or os.cpu_count() or 1
+            block_orders = list(executor.map(_block_order, *zip(*[(engine, ) + task for task in tasks]),
+                                             chunksize=max(1, len(tasks) // (4 * number_workers))))
+
+    lines = list(zero_lines)
+    columns = list(zero_columns)
+    for (component_lines, component_columns), (block_lines, block_columns) in zip(components, block_orders):
+        lines.extend(component_lines[i] for i in block_lines)
+        columns.extend(component_columns[j] for j in block_columns)
+
+    return lines, columns
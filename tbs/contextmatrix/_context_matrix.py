@@ -1,11 +1,65 @@
-from ._order import doubly_lexical_order, is_doubly_lexically_ordered
+from ._order import doubly_lexical_order, is_doubly_lexically_ordered, doubly_lexical_violation
+from ._partition_refinement import partition_refinement_doubly_lexical_order
 from ._to_string import to_string
+from ._bit_matrix import BitMatrix
+from ._matrix_view import MatrixView
+from ._sparse_matrix import SparseMatrix
+from ._mapped_bit_matrix import MappedBitMatrix
+from ._overlay_matrix import OverlayMatrix
+from ._components import components_doubly_lexical_order
+from ._incremental import insert_line, line_differences, column_differences
+
+STORAGES = {"dense": lambda matrix: tuple(tuple(line) for line in matrix),
+            "bits": BitMatrix,
+            "view": MatrixView,
+            "sparse": SparseMatrix,
+            "mapped": MappedBitMatrix,
+            "overlay": OverlayMatrix}
+
+DOUBLY_LEXICAL_ENGINES = {"blocks": doubly_lexical_order,
+                          "refinement": partition_refinement_doubly_lexical_order}
+
+
+def matrix_from_ones(lines_ones, number_columns, storage="dense"):
+    """Matrix in the given storage from the column indices of each line 1.
+
+    Storages having a `from_ones` constructor never build the dense matrix.
+
+    Args:
+        lines_ones(list): for each line, iterable of the columns containing a 1.
+        number_columns(int): number of columns.
+        storage(str): matrix storage (see :meth:`ContextMatrix.__init__`).
+
+    Returns: the matrix, to be given to :class:`ContextMatrix` with the same *storage*.
+    """
+
+    if hasattr(STORAGES.get(storage), "from_ones"):
+        return STORAGES[storage].from_ones(lines_ones, number_columns)
+
+    matrix = []
+    for line_ones in lines_ones:
+        line = [0] * number_columns
+        for j in line_ones:
+            line[j] = 1
+        matrix.append(line)
+
+    return matrix
+
+
+def labels_indices(labels):
+    """Label to index dictionary. If a label appears several times, its first index is kept."""
+
+    indices = dict()
+    for i, label in enumerate(labels):
+        indices.setdefault(label, i)
+
+    return indices
 
 
 class ContextMatrix(object):
     """Context matrix."""
 
-    def __init__(self, matrix, elements=tuple(), attributes=tuple()):
+    def __init__(self, matrix, elements=tuple(), attributes=tuple(), storage="dense"):
         """Context matrix
 
         Args:
@@ -16,22 +70,37 @@ class ContextMatrix(object):
                 number by default.
             attributes(list of hashable): Attributes name. Length must coincide with the *matrix* number of columns.
                 Column number by default.
-            copy_matrix(bool): if False link the matrix, copy it otherwise.
+            storage(str): how the matrix is stored. "dense" is a tuple of tuples, "bits" a
+                :class:`tbs.contextmatrix.BitMatrix` whose lines (and columns, lazily) are packed into integers and
+                "view" a :class:`tbs.contextmatrix.MatrixView` linking (not copying) *matrix*: reorderings and
+                transposition only update index correspondences. "sparse" is a
+                :class:`tbs.contextmatrix.SparseMatrix` (CSR/CSC) whose size is proportional to the number of 1.
+                "mapped" a :class:`tbs.contextmatrix.MappedBitMatrix` whose packed lines are read on demand from a
+                (memory-mapped) buffer. "overlay" a :class:`tbs.contextmatrix.OverlayMatrix` linking *matrix* and
+                storing only the cells where it differs from it.
         """
 
-        self._matrix = tuple(tuple(line) for line in matrix)
+        if storage not in STORAGES:
+            raise ValueError("unknown storage " + repr(storage) + ". Must be in " + repr(sorted(STORAGES)))
+        self._matrix = STORAGES[storage](matrix)
 
         self._elements = elements and tuple(elements) or tuple(range(len(self._matrix)))
         self._attributes = attributes and tuple(attributes) or tuple(range(len(self._matrix[0])))
+        self._elements_indices = None
+        self._attributes_indices = None
+        self._line_difference = None
+        self._column_difference = None
+        self._doubly_lexical_engine = "blocks"
+        self._doubly_lexical_order = None
 
     @classmethod
     def from_context_matrix(cls, context_matrix):
         """copy of an existent context matrix."""
 
-        return cls(context_matrix.matrix, context_matrix.elements, context_matrix.attributes)
+        return cls(context_matrix.matrix, context_matrix.elements, context_matrix.attributes, context_matrix.storage)
 
     @classmethod
-    def from_lattice(cls, lattice):
+    def from_lattice(cls, lattice, storage="dense"):
         """ Context matrix from Lattice
 
         the elements are the sup-irreducibles elements
@@ -39,6 +108,7 @@ class ContextMatrix(object):
 
         Args:
             lattice(Lattice): cover graph of some lattice.
+            storage(str): matrix storage (see :meth:`__init__`).
         """
 
         inf = list(lattice.inf_irreducible)
@@ -47,26 +117,25 @@ class ContextMatrix(object):
         sup = list(lattice.sup_irreducible)
         sup_indices = {x: i for i, x in enumerate(sup)}
 
-        matrix = []
-        for i in range(len(sup)):
-            matrix.append([0] * len(inf))
+        matrix_ones = [[] for i in range(len(sup))]
 
         order = lattice.directed_comparability
         for vertex in sup:
             sup_index = sup_indices[vertex]
             for x in order(vertex, closed=True):
                 if x in inf_indices:
-                    matrix[sup_index][inf_indices[x]] = 1
+                    matrix_ones[sup_index].append(inf_indices[x])
 
-        return cls(matrix, sup, inf)
+        return cls(matrix_from_ones(matrix_ones, len(inf), storage), sup, inf, storage)
 
     @classmethod
-    def from_clusters(cls, clusters, elements=None):
+    def from_clusters(cls, clusters, elements=None, storage="dense"):
         """
 
         Args:
             clusters(iterable): iterable of iterable from a base set. Forms the column order.
             elements(iterable): line order. If None, is union of all the clusters.
+            storage(str): matrix storage (see :meth:`__init__`).
         """
 
         if elements is None:
@@ -78,15 +147,13 @@ class ContextMatrix(object):
 
         correspondance = {elem: index for index, elem in enumerate(elements)}
 
-        matrix = []
-        for i in range(len(elements)):
-            matrix.append([0] * len(clusters))
+        matrix_ones = [[] for i in range(len(elements))]
 
         for j, cluster in enumerate(clusters):
             for elem in cluster:
-                matrix[correspondance[elem]][j] = 1
+                matrix_ones[correspondance[elem]].append(j)
 
-        return cls(matrix, elements=elements)
+        return cls(matrix_from_ones(matrix_ones, len(clusters), storage), elements=elements, storage=storage)
 
     @classmethod
     def from_json(cls, json_matrix):
@@ -106,13 +173,21 @@ class ContextMatrix(object):
         returns(dict): {"elements": [,], "attributes": [,], "matrix": [[]]}
         """
 
-        return {"matrix": self.matrix, "elements": self.elements, "attributes": self.attributes}
+        matrix = self.matrix
+        if self.storage != "dense":
+            matrix = tuple(tuple(line) for line in matrix)
+
+        return {"matrix": matrix, "elements": self.elements, "attributes": self.attributes}
 
     def transpose(self):
         """ Return the transpose.
 
         Returns(ContextMatrix): The transpose.
         """
+
+        if self.storage != "dense":
+            return ContextMatrix(self._matrix.transpose(), self.attributes, self.elements, self.storage)
+
         matrix = []
         for i in range(len(self._matrix[0])):
             matrix.append([0] * len(self._matrix))
@@ -132,7 +207,7 @@ class ContextMatrix(object):
         :rtype: ContextMatrix :class:`tbs.contextmatrix.ContextMatrix`
         """
 
-        return self.submatrix_elements_indices([self.elements.index(element) for element in elements])
+        return self.submatrix_elements_indices([self.element_index(element) for element in elements])
 
     def submatrix_elements_indices(self, element_indices):
         """Submatrix with only selected element indices
@@ -143,9 +218,13 @@ class ContextMatrix(object):
         :rtype: ContextMatrix :class:`tbs.contextmatrix.ContextMatrix`
         """
 
-        submatrix = [self._matrix[i] for i in sorted(element_indices)]
-        submatrix_elements = [self.elements[i] for i in sorted(element_indices)]
-        return ContextMatrix(submatrix, submatrix_elements, self.attributes)
+        element_indices = sorted(element_indices)
+        if self.storage != "dense":
+            submatrix = self._matrix.submatrix_lines(element_indices)
+        else:
+            submatrix = [self._matrix[i] for i in element_indices]
+        submatrix_elements = [self.elements[i] for i in element_indices]
+        return ContextMatrix(submatrix, submatrix_elements, self.attributes, self.storage)
 
     def __str__(self):
         return to_string(self)
@@ -156,6 +235,7 @@ class ContextMatrix(object):
                         repr(self.matrix),
                         ", ", "elements=", repr(self.elements),
                         ", ", "attributes=", repr(self.attributes),
+                        self.storage != "dense" and ", storage=" + repr(self.storage) or "",
                         ")"])
 
     @property
@@ -169,6 +249,12 @@ class ContextMatrix(object):
 
         return self._matrix
 
+    @property
+    def storage(self):
+        """Name of the matrix storage ("dense" for a tuple of tuples)."""
+
+        return getattr(self._matrix, "storage", "dense")
+
     @property
     def attributes(self):
         """attributes."""
@@ -184,6 +270,7 @@ class ContextMatrix(object):
         if len(attributes) != len(self._matrix[0]):
             raise ValueError("wrong size. Must be equal to the number of attributes")
         self._attributes = tuple(attributes)
+        self._attributes_indices = None
 
     @property
     def elements(self):
@@ -200,6 +287,58 @@ class ContextMatrix(object):
         if len(elements) != len(self._matrix):
             raise ValueError("wrong size. Must be equal to the number of elements")
         self._elements = tuple(elements)
+        self._elements_indices = None
+
+    def element_index(self, element):
+        """Line index of *element*.
+
+        The label to index dictionary is computed once (in O(number of elements)) and kept until the elements
+        change, thus each call is O(1).
+
+        Raises:
+            ValueError: if *element* is not an element.
+        """
+
+        if self._elements_indices is None:
+            self._elements_indices = labels_indices(self._elements)
+
+        try:
+            return self._elements_indices[element]
+        except KeyError:
+            raise ValueError(repr(element) + " is not an element")
+
+    def attribute_index(self, attribute):
+        """Column index of *attribute*, in O(1) (see :meth:`element_index`).
+
+        Raises:
+            ValueError: if *attribute* is not an attribute.
+        """
+
+        if self._attributes_indices is None:
+            self._attributes_indices = labels_indices(self._attributes)
+
+        try:
+            return self._attributes_indices[attribute]
+        except KeyError:
+            raise ValueError(repr(attribute) + " is not an attribute")
+
+    def has_element(self, element):
+        """True if *element* is an element, in O(1)."""
+
+        try:
+            self.element_index(element)
+        except ValueError:
+            return False
+        return True
+
+    def has_attribute(self, attribute):
+        """True if *attribute* is an attribute, in O(1)."""
+
+        try:
+            self.attribute_index(attribute)
+        except ValueError:
+            return False
+        return True
 
     def reorder_elements(self, permutation):
         """Line reordering.
@@ -209,9 +348,7 @@ class ContextMatrix(object):
             in the new context matrix.
         """
 
-        index_correspondence = {element: i for i, element in enumerate(self.elements)}
-
-        self.reorder_lines([index_correspondence[e] for e in permutation])
+        self.reorder_lines([self.element_index(e) for e in permutation])
 
     def reorder_lines(self, permutation):
         """Line reordering.
@@ -220,6 +357,12 @@ class ContextMatrix(object):
             permutation(list): permutation index list. current line number i will be line number permutation[i].
         """
 
+        self._line_difference = self._column_difference = None
+        if self.storage != "dense":
+            self.elements = tuple(self.elements[i] for i in permutation)
+            self._matrix = self._matrix.reorder_lines(permutation)
+            return
+
         new_elements = [""] * len(self.elements)
         new_matrix = [[], ] * len(self.elements)
         for i in range(len(self.elements)):
@@ -236,9 +379,7 @@ class ContextMatrix(object):
             column in the new context matrix.
         """
 
-        index_correspondence = {attribute: i for i, attribute in enumerate(self.attributes)}
-
-        self.reorder_columns([index_correspondence[a] for a in permutation])
+        self.reorder_columns([self.attribute_index(a) for a in permutation])
 
     def reorder_columns(self, permutation):
         """Column reordering.
@@ -247,12 +388,17 @@ class ContextMatrix(object):
             permutation(list): permutation index list. current column number i will be column number permutation[i].
         """
 
+        self._line_difference = self._column_difference = None
         new_attributes = [""] * len(self.attributes)
 
         for i in range(len(self.attributes)):
             new_attributes[i] = self.attributes[permutation[i]]
         self.attributes = tuple(new_attributes)
 
+        if self.storage != "dense":
+            self._matrix = self._matrix.reorder_columns(permutation)
+            return
+
         new_matrix = [[], ] * len(self.elements)
         for i in range(len(self._matrix)):
             new_line = [0] * len(self._matrix[i])
@@ -266,10 +412,188 @@ class ContextMatrix(object):
 
         return is_doubly_lexically_ordered(self.matrix)
 
-    def reorder_doubly_lexical(self, order=None):
-        lines, columns = doubly_lexical_order(self._matrix, order)
+    def doubly_lexical_violation(self):
+        """First consecutive lines or columns breaking the doubly lexical order.
+
+        Returns: None if the matrix is doubly lexically ordered, ("lines", i, i + 1) or ("columns", j, j + 1)
+            otherwise (see :func:`tbs.contextmatrix._order.doubly_lexical_violation`).
+        """
+
+        return doubly_lexical_violation(self.matrix)
+
+    def reorder_doubly_lexical(self, order=None, engine="blocks", parallel=False, max_workers=None):
+        """Doubly lexical reordering.
+
+        Args:
+            order(list): prefered line order. A list of lists.
+            engine(str): "blocks" (:func:`tbs.contextmatrix._order.doubly_lexical_order`) or "refinement"
+                (:func:`tbs.contextmatrix._partition_refinement.partition_refinement_doubly_lexical_order`, whose
+                complexity depends on the number of 1 rather than on the size of the matrix).
+            parallel(bool): if True, the independent blocks of the matrix (connected components of lines sharing
+                columns) are ordered in parallel processes, see
+                :func:`tbs.contextmatrix._components.components_doubly_lexical_order`.
+            max_workers(int): number of processes if *parallel*. None for the number of processors.
+
+        Returns(ContextMatrix): self.
+        """
+
+        if engine not in DOUBLY_LEXICAL_ENGINES:
+            raise ValueError("unknown engine " + repr(engine) + ". Must be in " + repr(sorted(DOUBLY_LEXICAL_ENGINES)))
+        if parallel:
+            lines, columns = components_doubly_lexical_order(self._matrix, order, DOUBLY_LEXICAL_ENGINES[engine],
+                                                             max_workers)
+        else:
+            lines, columns = DOUBLY_LEXICAL_ENGINES[engine](self._matrix, order)
 
         self.reorder_lines(lines)
         self.reorder_columns(columns)
 
+        self._doubly_lexical_engine = engine
+        self._doubly_lexical_order = order
+        if order is None:
+            self._line_difference = line_differences(self._matrix)
+            self._column_difference = column_differences(self._matrix)
+
+        return self
+
+    def insert_rows(self, lines, elements=None):
+        """Insert lines, keeping the matrix doubly lexically ordered.
+
+        If the matrix has been doubly lexically reordered (with :meth:`reorder_doubly_lexical`, without line order),
+        each new line is inserted with :func:`tbs.contextmatrix._incremental.insert_line`: it is placed by binary
+        search and only equal columns are exchanged. Otherwise, or if the columns would have to be reordered, the
+        whole matrix is doubly lexically reordered (with the engine of the last reordering).
+
+        The storage is never modified: each insertion replaces it by a new matrix, so matrices built on it (like a
+        "view" or an "overlay") are unchanged. The "dense", "bits" and "sparse" storages share the lines that are not
+        modified, in O(number of lines) per insertion. Other storages are rebuilt after each insertion.
+
+        Args:
+            lines(list): new lines.
+            elements(list): their elements. Integers following the number of lines by default.
+
+        Raises:
+            ValueError: if the last doubly lexical reordering used a preferred line order. The matrix is then not
+                doubly lexically ordered and reordering it would lose this order.
+
+        Returns(ContextMatrix): self.
+        """
+
+        self._check_no_preferred_order()
+
+        lines = [tuple(line) for line in lines]
+        if elements is None:
+            elements = range(len(self.elements), len(self.elements) + len(lines))
+        elements = list(elements)[:len(lines)]
+        lines = lines[:len(elements)]
+
+        columns_of = list(range(len(self.attributes)))  # current column j is column columns_of[j] of the new lines
+        for index, (line, element) in enumerate(zip(lines, elements)):
+            line = tuple(line[j] for j in columns_of)
+            inserted = None
+            if self._line_difference is not None:
+                inserted = insert_line(self._matrix.__getitem__, len(self._matrix), line,
+                                       self._line_difference, self._column_difference)
+
+            if inserted is None:
+                for other_line in lines[index:]:
+                    self._insert_line(len(self._matrix), tuple(other_line[j] for j in columns_of))
+                self.elements = self.elements + tuple(elements[index:])
+                self.reorder_doubly_lexical(engine=self._doubly_lexical_engine)
+                break
+
+            position, column_permutation, line, line_difference, column_difference = inserted
+            self._insert_line(position, line)
+            self.elements = self.elements[:position] + (element, ) + self.elements[position:]
+            self.attributes = [self.attributes[j] for j in column_permutation]
+            columns_of = [columns_of[j] for j in column_permutation]
+            self._line_difference, self._column_difference = line_difference, column_difference
+
+        return self
+
+    def insert_columns(self, columns, attributes=None):
+        """Insert columns, keeping the matrix doubly lexically ordered.
+
+        Same as :meth:`insert_rows`, lines and columns being exchanged. Lines of the "dense" storage are copied into
+        lists once per call, not once per inserted column.
+
+        Args:
+            columns(list): new columns. Column j is a list whose element i is the cell (i, j).
+            attributes(list): their attributes. Integers following the number of columns by default.
+
+        Raises:
+            ValueError: if the last doubly lexical reordering used a preferred line order (see :meth:`insert_rows`).
+
+        Returns(ContextMatrix): self.
+        """
+
+        self._check_no_preferred_order()
+
+        columns = [tuple(column) for column in columns]
+        if attributes is None:
+            attributes = range(len(self.attributes), len(self.attributes) + len(columns))
+        attributes = list(attributes)[:len(columns)]
+        columns = columns[:len(attributes)]
+
+        dense = self.storage == "dense"
+        if dense:
+            self._matrix = [list(line) for line in self._matrix]
+
+        lines_of = list(range(len(self.elements)))  # current line i is line lines_of[i] of the new columns
+        try:
+            for index, (column, attribute) in enumerate(zip(columns, attributes)):
+                column = tuple(column[i] for i in lines_of)
+                inserted = None
+                if self._column_difference is not None:
+                    inserted = insert_line(lambda j: tuple(line[j] for line in self._matrix), len(self.attributes),
+                                           column, self._column_difference, self._line_difference)
+
+                if inserted is None:
+                    for other_column in columns[index:]:
+                        self._insert_column(len(self._matrix[0]), tuple(other_column[i] for i in lines_of))
+                    self.attributes = self.attributes + tuple(attributes[index:])
+                    self.reorder_doubly_lexical(engine=self._doubly_lexical_engine)
+                    break
+
+                position, line_permutation, column, column_difference, line_difference = inserted
+                self._insert_column(position, column)
+                self.attributes = self.attributes[:position] + (attribute, ) + self.attributes[position:]
+                self.elements = [self.elements[i] for i in line_permutation]
+                lines_of = [lines_of[i] for i in line_permutation]
+                self._line_difference, self._column_difference = line_difference, column_difference
+        finally:
+            if dense:
+                self._matrix = tuple(tuple(line) for line in self._matrix)
+
         return self
+
+    def _check_no_preferred_order(self):
+        if self._doubly_lexical_order is not None:
+            raise ValueError("cannot insert into a matrix reordered with a preferred line order")
+
+    def _insert_line(self, position, line):
+        """Insert *line* (a tuple) at line *position*, into a new matrix. Lines are shared if the storage allows it."""
+
+        if self.storage == "dense":
+            self._matrix = self._matrix[:position] + (line, ) + self._matrix[position:]
+        elif hasattr(self._matrix, "insert_line"):
+            self._matrix = self._matrix.insert_line(position, line)
+        else:
+            lines = tuple(tuple(current) for current in self._matrix)
+            self._matrix = STORAGES[self.storage](lines[:position] + (line, ) + lines[position:])
+
+    def _insert_column(self, position, column):
+        """Insert *column* at column *position*.
+
+        Lines of the "dense" storage must be lists, private to :meth:`insert_columns`: they are modified in place.
+        Other storages are replaced by a new matrix.
+        """
+
+        if self.storage == "dense":
+            for line, x in zip(self._matrix, column):
+                line.insert(position, x)
+        elif hasattr(self._matrix, "insert_column"):
+            self._matrix = self._matrix.insert_column(position, column)
+        else:
+            self._matrix = STORAGES[self.storage](tuple(tuple(line[:position]) + (x, ) + tuple(line[position:])
+                                                        for line, x in zip(self._matrix, column)))
@@ -12,13 +12,22 @@ Module content
 
 __author__ = 'fbrucker'
 
-__all__ = ["load", "save"]
+__all__ = ["load", "load_stream", "save", "load_binary", "save_binary"]
+
+import gzip
+import io
+import json
+import mmap
+import struct
 
 from ._to_string import to_string
-from ._context_matrix import ContextMatrix
+from ._context_matrix import ContextMatrix, matrix_from_ones
+from ._bit_matrix import BitMatrix, pack_line
+from ._mapped_bit_matrix import MappedBitMatrix, line_stride
 
 
-def load(f, has_elements_label=True, has_attributes_label=True, has_attribute=lambda x: x == "1", sep=","):
+def load(f, has_elements_label=True, has_attributes_label=True, has_attribute=lambda x: x == "1", sep=",",
+         storage="dense"):
     """Load a dissimilarity from file *f*.
 
     Empty lines, lines containing only whitespaces and lines beginig with ``'#'``
@@ -39,6 +48,10 @@ def load(f, has_elements_label=True, has_attributes_label=True, has_attribute=la
     :param sep: delimiter string
     :type sep: :class:`str`. String split method arameter. If None, the string.split method is used with no parameter.
 
+    :param storage: matrix storage (see :class:`tbs.contextmatrix.ContextMatrix`). Only the 1 positions of the
+        lines are kept while reading, the dense matrix is never built for the "bits" and "sparse" storages.
+    :type storage: :class:`str`
+
     :rtype: :class:`tbs.lattice.ContextMatrix`
 
     """
@@ -46,6 +59,7 @@ def load(f, has_elements_label=True, has_attributes_label=True, has_attribute=la
     attributes_labels = []
     elem_labels = []
     table = []
+    number_columns = None
 
     my_split = lambda string: sep is None and string.split() or string.split(sep)
 
@@ -60,11 +74,244 @@ def load(f, has_elements_label=True, has_attributes_label=True, has_attribute=la
             elem_labels.append(elems[0])
             del elems[0]
 
-        table.append([has_attribute(x.strip()) and 1 or 0 for x in elems])
+        if number_columns is None:
+            number_columns = len(elems)
+        table.append([j for j, x in enumerate(elems) if has_attribute(x.strip())])
 
         l = f.readline()
 
-    return ContextMatrix(table, elem_labels, attributes_labels)
+    return ContextMatrix(matrix_from_ones(table, number_columns or 0, storage), elem_labels, attributes_labels,
+                         storage)
+
+
+def load_stream(f, has_elements_label=True, has_attributes_label=True, has_attribute=lambda x: x == "1", sep=",",
+                storage="bits", output=None, chunk_size=1 << 20):
+    """Load a context matrix from file *f*, chunk by chunk.
+
+    Same format as :func:`load`, but the file is read by chunks of *chunk_size* characters and each line is packed
+    into an integer (see :class:`tbs.contextmatrix.BitMatrix`) as soon as it is read: no table of strings is kept.
+    Empty lines, lines containing only whitespaces and lines beginning with ``'#'`` are discarded.
+
+    :param f: file path, file opened for reading in binary mode, or file opened in text mode. Gzip compressed
+        content is detected (from its first bytes) and decompressed on the fly for paths and binary files. Text files
+        are read as is. A given file is left open.
+
+    :param has_elements_label: if first column is elements labels
+    :type has_elements_label: :class:`bool`
+
+    :param has_attributes_label: if first line is attributes names
+    :type has_attributes_label: :class:`bool`
+
+    :param has_attribute: True if element is present, False otherwise
+    :type has_attribute: function(str) -> bool
+
+    :param sep: delimiter string. If None, the string.split method is used with no parameter.
+    :type sep: :class:`str`
+
+    :param storage: matrix storage (see :class:`tbs.contextmatrix.ContextMatrix`).
+    :type storage: :class:`str`
+
+    :param output: if not None, path of a binary file (see :func:`save_binary`) where the packed lines are written.
+        The file is then opened with :func:`load_binary`: the matrix storage is "mapped" and lines are only read from
+        the file when they are accessed.
+    :type output: :class:`str`
+
+    :param chunk_size: number of characters read at once.
+    :type chunk_size: :class:`int`
+
+    :rtype: :class:`tbs.contextmatrix.ContextMatrix`
+    """
+
+    close = False
+    wrappers = []
+    if isinstance(f, str):
+        close = True
+        with open(f, "rb") as binary_file:
+            is_gzip = binary_file.read(2) == b"\x1f\x8b"
+        f = is_gzip and gzip.open(f, "rt") or open(f)
+    elif isinstance(f.read(0), bytes):
+        if not hasattr(f, "peek"):
+            f = io.BufferedReader(f)
+            wrappers.append(f)
+        if f.peek(2)[:2] == b"\x1f\x8b":
+            f = gzip.GzipFile(fileobj=f)
+            wrappers.append(f)
+        f = io.TextIOWrapper(f)
+        wrappers.append(f)
+
+    def my_split(string):
+        return sep is None and string.split() or string.split(sep)
+
+    attributes_labels = []
+    elem_labels = []
+    lines = []
+    number_lines = 0
+    number_columns = None
+    read_attributes_labels = has_attributes_label
+    output_file = None
+    if output is not None:
+        output_file = open(output, "wb")
+        output_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0, 0))
+
+    try:
+        for l in _chunked_lines(f, chunk_size):
+            if not l.strip() or l.startswith("#"):
+                continue
+
+            elems = my_split(l.strip())
+            if read_attributes_labels:
+                attributes_labels = elems
+                read_attributes_labels = False
+                continue
+
+            if has_elements_label:
+                elem_labels.append(elems[0])
+                del elems[0]
+
+            if number_columns is None:
+                number_columns = len(elems)
+
+            bits = "".join(has_attribute(x.strip()) and "1" or "0" for x in reversed(elems))
+            bits = bits and int(bits, 2) or 0
+            if output_file is None:
+                lines.append(bits)
+            else:
+                output_file.write(bits.to_bytes(line_stride(number_columns), "little"))
+            number_lines += 1
+
+        if number_columns is None:
+            number_columns = len(attributes_labels)
+
+        if output_file is not None:
+            _write_binary_labels(output_file, number_lines, number_columns,
+                                 elem_labels or list(range(number_lines)),
+                                 attributes_labels or list(range(number_columns)))
+    finally:
+        if close:
+            f.close()
+        for wrapper in reversed(wrappers):
+            if isinstance(wrapper, gzip.GzipFile):
+                wrapper.close()
+            else:
+                wrapper.detach()
+        if output_file is not None:
+            output_file.close()
+
+    if output is not None:
+        return load_binary(output)
+
+    return ContextMatrix(BitMatrix(lines, number_columns), elem_labels, attributes_labels, storage)
+
+
+def _chunked_lines(f, chunk_size):
+    """Lines of *f*, read by chunks of *chunk_size* characters."""
+
+    remainder = ""
+    chunk = f.read(chunk_size)
+    while chunk:
+        chunk_lines = (remainder + chunk).split("\n")
+        remainder = chunk_lines.pop()
+        for l in chunk_lines:
+            yield l
+        chunk = f.read(chunk_size)
+
+    if remainder:
+        yield remainder
+
+
+BINARY_MAGIC = b"TBSCTXMT"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sIQQQ")
+"""magic, version, number of lines, number of columns, position of the label table."""
+
+
+def save_binary(context_matrix, f):
+    """Write the context matrix in the binary format.
+
+    The file is made of:
+
+    - a header (see `BINARY_HEADER`): magic string, format version, number of lines, number of columns and position
+      of the label table,
+    - the packed lines (see :class:`tbs.contextmatrix.MappedBitMatrix`), starting right after the header,
+    - the label table: elements and attributes as an utf-8 json object. Labels must be json serializable.
+
+    :param context_matrix: context matrix to save
+    :type context_matrix: :class:`tbs.contextmatrix.ContextMatrix`
+
+    :param f: file path, or file opened for writing in binary mode.
+    """
+
+    close = False
+    if isinstance(f, str):
+        close = True
+        f = open(f, "wb")
+
+    try:
+        matrix = context_matrix.matrix
+        number_columns = len(context_matrix.attributes)
+        stride = line_stride(number_columns)
+
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0, 0))
+        for i in range(len(matrix)):
+            if hasattr(matrix, "line"):
+                bits = matrix.line(i)
+            else:
+                bits = pack_line(matrix[i])
+            f.write(bits.to_bytes(stride, "little"))
+
+        _write_binary_labels(f, len(matrix), number_columns, context_matrix.elements, context_matrix.attributes)
+    finally:
+        if close:
+            f.close()
+
+    return f
+
+
+def _write_binary_labels(f, number_lines, number_columns, elements, attributes):
+    """Write the label table at the current position of *f* then update the header."""
+
+    labels_position = f.tell()
+    f.write(json.dumps({"elements": list(elements), "attributes": list(attributes)}).encode("utf-8"))
+    f.seek(0)
+    f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, number_lines, number_columns, labels_position))
+    f.seek(0, 2)
+
+
+def load_binary(f, storage="mapped"):
+    """Open a context matrix saved with :func:`save_binary`.
+
+    The file is memory-mapped and nothing is copied: with the "mapped" storage, lines are read from the file only
+    when they are accessed. Thus :meth:`tbs.contextmatrix.ContextMatrix.submatrix_elements_indices` only reads the
+    selected lines.
+
+    :param f: file path.
+    :type f: :class:`str`
+
+    :param storage: matrix storage (see :class:`tbs.contextmatrix.ContextMatrix`). Storages other than "mapped" load
+        the whole matrix into memory.
+    :type storage: :class:`str`
+
+    :rtype: :class:`tbs.contextmatrix.ContextMatrix`
+    """
+
+    with open(f, "rb") as binary_file:
+        buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < BINARY_HEADER.size:
+        raise ValueError("not a binary context matrix file: " + repr(f))
+    magic, version, number_lines, number_columns, labels_position = BINARY_HEADER.unpack_from(buffer)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary context matrix file: " + repr(f))
+    if version != BINARY_VERSION:
+        raise ValueError("unsupported binary context matrix version " + repr(version))
+
+    labels = json.loads(buffer[labels_position:].decode("utf-8"))
+    elements = [isinstance(x, list) and tuple(x) or x for x in labels["elements"]]
+    attributes = [isinstance(x, list) and tuple(x) or x for x in labels["attributes"]]
+
+    matrix = MappedBitMatrix.from_buffer(buffer, number_lines, number_columns, BINARY_HEADER.size)
+
+    return ContextMatrix(matrix, elements, attributes, storage)
 
 
 def save(context_matrix, f, has_attribute="1", has_not_attribute="0", has_elements_label=True,
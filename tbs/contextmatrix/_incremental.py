@@ -0,0 +1,124 @@
+"""Insertion of a line into a doubly lexically ordered matrix.
+
+Doubly lexical orders are described by two tables (see :func:`line_differences`):
+
+- line_difference[i]: largest column index where lines i and i + 1 differ (-1 if they are equal),
+- column_difference[j]: largest line index where columns j and j + 1 differ (-1 if they are equal).
+
+Inserting a new line at position p only changes the comparison of two consecutive columns if they are equal below
+p and the new line differs on them. Consecutive equal columns can be swapped without changing the other lines, so
+the new line is first sorted within each class of equal columns, then placed by binary search among the lines
+(compared from the right). The consecutive columns are then checked in O(1) each with the column_difference table.
+
+Columns are inserted by exchanging the roles of lines and columns.
+"""
+
+from ._partition_refinement import lines_ones
+
+__author__ = 'fbrucker'
+
+__all__ = ["line_differences", "column_differences", "insert_line"]
+
+
+def line_differences(matrix):
+    """Largest column index where consecutive lines differ.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+
+    :rtype: list. Element i is -1 if lines i and i + 1 are equal.
+    """
+
+    ones = [set(line) for line in lines_ones(matrix)]
+
+    return [max(ones[i].symmetric_difference(ones[i + 1]) or [-1]) for i in range(len(ones) - 1)]
+
+
+def column_differences(matrix):
+    """Largest line index where consecutive columns differ.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+
+    :rtype: list. Element j is -1 if columns j and j + 1 are equal.
+    """
+
+    number_columns = len(matrix) and len(matrix[0]) or 0
+    ones = [set() for j in range(number_columns)]
+    for i, line in enumerate(lines_ones(matrix)):
+        for j in line:
+            ones[j].add(i)
+
+    return [max(ones[j].symmetric_difference(ones[j + 1]) or [-1]) for j in range(number_columns - 1)]
+
+
+def _key(line):
+    """Decreasing indices of the 1 of *line*: lines are lexically compared from the right as their keys."""
+
+    return [j for j in reversed(range(len(line))) if line[j]]
+
+
+def _last_difference(line, other_line):
+    for j in reversed(range(len(line))):
+        if line[j] != other_line[j]:
+            return j
+    return -1
+
+
+def insert_line(get_line, number_lines, line, line_difference, column_difference):
+    """Insert *line* in a doubly lexically ordered matrix, if the columns order can be kept.
+
+    :param get_line: function returning line i of the matrix.
+    :param number_lines: number of lines of the matrix.
+    :param line: the new line. Its length is the number of columns.
+    :param line_difference: see :func:`line_differences`.
+    :param column_difference: see :func:`column_differences`.
+
+    :return: None if the new line cannot be inserted without reordering the matrix. Otherwise a
+        (position, column_permutation, line, line_difference, column_difference) tuple: the permuted new line must
+        be inserted at line *position* and column *j* of the new matrix is column column_permutation[j]. Only equal
+        columns are exchanged, thus the current lines are not modified by the permutation.
+    """
+
+    number_columns = len(line)
+
+    column_permutation = []
+    start = 0
+    for j in range(number_columns):
+        if j == number_columns - 1 or column_difference[j] != -1:
+            equal_columns = range(start, j + 1)
+            column_permutation.extend(k for k in equal_columns if not line[k])
+            column_permutation.extend(k for k in equal_columns if line[k])
+            start = j + 1
+
+    line = tuple(line[k] for k in column_permutation)
+    key = _key(line)
+
+    low, high = 0, number_lines
+    while low < high:
+        middle = (low + high) // 2
+        if _key(get_line(middle)) < key:
+            low = middle + 1
+        else:
+            high = middle
+    position = low
+
+    new_column_difference = []
+    for j in range(number_columns - 1):
+        difference = column_difference[j]
+        if difference >= position:
+            difference += 1
+        if line[j] != line[j + 1] and difference < position:
+            if line[j]:
+                return None
+            difference = position
+        new_column_difference.append(difference)
+
+    new_line_difference = list(line_difference[:max(position - 1, 0)])
+    if position > 0:
+        new_line_difference.append(_last_difference(get_line(position - 1), line))
+    if position < number_lines:
+        new_line_difference.append(_last_difference(line, get_line(position)))
+    new_line_difference.extend(line_difference[position:])
+
+    return position, column_permutation, line, new_line_difference, new_column_difference
@@ -0,0 +1,180 @@
+"""Bit-packed 0/1 matrix stored in a buffer (typically a memory-mapped file).
+
+Line i is stored in *stride* = ceil(number of columns / 8) consecutive bytes: bit j of the line is bit j % 8 of byte
+j // 8 (little endian order), thus ``int.from_bytes(bytes, "little")`` is the line packed as in
+:class:`tbs.contextmatrix.BitMatrix`. Lines are only read when they are accessed.
+"""
+
+import mmap
+
+from ._bit_matrix import BitMatrix, BitLine, ones
+
+__author__ = 'fbrucker'
+
+__all__ = ["MappedBitMatrix", "line_stride"]
+
+
+def line_stride(number_columns):
+    """Number of bytes of a packed line."""
+
+    return (number_columns + 7) // 8
+
+
+class MappedBitMatrix(object):
+    """Bit-packed 0/1 matrix whose lines are read on demand from a buffer.
+
+    Behaves as a read-only tuple of lines, like :class:`tbs.contextmatrix.BitMatrix`. Reordering or restricting
+    the lines only keeps the line correspondence and still reads the buffer; reordering the columns and
+    transposition pack a new matrix in an anonymous memory map.
+    """
+
+    storage = "mapped"
+
+    def __init__(self, matrix, number_columns=None):
+        """Pack a 0/1 matrix in an anonymous memory map.
+
+        Args:
+            matrix(iterable): list of lines (see :class:`tbs.contextmatrix.BitMatrix`). If it is a
+                :class:`MappedBitMatrix`, its buffer is shared.
+            number_columns(int): number of columns. Length of the first line by default.
+        """
+
+        if isinstance(matrix, MappedBitMatrix):
+            self._buffer, self._offset, self._stride = matrix._buffer, matrix._offset, matrix._stride
+            self._number_lines, self._number_columns = matrix._number_lines, matrix._number_columns
+            self._lines = matrix._lines
+            self._columns = matrix._columns
+            return
+
+        bit_matrix = BitMatrix(matrix, number_columns)
+        stride = line_stride(bit_matrix.number_columns)
+        buffer = mmap.mmap(-1, max(1, len(bit_matrix) * stride))
+        for i in range(len(bit_matrix)):
+            buffer[i * stride:(i + 1) * stride] = bit_matrix.line(i).to_bytes(stride, "little")
+
+        self._init_from_buffer(buffer, len(bit_matrix), bit_matrix.number_columns, 0)
+
+    @classmethod
+    def from_buffer(cls, buffer, number_lines, number_columns, offset=0):
+        """Matrix linked (not copied) to *buffer*.
+
+        Args:
+            buffer: bytes-like object (bytes, mmap, ...) containing the packed lines.
+            number_lines(int): number of lines.
+            number_columns(int): number of columns.
+            offset(int): position of the first line in *buffer*.
+        """
+
+        matrix = cls.__new__(cls)
+        matrix._init_from_buffer(buffer, number_lines, number_columns, offset)
+        return matrix
+
+    def _init_from_buffer(self, buffer, number_lines, number_columns, offset):
+        self._buffer = buffer
+        self._offset = offset
+        self._stride = line_stride(number_columns)
+        self._number_lines = number_lines
+        self._number_columns = number_columns
+        self._lines = None
+        self._columns = None
+
+    def __len__(self):
+        if self._lines is None:
+            return self._number_lines
+        return len(self._lines)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[k] for k in range(len(self))[i])
+        return BitLine(self.line(i), self._number_columns)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        try:
+            return len(other) == len(self) and all(line == other_line for line, other_line in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(tuple(tuple(line) for line in self))
+
+    @property
+    def number_columns(self):
+        return self._number_columns
+
+    @property
+    def buffer(self):
+        """The underlying buffer."""
+
+        return self._buffer
+
+    def _physical_line(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("matrix index out of range")
+        if self._lines is None:
+            return i
+        return self._lines[i]
+
+    def line(self, i):
+        """Packed line *i* (bit j is the cell (i, j)), read from the buffer."""
+
+        start = self._offset + self._physical_line(i) * self._stride
+        return int.from_bytes(self._buffer[start:start + self._stride], "little")
+
+    def column(self, j):
+        """Packed column *j* (bit i is the cell (i, j)).
+
+        All the columns are packed in memory the first time one of them is asked for, in O(number of 1).
+        """
+
+        if self._columns is None:
+            columns = [0] * self._number_columns
+            for i in range(len(self)):
+                bit_i = 1 << i
+                for column in ones(self.line(i)):
+                    columns[column] |= bit_i
+            self._columns = tuple(columns)
+
+        return self._columns[j]
+
+    def ones(self, i):
+        """Increasing column indices of the 1 of line *i*."""
+
+        return ones(self.line(i))
+
+    def to_bit_matrix(self):
+        """In memory :class:`tbs.contextmatrix.BitMatrix` copy of the matrix."""
+
+        return BitMatrix([self.line(i) for i in range(len(self))], self._number_columns)
+
+    def transpose(self):
+        """Transposed matrix, packed in an anonymous memory map."""
+
+        return MappedBitMatrix(self.to_bit_matrix().transpose())
+
+    def reorder_lines(self, permutation):
+        """Matrix whose line i is line permutation[i]. The buffer is shared."""
+
+        matrix = MappedBitMatrix(self)
+        matrix._lines = tuple(self._physical_line(i) for i in permutation)
+        matrix._columns = None
+        return matrix
+
+    def reorder_columns(self, permutation):
+        """Matrix whose column j is column permutation[j], packed in an anonymous memory map."""
+
+        return MappedBitMatrix(self.to_bit_matrix().reorder_columns(permutation))
+
+    def submatrix_lines(self, line_indices):
+        """Matrix made of the lines in *line_indices* (in this order). Only these lines will be read."""
+
+        return self.reorder_lines(line_indices)
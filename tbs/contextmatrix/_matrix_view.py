@@ -0,0 +1,172 @@
+"""Reordered and transposed views of a 0/1 matrix.
+
+A view never copies the underlying matrix: it only keeps the line and column index correspondences. Reordering a
+view of n lines and m columns is thus O(n) (or O(m)) and transposing it O(1).
+"""
+
+__author__ = 'fbrucker'
+
+__all__ = ["MatrixView"]
+
+
+class ViewLine(object):
+    """Read-only sequence view of a line of a :class:`MatrixView`."""
+
+    __slots__ = ("_cell", "_length")
+
+    def __init__(self, cell, length):
+        self._cell = cell
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return tuple(self)[j]
+        if j < 0:
+            j += self._length
+        if not 0 <= j < self._length:
+            raise IndexError("line index out of range")
+        return self._cell(j)
+
+    def __iter__(self):
+        cell = self._cell
+        for j in range(self._length):
+            yield cell(j)
+
+    def __eq__(self, other):
+        try:
+            return len(other) == self._length and tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class MatrixView(object):
+    """Lazy reordered and/or transposed view of a matrix.
+
+    Cell (i, j) of the view is cell (lines[i], columns[j]) of the base matrix, or cell (columns[j], lines[i]) if
+    the view is transposed. The base matrix is linked, not copied, and should not be modified.
+    """
+
+    storage = "view"
+
+    def __init__(self, matrix, lines=None, columns=None, transposed=False):
+        """View of *matrix*.
+
+        Args:
+            matrix: base matrix (list of lines). If it is itself a :class:`MatrixView`, the new view shares its base.
+            lines(list): line correspondence. Identity by default.
+            columns(list): column correspondence. Identity by default.
+            transposed(bool): if True, lines of the view are columns of the base.
+        """
+
+        if isinstance(matrix, MatrixView) and lines is None and columns is None and not transposed:
+            self._base = matrix._base
+            self._lines = matrix._lines
+            self._columns = matrix._columns
+            self._transposed = matrix._transposed
+            return
+
+        self._base = matrix
+        self._transposed = transposed
+
+        number_lines = len(matrix)
+        number_columns = number_lines and len(matrix[0]) or 0
+        if transposed:
+            number_lines, number_columns = number_columns, number_lines
+
+        if lines is None:
+            lines = range(number_lines)
+        if columns is None:
+            columns = range(number_columns)
+
+        self._lines = tuple(lines)
+        self._columns = tuple(columns)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[k] for k in range(len(self._lines))[i])
+
+        base = self._base
+        columns = self._columns
+        if self._transposed:
+            column = self._lines[i]
+
+            def cell(j):
+                return base[columns[j]][column]
+        else:
+            line = base[self._lines[i]]
+
+            def cell(j):
+                return line[columns[j]]
+
+        return ViewLine(cell, len(columns))
+
+    def __iter__(self):
+        for i in range(len(self._lines)):
+            yield self[i]
+
+    def __eq__(self, other):
+        try:
+            return len(other) == len(self) and all(line == other_line for line, other_line in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+    @property
+    def base(self):
+        """The viewed matrix."""
+
+        return self._base
+
+    def materialize(self):
+        """Tuple of tuples copy of the view."""
+
+        return tuple(tuple(line) for line in self)
+
+    def ones(self, i):
+        """Increasing column indices of the 1 of line *i*."""
+
+        return (j for j, x in enumerate(self[i]) if x)
+
+    def transpose(self):
+        """Transposed view, in O(1)."""
+
+        return MatrixView(self._base, self._columns, self._lines, not self._transposed)
+
+    def reorder_lines(self, permutation):
+        """View whose line i is line permutation[i], in O(number of lines)."""
+
+        lines = self._lines
+        return MatrixView(self._base, [lines[i] for i in permutation], self._columns, self._transposed)
+
+    def reorder_columns(self, permutation):
+        """View whose column j is column permutation[j], in O(number of columns)."""
+
+        columns = self._columns
+        return MatrixView(self._base, self._lines, [columns[j] for j in permutation], self._transposed)
+
+    def submatrix_lines(self, line_indices):
+        """View restricted to the lines in *line_indices* (in this order)."""
+
+        return self.reorder_lines(line_indices)
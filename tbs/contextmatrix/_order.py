@@ -1,6 +1,6 @@
 __author__ = 'fbrucker'
 
-__all__ = ["doubly_lexical_order", "is_doubly_lexically_ordered"]
+__all__ = ["doubly_lexical_order", "is_doubly_lexically_ordered", "doubly_lexical_violation"]
 
 
 def is_doubly_lexically_ordered(matrix):
@@ -11,30 +11,50 @@ def is_doubly_lexically_ordered(matrix):
 
     :rtype: bool
     """
-    for i in range(len(matrix)):
-        for j in range(len(matrix[i])):
-            if matrix[i][j] == 0:
-                continue
-            for j_next in range(j + 1, len(matrix[i])):
-                if matrix[i][j_next] == 0:
-                    line_ordered = False
-                    for i_next in range(i + 1, len(matrix)):
-                        if matrix[i_next][j] == 0 and matrix[i_next][j_next] == 1:
-                            line_ordered = True
-                            break
-                    if not line_ordered:
-                        return False
-            for i_next in range(i + 1, len(matrix)):
-                if matrix[i_next][j] == 0:
-                    column_ordered = False
-                    for j_next in range(j + 1, len(matrix[i])):
-                        if matrix[i][j_next] == 0 and matrix[i_next][j_next] == 1:
-                            column_ordered = True
-                            break
-                    if not column_ordered:
-                        return False
-
-    return True
+
+    return doubly_lexical_violation(matrix) is None
+
+
+def doubly_lexical_violation(matrix):
+    """First pair of consecutive lines or columns that are not lexically ordered.
+
+    Lines must be non decreasing when compared from the right and columns when compared from the bottom. Since these
+    orders are total, it is enough to compare consecutive lines and columns, thus O(n * m) (O(number of 1) if the
+    matrix has a `ones(i)` method). Packed matrices (having `line(i)` and `column(j)` methods, see
+    :class:`tbs.contextmatrix.BitMatrix`) are compared as integers.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+
+    :return: None if the matrix is doubly lexically ordered, ("lines", i, i + 1) or ("columns", j, j + 1) otherwise.
+    """
+
+    number_columns = len(matrix) and len(matrix[0]) or 0
+
+    if hasattr(matrix, "line") and hasattr(matrix, "column"):
+        lines_keys = [matrix.line(i) for i in range(len(matrix))]
+        columns_keys = [matrix.column(j) for j in range(number_columns)]
+    else:
+        lines_keys = []
+        columns_keys = [[] for j in range(number_columns)]
+        for i in range(len(matrix)):
+            if hasattr(matrix, "ones"):
+                line_ones = list(matrix.ones(i))
+            else:
+                line_ones = [j for j, x in enumerate(matrix[i]) if x]
+            for j in line_ones:
+                columns_keys[j].append(i)
+            line_ones.reverse()
+            lines_keys.append(line_ones)
+        for column_ones in columns_keys:
+            column_ones.reverse()
+
+    for kind, keys in (("lines", lines_keys), ("columns", columns_keys)):
+        for index in range(len(keys) - 1):
+            if keys[index] > keys[index + 1]:
+                return kind, index, index + 1
+
+    return None
 
 
 def doubly_lexical_order(matrix, order=None):
@@ -0,0 +1,167 @@
+"""0/1 matrix given by a base matrix and a set of flipped cells.
+
+The base matrix is linked, not copied, and only the flipped cells (the delta) are stored. It is used to represent an
+approximation of a matrix (see :meth:`tbs.gamma_free.GammaFree.from_approximation_delta`): the error of the
+approximation is the size of the delta. Lines are computed on demand.
+"""
+
+from ._matrix_view import MatrixView, ViewLine
+
+__author__ = 'fbrucker'
+
+__all__ = ["OverlayMatrix"]
+
+
+class OverlayMatrix(object):
+    """Lazy matrix equal to a base matrix except on some cells, all set to the same value.
+
+    Cell (i, j) is *value* if (i, j) is in the delta, cell (i, j) of the base matrix otherwise. The base matrix
+    should not be modified.
+    """
+
+    storage = "overlay"
+
+    def __init__(self, matrix, cells=(), value=1):
+        """Overlay of *cells* on *matrix*.
+
+        Args:
+            matrix: base matrix (list of lines). If it is itself a :class:`OverlayMatrix` and *cells* is empty, the
+                new overlay shares its base and delta.
+            cells(iterable): (line, column) cells whose value is *value*.
+            value(int): 1 if the cells are 0 in the base matrix and set to 1, 0 otherwise.
+        """
+
+        if isinstance(matrix, OverlayMatrix) and not cells:
+            self._base = matrix._base
+            self._cells = matrix._cells
+            self._value = matrix._value
+            self._number_columns = matrix._number_columns
+            return
+
+        self._base = matrix
+        self._value = value
+        self._number_columns = len(matrix) and len(matrix[0]) or 0
+
+        self._cells = dict()
+        for i, j in cells:
+            self._cells.setdefault(i, set()).add(j)
+
+    def __len__(self):
+        return len(self._base)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[k] for k in range(len(self))[i])
+
+        line = self._base[i]
+        flipped = self._cells.get(i % len(self) if i < 0 else i)
+        if not flipped:
+            return line
+
+        value = self._value
+
+        def cell(j):
+            return value if j in flipped else line[j]
+
+        return ViewLine(cell, self._number_columns)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        try:
+            return len(other) == len(self) and all(line == other_line for line, other_line in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+    @property
+    def base(self):
+        """The underlying matrix."""
+
+        return self._base
+
+    @property
+    def value(self):
+        """Value of the flipped cells."""
+
+        return self._value
+
+    @property
+    def delta(self):
+        """Sorted list of the flipped (line, column) cells."""
+
+        return sorted((i, j) for i, flipped in self._cells.items() for j in flipped)
+
+    def __reduce__(self):
+        return self.__class__, (self._base, self.delta, self._value)
+
+    def materialize(self):
+        """Tuple of tuples copy of the matrix."""
+
+        return tuple(tuple(line) for line in self)
+
+    def ones(self, i):
+        """Increasing column indices of the 1 of line *i*."""
+
+        if hasattr(self._base, "ones"):
+            base_ones = self._base.ones(i)
+        else:
+            base_ones = (j for j, x in enumerate(self._base[i]) if x)
+
+        flipped = self._cells.get(i)
+        if not flipped:
+            return list(base_ones)
+        if self._value:
+            return sorted(flipped.union(base_ones))
+        return [j for j in base_ones if j not in flipped]
+
+    def _base_operation(self, name, *args):
+        if hasattr(self._base, name):
+            return getattr(self._base, name)(*args)
+        return getattr(MatrixView(self._base), name)(*args)
+
+    def _overlay(self, base, cells):
+        overlay = OverlayMatrix(base, value=self._value)
+        overlay._cells = cells
+        return overlay
+
+    def transpose(self):
+        """Transposed overlay. The base matrix is transposed with its own method, or as a :class:`MatrixView`."""
+
+        cells = dict()
+        for i, flipped in self._cells.items():
+            for j in flipped:
+                cells.setdefault(j, set()).add(i)
+
+        return self._overlay(self._base_operation("transpose"), cells)
+
+    def reorder_lines(self, permutation):
+        """Overlay whose line i is line permutation[i]."""
+
+        cells = {k: self._cells[i] for k, i in enumerate(permutation) if i in self._cells}
+        return self._overlay(self._base_operation("reorder_lines", permutation), cells)
+
+    def reorder_columns(self, permutation):
+        """Overlay whose column j is column permutation[j]."""
+
+        position = {j: k for k, j in enumerate(permutation)}
+        cells = dict()
+        for i, flipped in self._cells.items():
+            new_flipped = {position[j] for j in flipped if j in position}
+            if new_flipped:
+                cells[i] = new_flipped
+
+        return self._overlay(self._base_operation("reorder_columns", permutation), cells)
+
+    def submatrix_lines(self, line_indices):
+        """Overlay restricted to the lines in *line_indices* (in this order)."""
+
+        return self.reorder_lines(line_indices)
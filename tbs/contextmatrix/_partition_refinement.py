@@ -0,0 +1,324 @@
+"""Doubly lexical ordering by partition refinement.
+
+Sparse counterpart of :func:`tbs.contextmatrix._order.doubly_lexical_order`. The matrix is only accessed through
+the column indices of the 1 of each line. Lines and columns are partitioned in ordered classes that are refined
+until they are doubly lexically ordered:
+
+- each line keeps, for each column class, its 1 that are not yet used (its *live* 1),
+- refining a line class with a column class only visits the lines having a live 1 in it,
+- when a column class is split, only the smaller part is moved into a new class,
+- when a line class is split, all the parts but the largest one are moved into new classes.
+
+Each 1 is thus used once and moved O(log n + log m) times, for a total complexity of O(L log(n + m) + n + m)
+where L is the number of 1 of the matrix.
+"""
+
+import heapq
+import itertools
+
+from ._order import ordering_from_last_node
+
+__author__ = 'fbrucker'
+
+__all__ = ["partition_refinement_doubly_lexical_order", "lines_ones"]
+
+
+def lines_ones(matrix):
+    """Column indices of the 1 of each line.
+
+    Uses the `ones(i)` method of the matrix if any (see :class:`tbs.contextmatrix.BitMatrix`).
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+
+    :rtype: list of lists
+    """
+
+    if hasattr(matrix, "ones"):
+        return [list(matrix.ones(i)) for i in range(len(matrix))]
+
+    return [[j for j, x in enumerate(line) if x] for line in matrix]
+
+
+def partition_refinement_doubly_lexical_order(matrix, order=None):
+    """Return a doubly lexical order.
+
+    Same contract as :func:`tbs.contextmatrix._order.doubly_lexical_order`, in O(L log(n + m)) where L is the
+    number of 1 of the matrix.
+
+    :param matrix: O/1 matrix
+    :type matrix: list of list of 0/1 elements
+    :param order: prefered line order. A list of lists
+
+    :rtype: couple of line and column permutation
+    """
+
+    number_columns = len(matrix) and len(matrix[0]) or 0
+
+    return _Refinement(lines_ones(matrix), number_columns, order).run()
+
+
+class _ColumnClass(object):
+    """Columns class.
+
+    *start* is the position of the first column of the class in the final order. *lines* associates to each line
+    class the set of its lines having a live 1 in the class.
+    """
+
+    __slots__ = ("columns", "start", "lines", "pred", "next")
+
+    def __init__(self, columns, start):
+        self.columns = set(columns)
+        self.start = start
+        self.lines = dict()
+        self.pred = None
+        self.next = None
+
+
+class _LineClass(object):
+    """Lines class.
+
+    *heap* contains (-start, counter, column class) triples. The column class of largest start having a live 1 of
+    the class is found by lazily discarding the outdated triples.
+    """
+
+    __slots__ = ("lines", "heap", "pred", "next")
+
+    def __init__(self, lines):
+        self.lines = set(lines)
+        self.heap = []
+        self.pred = None
+        self.next = None
+
+
+class _Refinement(object):
+    def __init__(self, lines_ones, number_columns, order):
+        self.counter = itertools.count()
+
+        self.column_lines = [[] for j in range(number_columns)]
+        for i, line in enumerate(lines_ones):
+            for j in line:
+                self.column_lines[j].append(i)
+
+        column_class = _ColumnClass(range(number_columns), 0)
+        self.last_column_class = column_class
+
+        if order is None:
+            order = [range(len(lines_ones))]
+
+        self.live = [dict() for i in range(len(lines_ones))]
+        self.line_class = [None] * len(lines_ones)
+
+        self.last_line_class = None
+        for lines in order:
+            line_class = _LineClass(lines)
+            for i in line_class.lines:
+                self.line_class[i] = line_class
+                if lines_ones[i]:
+                    self.live[i][column_class] = set(lines_ones[i])
+                    column_class.lines.setdefault(line_class, set()).add(i)
+            if line_class in column_class.lines:
+                self.push(line_class, column_class)
+
+            if self.last_line_class is not None:
+                self.last_line_class.next = line_class
+                line_class.pred = self.last_line_class
+            self.last_line_class = line_class
+
+    def run(self):
+        current = self.last_line_class
+        while current is not None:
+            column_class = self.next_column_class(current)
+            if column_class is None:
+                current = current.pred
+            else:
+                current = self.refine(current, column_class)
+
+        lines = ordering_from_last_node(self.last_line_class, lambda line_class: sorted(line_class.lines))
+        columns = ordering_from_last_node(self.last_column_class, lambda column_class: sorted(column_class.columns))
+
+        return lines, columns
+
+    def push(self, line_class, column_class):
+        heapq.heappush(line_class.heap, (-column_class.start, next(self.counter), column_class))
+
+    def next_column_class(self, line_class):
+        """Rightmost column class with a live 1 of *line_class*, None if there is none."""
+
+        heap = line_class.heap
+        while heap:
+            key, _, column_class = heap[0]
+            if line_class not in column_class.lines:
+                heapq.heappop(heap)
+            elif -key != column_class.start:
+                heapq.heapreplace(heap, (-column_class.start, next(self.counter), column_class))
+            else:
+                return column_class
+
+        return None
+
+    def consume(self, i, column_class):
+        """The 1 of line *i* in *column_class* are no longer needed."""
+
+        del self.live[i][column_class]
+        line_class = self.line_class[i]
+        lines = column_class.lines[line_class]
+        lines.discard(i)
+        if not lines:
+            del column_class.lines[line_class]
+
+    def refine(self, line_class, column_class):
+        """Refine *line_class* and the columns of *column_class*.
+
+        Returns the rightmost line class replacing *line_class*.
+        """
+
+        touched = list(column_class.lines[line_class])
+        end = column_class.pred
+        self.last = column_class
+
+        attached = dict()
+        full = []
+        for i in touched:
+            live = self.live[i]
+            current = self.last
+            while current is not end:
+                columns = live.get(current)
+                if columns is None or len(columns) < len(current.columns):
+                    break
+                self.consume(i, current)
+                current = current.pred
+
+            if current is end:
+                full.append(i)
+                continue
+
+            columns = live.get(current)
+            if columns is None:
+                attached.setdefault(current, []).append(i)
+                continue
+
+            zeros, ones = self.split(current, columns)
+            self.consume(i, ones)
+            if zeros is current:
+                attached[ones] = attached.pop(current, [])
+                attached[current] = [i]
+            else:
+                attached[zeros] = [i]
+
+        groups = [attached.get(self.last, [])]
+        number_zero_lines = len(line_class.lines) - len(touched)
+        current = self.last.pred
+        while current is not end:
+            if current in attached:
+                groups.append(attached[current])
+            current = current.pred
+        groups.append(full)
+
+        sizes = [len(group) for group in groups]
+        sizes[0] += number_zero_lines
+        keep = sizes.index(max(sizes))
+
+        if keep != 0 and number_zero_lines:
+            groups[0] = list(line_class.lines.difference(touched)) + groups[0]
+
+        new_classes = []
+        for index, group in enumerate(groups):
+            if index == keep:
+                new_classes.append(line_class)
+            elif group:
+                new_classes.append(self.move_lines(group, line_class))
+
+        self.replace(line_class, new_classes)
+        return new_classes[-1]
+
+    def split(self, column_class, ones):
+        """Split *column_class* into the columns not in *ones* (left) and those in *ones* (right).
+
+        Returns the (zeros, ones) couple of classes. One of them is *column_class*.
+        """
+
+        number_zeros = len(column_class.columns) - len(ones)
+        if len(ones) <= number_zeros:
+            moved = list(ones)
+            new_class = _ColumnClass(moved, column_class.start + number_zeros)
+            new_class.pred = column_class
+            new_class.next = column_class.next
+            if column_class.next is not None:
+                column_class.next.pred = new_class
+            column_class.next = new_class
+            if self.last is column_class:
+                self.last = new_class
+            if self.last_column_class is column_class:
+                self.last_column_class = new_class
+            split = column_class, new_class
+        else:
+            moved = list(column_class.columns.difference(ones))
+            new_class = _ColumnClass(moved, column_class.start)
+            column_class.start += len(moved)
+            new_class.next = column_class
+            new_class.pred = column_class.pred
+            if column_class.pred is not None:
+                column_class.pred.next = new_class
+            column_class.pred = new_class
+            split = new_class, column_class
+
+        column_class.columns.difference_update(moved)
+
+        live = self.live
+        line_class = self.line_class
+        for j in moved:
+            for i in self.column_lines[j]:
+                columns = live[i].get(column_class)
+                if columns is None:
+                    continue
+                columns.remove(j)
+                if not columns:
+                    self.consume(i, column_class)
+                new_columns = live[i].get(new_class)
+                if new_columns is None:
+                    live[i][new_class] = {j}
+                    new_class.lines.setdefault(line_class[i], set()).add(i)
+                else:
+                    new_columns.add(j)
+
+        for lines_class in new_class.lines:
+            self.push(lines_class, new_class)
+            if split[0] is new_class and lines_class in column_class.lines:
+                self.push(lines_class, column_class)
+
+        return split
+
+    def move_lines(self, lines, line_class):
+        """New line class made of *lines*, removed from *line_class*."""
+
+        new_class = _LineClass(lines)
+        line_class.lines.difference_update(new_class.lines)
+        for i in new_class.lines:
+            self.line_class[i] = new_class
+            for column_class in self.live[i]:
+                old_lines = column_class.lines[line_class]
+                old_lines.discard(i)
+                if not old_lines:
+                    del column_class.lines[line_class]
+                if new_class not in column_class.lines:
+                    column_class.lines[new_class] = set()
+                    self.push(new_class, column_class)
+                column_class.lines[new_class].add(i)
+
+        return new_class
+
+    def replace(self, line_class, new_classes):
+        """Replace *line_class* by the consecutive *new_classes* in the line class order."""
+
+        pred, after = line_class.pred, line_class.next
+        for new_class in new_classes:
+            new_class.pred = pred
+            if pred is not None:
+                pred.next = new_class
+            pred = new_class
+        pred.next = after
+        if after is not None:
+            after.pred = pred
+        if self.last_line_class is line_class:
+            self.last_line_class = pred
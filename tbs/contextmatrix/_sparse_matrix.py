@@ -0,0 +1,270 @@
+"""Sparse 0/1 matrix.
+
+Lines are stored in compressed sparse row (CSR) format: the column indices of the 1 of line i are
+``indices[indptr[i]:indptr[i + 1]]``, in increasing order. The compressed sparse column (CSC) format is built on
+demand. Memory is thus proportional to the number of 1 and not to the size of the matrix.
+"""
+
+from array import array
+from bisect import bisect_left
+
+__author__ = 'fbrucker'
+
+__all__ = ["SparseMatrix"]
+
+
+class SparseLine(object):
+    """Read-only sequence view of a sparse line."""
+
+    __slots__ = ("ones", "_length")
+
+    def __init__(self, ones, length):
+        self.ones = ones
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return tuple(self)[j]
+        if j < 0:
+            j += self._length
+        if not 0 <= j < self._length:
+            raise IndexError("line index out of range")
+        position = bisect_left(self.ones, j)
+        return position < len(self.ones) and self.ones[position] == j and 1 or 0
+
+    def __iter__(self):
+        line = [0] * self._length
+        for j in self.ones:
+            line[j] = 1
+        return iter(line)
+
+    def __eq__(self, other):
+        if isinstance(other, SparseLine):
+            return self._length == other._length and self.ones == other.ones
+        try:
+            return len(other) == self._length and tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class SparseMatrix(object):
+    """Sparse 0/1 matrix in CSR format, with a lazy CSC copy.
+
+    Behaves as a read-only tuple of lines: ``matrix[i][j]`` (O(log) per access), ``len(matrix)`` and iteration work
+    as for a tuple of tuples. Reordering, transposition and insertions return new matrices.
+    """
+
+    storage = "sparse"
+
+    def __init__(self, matrix, number_columns=None):
+        """Sparse matrix from a list of 0/1 lines.
+
+        Args:
+            matrix(iterable): list of lines. If it is a :class:`SparseMatrix` its arrays are shared.
+            number_columns(int): number of columns. Length of the first line by default.
+        """
+
+        if isinstance(matrix, SparseMatrix):
+            self._number_columns = matrix._number_columns
+            self._indptr, self._indices = matrix._indptr, matrix._indices
+            self._csc = matrix._csc
+            return
+
+        if hasattr(matrix, "ones"):
+            lines_ones = (matrix.ones(i) for i in range(len(matrix)))
+            if number_columns is None:
+                number_columns = len(matrix) and len(matrix[0]) or 0
+        else:
+            lines_ones = []
+            for line in matrix:
+                if number_columns is None:
+                    number_columns = len(line)
+                lines_ones.append([j for j, x in enumerate(line) if x])
+
+        self._init_from_ones(lines_ones, number_columns or 0)
+
+    @classmethod
+    def from_ones(cls, lines_ones, number_columns):
+        """Matrix from the column indices of each line 1.
+
+        Args:
+            lines_ones(iterable): for each line, iterable of the columns containing a 1.
+            number_columns(int): number of columns.
+        """
+
+        matrix = cls.__new__(cls)
+        matrix._init_from_ones(lines_ones, number_columns)
+        return matrix
+
+    @classmethod
+    def from_arrays(cls, indptr, indices, number_columns):
+        """Matrix from CSR arrays (linked, not copied). Indices must be increasing on each line."""
+
+        matrix = cls.__new__(cls)
+        matrix._number_columns = number_columns
+        matrix._indptr, matrix._indices = indptr, indices
+        matrix._csc = None
+        return matrix
+
+    def _init_from_ones(self, lines_ones, number_columns):
+        self._number_columns = number_columns
+        self._indptr = array("l", [0])
+        self._indices = array("l")
+        for line_ones in lines_ones:
+            self._indices.extend(sorted(set(line_ones)))
+            self._indptr.append(len(self._indices))
+        self._csc = None
+
+    def __len__(self):
+        return len(self._indptr) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[k] for k in range(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("matrix index out of range")
+
+        return SparseLine(self._indices[self._indptr[i]:self._indptr[i + 1]], self._number_columns)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, SparseMatrix):
+            return self._number_columns == other._number_columns and self._indptr == other._indptr and \
+                self._indices == other._indices
+        try:
+            return len(other) == len(self) and all(line == other_line for line, other_line in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(tuple(tuple(line) for line in self))
+
+    @property
+    def number_columns(self):
+        return self._number_columns
+
+    @property
+    def csr(self):
+        """(indptr, indices) arrays of the CSR format."""
+
+        return self._indptr, self._indices
+
+    @property
+    def csc(self):
+        """(indptr, indices) arrays of the CSC format, computed in O(number of 1) the first time."""
+
+        if self._csc is None:
+            indptr = array("l", [0] * (self._number_columns + 1))
+            for j in self._indices:
+                indptr[j + 1] += 1
+            for j in range(self._number_columns):
+                indptr[j + 1] += indptr[j]
+
+            indices = array("l", [0] * len(self._indices))
+            position = array("l", indptr[:-1])
+            for i in range(len(self)):
+                for k in range(self._indptr[i], self._indptr[i + 1]):
+                    j = self._indices[k]
+                    indices[position[j]] = i
+                    position[j] += 1
+
+            self._csc = (indptr, indices)
+
+        return self._csc
+
+    def ones(self, i):
+        """Increasing column indices of the 1 of line *i*."""
+
+        return self._indices[self._indptr[i]:self._indptr[i + 1]]
+
+    def column_ones(self, j):
+        """Increasing line indices of the 1 of column *j*."""
+
+        indptr, indices = self.csc
+        return indices[indptr[j]:indptr[j + 1]]
+
+    def count(self):
+        """Number of 1 of the matrix."""
+
+        return len(self._indices)
+
+    def transpose(self):
+        """Transposed matrix: the CSC format of the matrix is the CSR format of its transpose."""
+
+        indptr, indices = self.csc
+        transpose = SparseMatrix.from_arrays(indptr, indices, len(self))
+        transpose._csc = (self._indptr, self._indices)
+        return transpose
+
+    def reorder_lines(self, permutation):
+        """New matrix whose line i is line permutation[i]."""
+
+        return SparseMatrix.from_ones((self.ones(i) for i in permutation), self._number_columns)
+
+    def reorder_columns(self, permutation):
+        """New matrix whose column j is column permutation[j]."""
+
+        position = [0] * len(permutation)
+        for j, old_j in enumerate(permutation):
+            position[old_j] = j
+
+        return SparseMatrix.from_ones(([position[j] for j in self.ones(i)] for i in range(len(self))),
+                                      self._number_columns)
+
+    def insert_line(self, position, line):
+        """New matrix with *line* (0/1 values) inserted at line *position*.
+
+        Complexity is O(number of lines + number of 1).
+        """
+
+        line_ones = array("l", (j for j, x in enumerate(line) if x))
+        begin = self._indptr[position]
+        indices = self._indices[:begin] + line_ones + self._indices[begin:]
+        indptr = self._indptr[:position + 1] + array("l", (k + len(line_ones) for k in self._indptr[position:]))
+        return SparseMatrix.from_arrays(indptr, indices, self._number_columns)
+
+    def insert_column(self, position, column):
+        """New matrix with *column* (column[i] is the new cell of line i) inserted at column *position*.
+
+        Complexity is O(number of lines + number of 1).
+        """
+
+        indptr = array("l", [0])
+        indices = array("l")
+        for i, x in enumerate(column):
+            line_ones = self.ones(i)
+            split = bisect_left(line_ones, position)
+            indices.extend(line_ones[:split])
+            if x:
+                indices.append(position)
+            indices.extend(j + 1 for j in line_ones[split:])
+            indptr.append(len(indices))
+
+        return SparseMatrix.from_arrays(indptr, indices, self._number_columns + 1)
+
+    def submatrix_lines(self, line_indices):
+        """New matrix made of the lines in *line_indices* (in this order)."""
+
+        return self.reorder_lines(line_indices)
@@ -3,7 +3,8 @@
 .. currentmodule:: tbs.diss
 
 Data described by a :class:`Diss` can be real (real numbers), intervals (values are subset), or whatever suits
-the application.
+the application. Real dissimilarities can use a "condensed" storage (see :meth:`Diss.__init__`), a contiguous vector
+of floats in the layout of :func:`scipy.spatial.distance.pdist`.
 
 
 Glossary
@@ -28,16 +29,17 @@ Module content
 """
 
 from ._diss import Diss
+from ._index import DissIndex
 from ._order import min, max, rank
-from ._file_io import load, save
+from ._file_io import load, save, load_binary, save_binary
 from ._to_string import to_string
 from ._conversion import from_context_matrix
 
 __author__ = 'francois'
 
-__all__ = ["Diss",
+__all__ = ["Diss", "DissIndex",
            "min", "max", "rank",
-           "load", "save",
+           "load", "save", "load_binary", "save_binary",
            "to_string",
            "from_context_matrix"]
 
@@ -0,0 +1,204 @@
+"""Condensed storage of real dissimilarity values.
+
+Values d(i, j) for i < j are stored in a single contiguous `array('d')`, line by line, in the layout of
+:func:`scipy.spatial.distance.pdist`: d(0, 1), d(0, 2), ..., d(0, n - 1), d(1, 2), ..., d(n - 2, n - 1). The values
+d(i, i) are stored in another `array('d')` of size n.
+
+Both arrays support the buffer protocol: `numpy.frombuffer(values.condensed)` is a zero-copy float64 view of the
+condensed vector, usable by :func:`scipy.spatial.distance.squareform` or :mod:`scipy.cluster.hierarchy`.
+"""
+
+from array import array
+
+__author__ = 'fbrucker'
+
+__all__ = ["CondensedValues", "condensed_index", "float_array"]
+
+
+def condensed_index(n, index_1, index_2):
+    """Position of d(index_1, index_2) in the condensed vector of *n* elements (index_1 < index_2)."""
+
+    return index_1 * (2 * n - index_1 - 1) // 2 + index_2 - index_1 - 1
+
+
+def float_array(values):
+    """`array('d')` of *values*.
+
+    An `array('d')` is returned as is. Contiguous buffers of float64 (like a NumPy float64 vector) are copied with a
+    single memory copy, other buffers (like a strided NumPy slice) value by value.
+    """
+
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array("d", values)
+
+    if view.format != "d" or not view.c_contiguous:
+        return array("d", view.tolist())
+
+    result = array("d")
+    result.frombytes(view.cast("B"))
+    return result
+
+
+def _typed_array(storage, values):
+    """array of *values* with the type of *storage* (an array or a memoryview)."""
+
+    typecode = getattr(storage, "typecode", None) or storage.format
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+class CondensedValues(object):
+    """Values of a dissimilarity on n elements, in a condensed vector and a diagonal."""
+
+    __slots__ = ("condensed", "diagonal")
+
+    def __init__(self, n, value=0, diagonal_value=0):
+        """Constant values.
+
+        Args:
+            n(int): number of elements.
+            value(float): value of d(i, j) for i != j.
+            diagonal_value(float): value of d(i, i).
+        """
+
+        self.condensed = array("d", [value]) * (n * (n - 1) // 2)
+        self.diagonal = array("d", [diagonal_value]) * n
+
+    @classmethod
+    def from_condensed(cls, condensed, diagonal=None, number_elements=None):
+        """Values from a condensed vector, linked if it is an `array('d')`.
+
+        Args:
+            condensed: the n(n - 1)/2 values d(i, j) for i < j, in the layout of
+                :func:`scipy.spatial.distance.pdist`.
+            diagonal: the n values d(i, i). All 0 if None.
+            number_elements(int): n. Inferred from the size of *condensed* if None (an empty vector is then 1
+                element).
+
+        Raises:
+            ValueError: if the size of *condensed* is not a triangular number, or does not match *number_elements*
+                or *diagonal*.
+        """
+
+        values = cls.__new__(cls)
+        values.condensed = float_array(condensed)
+
+        n = number_elements
+        if n is None:
+            n = int(round((1 + (1 + 8 * len(values.condensed)) ** .5) / 2))
+        if n * (n - 1) // 2 != len(values.condensed):
+            raise ValueError("condensed vector of size " + str(len(values.condensed)) + " instead of " +
+                             str(n * (n - 1) // 2))
+
+        if diagonal is None:
+            values.diagonal = array("d", [0]) * n
+        else:
+            values.diagonal = float_array(diagonal)
+            if len(values.diagonal) != n:
+                raise ValueError("diagonal of size " + str(len(values.diagonal)) + " instead of " + str(n))
+
+        return values
+
+    @classmethod
+    def linked(cls, condensed, diagonal):
+        """Values linked to *condensed* and *diagonal*, not copied.
+
+        Args:
+            condensed: sequence of the n(n - 1)/2 values d(i, j) for i < j, like an `array('d')` or a float
+                :class:`memoryview` on a memory-mapped file.
+            diagonal: sequence of the n values d(i, i).
+        """
+
+        values = cls.__new__(cls)
+        values.condensed = condensed
+        values.diagonal = diagonal
+        return values
+
+    def __len__(self):
+        """Number of elements."""
+
+        return len(self.diagonal)
+
+    def get(self, index_1, index_2):
+        """d(index_1, index_2) for index_1 <= index_2."""
+
+        if index_1 == index_2:
+            return self.diagonal[index_1]
+        return self.condensed[condensed_index(len(self.diagonal), index_1, index_2)]
+
+    def set(self, index_1, index_2, value):
+        """d(index_1, index_2) = value for index_1 <= index_2."""
+
+        if index_1 == index_2:
+            self.diagonal[index_1] = value
+        else:
+            self.condensed[condensed_index(len(self.diagonal), index_1, index_2)] = value
+
+    def assign(self, condensed, diagonal=None):
+        """Write all the values d(i, j) for i < j, and d(i, i) if *diagonal* is not None, in place."""
+
+        self.condensed[:] = _typed_array(self.condensed, condensed)
+        if diagonal is not None:
+            self.diagonal[:] = _typed_array(self.diagonal, diagonal)
+
+    def assign_line(self, index, values, xx=True):
+        """Write the values d(index, j) for j >= index (j > index if not *xx*) in place."""
+
+        values = iter(values)
+        diagonal_value = next(values) if xx else None
+
+        n = len(self.diagonal)
+        begin = condensed_index(n, index, index + 1)
+        values = _typed_array(self.condensed, values)
+        if len(values) != n - index - 1:
+            raise ValueError("line of " + str(len(values) + 1) + " values instead of " + str(n - index))
+        self.condensed[begin:begin + n - index - 1] = values
+        if xx:
+            self.diagonal[index] = diagonal_value
+
+    def add(self, zero=0):
+        """Add a last element at distance *zero* of all the elements (itself included).
+
+        Values are copied into new `array('d')`.
+        """
+
+        n = len(self.diagonal)
+        condensed = array("d")
+        begin = 0
+        for i in range(n):
+            end = begin + n - i - 1
+            condensed.extend(self.condensed[begin:end])
+            condensed.append(zero)
+            begin = end
+
+        self.condensed = condensed
+        self.diagonal = array("d", self.diagonal)
+        self.diagonal.append(zero)
+
+    def remove(self, index):
+        """Remove the element *index*.
+
+        Values are copied into new `array('d')`.
+        """
+
+        n = len(self.diagonal)
+        condensed = array("d")
+        begin = 0
+        for i in range(n):
+            end = begin + n - i - 1
+            if i < index:
+                condensed.extend(self.condensed[begin:begin + index - i - 1])
+                condensed.extend(self.condensed[begin + index - i:end])
+            elif i > index:
+                condensed.extend(self.condensed[begin:end])
+            begin = end
+
+        self.condensed = condensed
+        self.diagonal = array("d", self.diagonal)
+        del self.diagonal[index]
@@ -12,16 +12,24 @@
 
 __author__ = 'fbrucker'
 
-__all__ = ["Diss"]
+__all__ = ["Diss", "STORAGES"]
 
+import itertools
+import operator
+from array import array
+
+from ._condensed import CondensedValues
+from ._index import DissIndex
 from ._to_string import to_string
 
+STORAGES = ("lists", "condensed")
+
 
 class Diss(object):
     """Generic Dissimilarity class.
     """
 
-    def __init__(self, elements=tuple(), value=0):
+    def __init__(self, elements=tuple(), value=0, storage="lists"):
         """A dissimilarity d on *elements*.
 
         Create a constant *value* dissimilarity.
@@ -30,11 +38,19 @@ class Diss(object):
             elements (iterable): list of pairwise different elements. The ordering is important when accessing the
                 elements by position instead of value.
             value: initial value.
+            storage (str): how values are stored:
+
+                - "lists": upper triangle as a list of python lists. Values can be anything.
+                - "condensed": real values only, in a contiguous `array('d')` in the layout of
+                  :func:`scipy.spatial.distance.pdist` (see :attr:`condensed`), about 4 times smaller.
 
         Returns:
             A constant *value* dissimilarity for the *elements*
         """
 
+        if storage not in STORAGES:
+            raise ValueError("unknown storage " + repr(storage) + ". Must be in " + repr(STORAGES))
+
         if not elements:
             elements = []
 
@@ -45,12 +61,88 @@ class Diss(object):
             self.vertex_index[element] = index
 
         n = len(self._vertex)
+        self._index = None
+        self._condensed = None
+        if storage == "condensed":
+            self._d = None
+            self._condensed = CondensedValues(n, value, value)
         # list [[d(0,0)..d(n,n)],[d(1,1)..d(n,n)],...,[d(n,n)]]
-        if n:
+        elif n:
             self._d = [[value] * (n - i) for i in range(n)]
         else:
             self._d = []
 
+    @classmethod
+    def from_condensed(cls, elements, condensed, diagonal=None):
+        """Diss with a "condensed" storage from a condensed vector.
+
+        Args:
+            elements (iterable): list of pairwise different elements.
+            condensed: the values d(i, j) for i < j, in the layout of :func:`scipy.spatial.distance.pdist` (like the
+                result of :func:`scipy.spatial.distance.pdist`). An `array('d')` is used as is, not copied.
+            diagonal: the values d(i, i). All 0 if None.
+
+        Raises:
+            ValueError: if the number of values does not match the number of elements.
+
+        Returns(Diss): the dissimilarity.
+        """
+
+        elements = list(elements)
+        return cls._from_values(elements, CondensedValues.from_condensed(condensed, diagonal, len(elements)))
+
+    @classmethod
+    def _from_values(cls, elements, values):
+        diss = cls(storage="condensed")
+        diss._condensed = values
+        for index, element in enumerate(elements):
+            diss._vertex.append(element)
+            diss.vertex_index[element] = index
+
+        if len(diss._vertex) != len(diss._condensed):
+            raise ValueError(str(len(diss._condensed)) + " elements for the values instead of " +
+                             str(len(diss._vertex)))
+
+        return diss
+
+    @property
+    def storage(self):
+        """Storage of the values ("lists" or "condensed")."""
+
+        return self._condensed is None and "lists" or "condensed"
+
+    @property
+    def condensed(self):
+        """Values d(i, j) for i < j, in the layout of :func:`scipy.spatial.distance.pdist`.
+
+        For a "condensed" storage, it is the storage itself (modifying it modifies the dissimilarity): a float64 buffer
+        usable without copy by `numpy.frombuffer`. For a "lists" storage, it is a new `array('d')`.
+        """
+
+        if self._condensed is not None:
+            return self._condensed.condensed
+
+        return array("d", (value for line in self._d for value in line[1:]))
+
+    def value_index(self, build=True):
+        """Sorted-value index of the dissimilarity (see :class:`tbs.diss.DissIndex`).
+
+        Built at the first call and kept until *self* is modified through its methods. While it is kept,
+        :func:`tbs.diss.min`, :func:`tbs.diss.max`, :func:`tbs.diss.rank` (on the whole base set) and
+        :meth:`tbs.graph.Graph.from_dissimilarity` use it instead of scanning all the pairs.
+
+        .. warning:: modifying the array :attr:`condensed` directly does not forget the index.
+
+        Args:
+            build (bool): if :const:`False`, do not build it if it does not exist.
+
+        Returns(DissIndex): the index, or None if it does not exist and *build* is :const:`False`.
+        """
+
+        if self._index is None and build:
+            self._index = DissIndex(self)
+        return self._index
+
     @classmethod
     def from_json(cls, json_diss):
         """Diss from json format
@@ -141,6 +233,8 @@ class Diss(object):
         if idx1 > idx2:
             idx1, idx2 = idx2, idx1
 
+        if self._condensed is not None:
+            return self._condensed.get(idx1, idx2)
         return self._d[idx1][idx2 - idx1]
 
     def set_by_pos(self, index_1, index_2, value):
@@ -155,7 +249,12 @@ class Diss(object):
         """
         if index_1 > index_2:
             index_1, index_2 = index_2, index_1
-        self._d[index_1][index_2 - index_1] = value
+
+        self._index = None
+        if self._condensed is not None:
+            self._condensed.set(index_1, index_2, value)
+        else:
+            self._d[index_1][index_2 - index_1] = value
 
     def get_by_pos(self, index_1, index_2):
         """Dissimilarity value.
@@ -168,6 +267,9 @@ class Diss(object):
         """
         if index_1 > index_2:
             index_1, index_2 = index_2, index_1
+
+        if self._condensed is not None:
+            return self._condensed.get(index_1, index_2)
         return self._d[index_1][index_2 - index_1]
 
     def label_by_pos(self, i):
@@ -180,6 +282,12 @@ class Diss(object):
         :type xx: :class:`bool`
         """
 
+        if self._condensed is not None:
+            vals = set(self._condensed.condensed)
+            if xx:
+                vals.update(self._condensed.diagonal)
+            return frozenset(vals)
+
         vals = set()
         elems = list(self)
         for i, x in enumerate(elems):
@@ -191,6 +299,9 @@ class Diss(object):
     def update(self, d, xx=False):
         """Update the value of the dissimilarity according to *d*.
 
+        Values are written line by line. If *d* is a :class:`Diss`, its values are read from its storage, aligned on
+        the elements of *self*, without calling it pair by pair.
+
         :param d: defined for the elements of *self*.
         :type d: function(x, y)
 
@@ -200,15 +311,20 @@ class Diss(object):
         :returns: self[x, y] = d(x, y)
         """
 
-        elems = list(self)
-        for x in range(len(elems)):
-            # noinspection PyArgumentList
-            for y in range(x, len(elems)):
-                if x != y or xx:
-                    self[elems[x], elems[y]] = d(elems[x], elems[y])
-        return self
+        if isinstance(d, Diss) and d._vertex == self._vertex and d._condensed is not None:
+            return self.update_condensed(d._condensed.condensed, xx and d._condensed.diagonal or None)
+        elif isinstance(d, Diss):
+            lines = self._aligned_lines(d)
+            if not xx:
+                lines = (itertools.islice(line, 1, None) for line in lines)
+        else:
+            elems = self._vertex
+            start = 0 if xx else 1
+            lines = ([d(x, y) for y in elems[i + start:]] for i, x in enumerate(elems))
 
-    def update_by_pos(self, index_correspondence, xx=False):
+        return self._set_lines(lines, xx)
+
+    def update_by_pos(self, index_correspondence, xx=False, vectorized=False):
         """Update the value of the dissimilarity according to *index_correspondence*.
 
         :param index_correspondence: defined for the indices of d (from 0 to len(d)-1).
@@ -217,13 +333,69 @@ class Diss(object):
         :param xx: if :const:`True` , the values of *self* (x, x) are also updated.
         :type xx: :class:`bool`
 
+        :param vectorized: if :const:`True`, *index_correspondence* is called once by line x, with two `array('l')`
+            of the same size: x repeated and the indices y >= x (y > x if not *xx*). It returns the sequence of the
+            values (a NumPy function of `numpy.asarray` of its arguments, for instance).
+        :type vectorized: :class:`bool`
+
         :returns: self[x, y] = d(x, y)
         """
 
-        for x in range(len(self)):
-            for y in range(x, len(self)):
-                if x != y or xx:
-                    self.set_by_pos(x, y, index_correspondence(x, y))
+        n = len(self)
+        start = 0 if xx else 1
+        if vectorized:
+            lines = (index_correspondence(array("l", [x]) * (n - x - start), array("l", range(x + start, n)))
+                     for x in range(n))
+        else:
+            lines = ([index_correspondence(x, y) for y in range(x + start, n)] for x in range(n))
+
+        return self._set_lines(lines, xx)
+
+    def update_condensed(self, condensed, diagonal=None):
+        """Update all the values at once.
+
+        :param condensed: the values d(x, y) for x < y in the layout of :attr:`condensed` (like the result of
+            :func:`scipy.spatial.distance.pdist`).
+        :param diagonal: the values d(x, x). Unchanged if ``None``.
+
+        :raises: :exc:`ValueError` if the number of values does not match.
+
+        :returns: self
+        """
+
+        n = len(self)
+        if len(condensed) != n * (n - 1) // 2 or (diagonal is not None and len(diagonal) != n):
+            raise ValueError("wrong number of values for " + str(n) + " elements")
+
+        if self._condensed is not None:
+            self._index = None
+            self._condensed.assign(condensed, diagonal)
+            return self
+
+        condensed = iter(condensed)
+        lines = (itertools.islice(condensed, n - x - 1) for x in range(n))
+        if diagonal is not None:
+            lines = (itertools.chain((value, ), line) for value, line in zip(diagonal, lines))
+
+        return self._set_lines(lines, diagonal is not None)
+
+    def _set_lines(self, lines, xx):
+        """Write, for each index x, the values d(x, y) for y >= x (y > x if not *xx*)."""
+
+        n = len(self)
+        start = 0 if xx else 1
+        self._index = None
+        if self._condensed is None:
+            for line, values in zip(self._d, lines):
+                values = list(values)
+                if len(values) != n - start:
+                    raise ValueError("line of " + str(len(values)) + " values instead of " + str(n - start))
+                line[start:] = values
+                n -= 1
+            return self
+
+        for x, values in enumerate(lines):
+            self._condensed.assign_line(x, values, xx)
         return self
 
     def restriction(self, element_subset):
@@ -235,10 +407,10 @@ class Diss(object):
         :rtype: :class:`Diss`
         """
 
-        return self.__class__(element_subset).update(self, True)
+        return self.__class__(element_subset, storage=self.storage).update(self, True)
 
     def copy(self):
-        return self.__class__(self._vertex).update(self, True)
+        return self.__class__(self._vertex, storage=self.storage).update(self, True)
 
     def rename(self, x, new_x):
         """Rename element *x* to *new_x*.
@@ -271,6 +443,11 @@ class Diss(object):
 
         self._vertex.append(x)
         self.vertex_index[x] = len(self._vertex) - 1
+        self._index = None
+        if self._condensed is not None:
+            self._condensed.add(zero)
+            return x
+
         self._d.append([])
         for y in range(len(self)):
             self._d[y].append(zero)
@@ -282,14 +459,21 @@ class Diss(object):
             raise ValueError("Element not present.")
 
         pos = self.vertex_index[x]
-        for y in range(pos):
-            del self._d[y][pos - y]
-        del self._d[pos]
+        self._index = None
+        if self._condensed is not None:
+            self._condensed.remove(pos)
+        else:
+            self._remove_line(pos)
 
         self._vertex.remove(x)
         self.vertex_index = {x: i for i, x in enumerate(self._vertex)}
         return x
 
+    def _remove_line(self, pos):
+        for y in range(pos):
+            del self._d[y][pos - y]
+        del self._d[pos]
+
     def __nonzero__(self):
         """False if no elements."""
 
@@ -297,56 +481,142 @@ class Diss(object):
             return True
         return False
 
+    def __contains__(self, x):
+        """True if *x* is an element."""
+
+        return x in self.vertex_index
+
+    # values line by line
+    def _lines(self):
+        """Values d(i, j) for j >= i, for each index i."""
+
+        if self._condensed is None:
+            return iter(self._d)
+
+        return self._condensed_lines(self._condensed)
+
+    @staticmethod
+    def _condensed_lines(values):
+        n = len(values)
+        begin = 0
+        for i in range(n):
+            end = begin + n - i - 1
+            yield itertools.chain((values.diagonal[i],), values.condensed[begin:end])
+            begin = end
+
+    def _aligned_lines(self, d):
+        """Values d(x, y) for the elements y after x in *self*, for each element x of *self*.
+
+        :param d: a :class:`Diss` whose elements contain those of *self* (in any order), or a function.
+        """
+
+        elems = self._vertex
+        if not isinstance(d, Diss):
+            return ([d(x, y) for y in elems[i:]] for i, x in enumerate(elems))
+
+        if d._vertex == elems:
+            return d._lines()
+
+        positions = [d.vertex_index[x] for x in elems]
+        get_by_pos = d.get_by_pos
+        return ([get_by_pos(index, other_index) for other_index in positions[i:]]
+                for i, index in enumerate(positions))
+
+    def _values(self, d=None):
+        """All the values d(i, j) for j >= i, line by line, of *self* or of *d* aligned on *self*."""
+
+        return itertools.chain.from_iterable(self._lines() if d is None else self._aligned_lines(d))
+
+    def _from_lines(self, lines):
+        """New dissimilarity with the elements and the storage of *self*, and the values of *lines*."""
+
+        result = self.__class__(storage=self.storage)
+        result._vertex = list(self._vertex)
+        result.vertex_index = dict(self.vertex_index)
+
+        if self._condensed is None:
+            result._d = [list(line) for line in lines]
+        else:
+            values = CondensedValues(0)
+            for line in lines:
+                line = iter(line)
+                values.diagonal.append(next(line))
+                values.condensed.extend(line)
+            result._condensed = values
+
+        return result
+
+    def _map(self, operation, d, xx=True):
+        """result(x, y) = operation(self(x, y), d(x, y)), result(x, x) = self(x, x) if not *xx*."""
+
+        if self._condensed is not None and isinstance(d, Diss) and d._condensed is not None and \
+                d._vertex == self._vertex:
+            diagonal = self._condensed.diagonal
+            result = self._from_lines(())
+            result._condensed = CondensedValues.linked(
+                array("d", map(operation, self._condensed.condensed, d._condensed.condensed)),
+                array("d", map(operation, diagonal, d._condensed.diagonal) if xx else diagonal))
+            return result
+
+        if xx:
+            return self._from_lines(map(operation, line, other_line)
+                                    for line, other_line in zip(self._lines(), self._aligned_lines(d)))
+
+        def lines():
+            for line, other_line in zip(self._lines(), self._aligned_lines(d)):
+                line, other_line = iter(line), iter(other_line)
+                next(other_line)
+                yield itertools.chain((next(line),), map(operation, line, other_line))
+
+        return self._from_lines(lines())
+
+    def _apply(self, operation, value):
+        """self(x, y) = operation(self(x, y), value) for x != y."""
+
+        self._index = None
+        if self._condensed is None:
+            for line in self._d:
+                line[1:] = map(operation, line[1:], itertools.repeat(value))
+        else:
+            self._condensed.assign(map(operation, self._condensed.condensed, itertools.repeat(value)))
+
+        return self
+
     # rich comparison
     def _base_set_equality(self, other):
         if len(self._vertex) != len(list(other)):
             return False
-        for x in self:
-            if x not in other:
+        for x in other:
+            if x not in self.vertex_index:
                 return False
 
         return True
 
-    def __lt__(self, d):
-        """Pairwise order. Must have the same base set."""
+    def _compare(self, d, operation, strict_operation=None):
+        """Pairwise order. *operation* holds for all the values, *strict_operation* for at least one of them."""
 
         if not self._base_set_equality(d):
             return False
 
-        strict = False
-        for x in self:
-            for y in d:
-                if self(x, y) > d(x, y):
-                    return False
-                if self(x, y) < d(x, y):
-                    strict = True
-        return strict
+        if not all(map(operation, self._values(), self._values(d))):
+            return False
 
-    def __le__(self, d):
+        return strict_operation is None or any(map(strict_operation, self._values(), self._values(d)))
+
+    def __lt__(self, d):
         """Pairwise order. Must have the same base set."""
 
-        if not self._base_set_equality(d):
-            return False
+        return self._compare(d, operator.le, operator.lt)
 
-        for x in self:
-            for y in d:
-                if self(x, y) > d(x, y):
-                    return False
-        return True
+    def __le__(self, d):
+        """Pairwise order. Must have the same base set."""
+
+        return self._compare(d, operator.le)
 
     def __eq__(self, d):
         """Same base set and the same values."""
 
-        if not self._base_set_equality(d):
-            return False
-
-        # values
-        for x in self:
-            for y in d:
-                if self(x, y) != d(x, y):
-                    return False
-
-        return True
+        return self._compare(d, operator.eq)
 
     def __ne__(self, d):
         """not ==."""
@@ -356,91 +626,53 @@ class Diss(object):
     def __gt__(self, d):
         """Pairwise order. Must have the same base set."""
 
-        if not self._base_set_equality(d):
-            return False
-
-        # values
-        strict = False
-        for x in self:
-            for y in d:
-                if self(x, y) < d(x, y):
-                    return False
-                if self(x, y) > d(x, y):
-                    strict = True
-
-        return strict
+        return self._compare(d, operator.ge, operator.gt)
 
     def __ge__(self, d):
         """Pairwise order. Must have the same base set."""
 
-        if not self._base_set_equality(d):
-            return False
-
-        # values
-        for x in self:
-            for y in d:
-                if self(x, y) < d(x, y):
-                    return False
-        return True
+        return self._compare(d, operator.ge)
 
     def __add__(self, other_dissimilarity):
         """result(x, y) = self(x, y) + other_dissimilarity(x, y).
 
-        :param other_dissimilarity: its elements must contains those of *self*.
+        :param other_dissimilarity: its elements must contains those of *self*, in any order.
         :type other_dissimilarity: :class:`tbs.diss.Diss`
 
         :returns: the pointwise sum.
         :rtype: :class:`tbs.diss.Diss`
         """
 
-        elems = list(self)
-        result = self.__class__(elems)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = self(x, y) + other_dissimilarity(x, y)
-        return result
+        return self._map(operator.add, other_dissimilarity)
 
     def __sub__(self, d):
         """result(x, y) = self(x, y) - d(x, y).
 
-        :param d: its elements must contains those of *self*.
+        :param d: its elements must contains those of *self*, in any order.
         :type d: :class:`Diss`
 
         :returns: the pointwise differences.
         :rtype: :class:`Diss`
         """
 
-        elems = list(self)
-        result = self.__class__(elems)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = self(x, y) - d(x, y)
-        return result
+        return self._map(operator.sub, d)
 
     def __mul__(self, d):
         """result(x, y) = self(x, y) * d(x, y).
 
-        :param d: its elements must contains those of *self*.
+        :param d: its elements must contains those of *self*, in any order.
         :type d: :class:`Diss`
 
         :returns: the pointwise multiplication.
         :rtype: :class:`Diss`
         """
 
-        elems = list(self)
-        result = self.__class__(elems)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = self(x, y) * d(x, y)
-        return result
+        return self._map(operator.mul, d)
 
     def __truediv__(self, d):
         """result(x, y) = self(x, y) / d(x, y) for x != y.
 
-        :param d: must have non zero values.
+        :param d: must have non zero values. Its elements must contains those of *self*, in any order.
         :type d: :class:`tbs.diss.Diss`
 
         :returns: the pointwise / for pairs of different elements.
@@ -449,16 +681,7 @@ class Diss(object):
         .. warning:: values of result(x, x) are equal to *self*\ (x, x).
         """
 
-        elems = list(self)
-        result = self.__class__(elems)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                if x == y:
-                    result[x, y] = self(x, y)
-                else:
-                    result[x, y] = self(x, y) / d(x, y)
-        return result
+        return self._map(operator.truediv, d, xx=False)
 
     # += -= *= and /=
     def __iadd__(self, value):
@@ -467,13 +690,7 @@ class Diss(object):
         .. warning:: values of *self* (x, x) are unchanged.
         """
 
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i + 1:]:
-                self[x, y] = self(x, y) + value
-
-        return self
+        return self._apply(operator.add, value)
 
     def __isub__(self, value):
         """self(x, y) = self(x, y) - value for x != y.
@@ -481,13 +698,7 @@ class Diss(object):
         .. warning:: values of *self* (x, x) are unchanged.
         """
 
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i + 1:]:
-                self[x, y] = self(x, y) - value
-
-        return self
+        return self._apply(operator.sub, value)
 
     def __imul__(self, value):
         """self(x, y) = self(x, y) * value for x != y.
@@ -495,13 +706,7 @@ class Diss(object):
         .. warning:: values of *self* (x, x) are unchanged.
         """
 
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i + 1:]:
-                self[x, y] = self(x, y) * value
-
-        return self
+        return self._apply(operator.mul, value)
 
     def __itruediv__(self, value):
         """self(x, y) = self(x, y) / value for x != y.
@@ -509,44 +714,20 @@ class Diss(object):
         .. warning:: values of *self* (x, x) are unchanged.
         """
 
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i + 1:]:
-                self[x, y] = self(x, y) / value
-
-        return self
+        return self._apply(operator.truediv, value)
 
     # +d -d abs(d)
     def __pos__(self):
         """result(x, y) = +self(x, y)."""
 
-        result = self.copy()
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = +self(x, y)
-        return result
+        return self._from_lines(map(operator.pos, line) for line in self._lines())
 
     def __neg__(self):
         """result(x, y) = -self(x, y)."""
 
-        result = self.copy()
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = -self(x, y)
-        return result
+        return self._from_lines(map(operator.neg, line) for line in self._lines())
 
     def __abs__(self):
         """result(x, y) = :meth:`abs`\ (*self* (x, y))."""
 
-        result = self.copy()
-        elems = list(self)
-
-        for i, x in enumerate(elems):
-            for y in elems[i:]:
-                result[x, y] = abs(self(x, y))
-        return result
+        return self._from_lines(map(abs, line) for line in self._lines())
@@ -11,11 +11,26 @@ Module content
 
 __author__ = 'fbrucker'
 
-__all__ = ["load", "save"]
+__all__ = ["load", "save", "load_binary", "save_binary"]
 
+import itertools
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from ._condensed import CondensedValues
 from ._diss import Diss
 from ._to_string import to_string
 
+BINARY_MAGIC = b"TBSDISS1"
+
+# magic, byte order ("<" or ">"), value typecode ("d" or "f"), number of elements, size of the label table
+BINARY_HEADER = struct.Struct("<8scc6xQQ")
+
+_BINARY_CHUNK = 1 << 16
+
 
 def load(f, kind="guess", sep=None, number=True):
     """Load a dissimilarity from file *f*.
@@ -154,3 +169,78 @@ def save(dissimilarity, f, kind="square", sep=" "):
     f.write(to_string(dissimilarity, kind, sep))
 
     return f
+
+
+def save_binary(dissimilarity, f, typecode="d"):
+    """Write the dissimilarity *d* in binary file f.
+
+    The file is made of a header, the labels as a json list and the values in the native byte order: the condensed
+    vector (see :attr:`tbs.diss.Diss.condensed`) then the n values d(x, x). Values must be real numbers.
+
+    :param dissimilarity: dissimilarity to save
+    :type dissimilarity: :class:`tbs.diss.Diss`
+    :param f: file opened in binary mode
+    :param typecode: ``'d'`` for float64 values, ``'f'`` for float32 values.
+
+    .. seealso:: :func:`load_binary`
+    """
+
+    if typecode not in ("d", "f"):
+        raise ValueError("typecode must be 'd' or 'f', not " + repr(typecode))
+
+    labels = json.dumps(list(dissimilarity)).encode("utf-8")
+    labels += b" " * (-(BINARY_HEADER.size + len(labels)) % 8)
+
+    f.write(BINARY_HEADER.pack(BINARY_MAGIC, sys.byteorder == "little" and b"<" or b">", typecode.encode("ascii"),
+                               len(dissimilarity), len(labels)))
+    f.write(labels)
+
+    condensed = dissimilarity.condensed
+    if (getattr(condensed, "typecode", None) or condensed.format) == typecode:
+        f.write(condensed)
+    else:
+        values = iter(condensed)
+        for chunk in iter(lambda: array(typecode, itertools.islice(values, _BINARY_CHUNK)), array(typecode)):
+            f.write(chunk)
+    f.write(array(typecode, (dissimilarity.get_by_pos(i, i) for i in range(len(dissimilarity)))))
+
+    return f
+
+
+def load_binary(f, writable=False):
+    """Dissimilarity of a binary file, memory-mapped.
+
+    Values are not read: the operating system loads the parts of the file accessed, so the file can be larger than
+    the memory. The dissimilarity has a "condensed" storage whose values are a view of the file. If *writable*,
+    modifying the dissimilarity modifies the file. Adding or removing elements copies the values in memory.
+
+    :param f: file opened in binary mode (``'r+b'`` if *writable*). It can be closed once loaded.
+    :param writable: the values can be modified or not.
+
+    :rtype: :class:`diss.Diss`
+
+    :raises: :exc:`ValueError` if the file is not a binary dissimilarity or has another byte order.
+
+    .. seealso:: :func:`save_binary`
+    """
+
+    memory = mmap.mmap(f.fileno(), 0, access=writable and mmap.ACCESS_WRITE or mmap.ACCESS_READ)
+    if len(memory) < BINARY_HEADER.size:
+        raise ValueError("not a binary dissimilarity file")
+    magic, byte_order, typecode, n, labels_size = BINARY_HEADER.unpack_from(memory)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary dissimilarity file")
+    if byte_order != (sys.byteorder == "little" and b"<" or b">"):
+        raise ValueError("values are not in the native byte order")
+    typecode = typecode.decode("ascii")
+
+    labels = [isinstance(label, list) and tuple(label) or label
+              for label in json.loads(memory[BINARY_HEADER.size:BINARY_HEADER.size + labels_size].decode("utf-8"))]
+
+    begin = BINARY_HEADER.size + labels_size
+    end = begin + array(typecode).itemsize * (n * (n - 1) // 2 + n)
+    if len(labels) != n or len(memory) < end:
+        raise ValueError("truncated binary dissimilarity file")
+
+    values = memoryview(memory)[begin:end].cast(typecode)
+    return Diss._from_values(labels, CondensedValues.linked(values[:n * (n - 1) // 2], values[n * (n - 1) // 2:]))
@@ -0,0 +1,111 @@
+"""Sorted-value index of a dissimilarity.
+
+Pairs of different elements are sorted once by value (a stable argsort of the condensed vector, see
+:attr:`tbs.diss.Diss.condensed`): minimum and maximum are then read in O(1) and threshold graphs are streams of
+consecutive pairs. Neighbours of each element, sorted by value, are computed on demand and kept.
+
+The index is built by :meth:`tbs.diss.Diss.value_index` and forgotten as soon as the dissimilarity is modified.
+"""
+
+import bisect
+from array import array
+from math import isqrt
+
+__author__ = 'fbrucker'
+
+__all__ = ["DissIndex"]
+
+
+class DissIndex(object):
+    """Pairs of positions sorted by value. Ties are in the line by line order of the pairs."""
+
+    def __init__(self, dissimilarity):
+        """Index of *dissimilarity*. Values must be comparable."""
+
+        n = len(dissimilarity)
+        self._dissimilarity = dissimilarity
+        self._neighbours = dict()
+
+        if dissimilarity.storage == "condensed":
+            values = dissimilarity.condensed
+        else:
+            values = [value for line in dissimilarity._lines() for value in line[1:]]
+
+        self.order = array("l", sorted(range(len(values)), key=values.__getitem__))
+        self.values = [values[k] for k in self.order]
+        if dissimilarity.storage == "condensed":
+            self.values = array("d", self.values)
+
+        diagonal = [dissimilarity.get_by_pos(i, i) for i in range(n)]
+        self._diagonal_min = n and min(range(n), key=diagonal.__getitem__)
+        self._diagonal_max = n and max(range(n), key=diagonal.__getitem__)
+
+    def __len__(self):
+        """Number of pairs of different elements."""
+
+        return len(self.order)
+
+    def pair(self, position):
+        """Couple (i, j), i < j, of element positions of the *position*-th smallest value."""
+
+        n = len(self._dissimilarity)
+        k = self.order[position]
+        i = n - 2 - (isqrt(4 * n * (n - 1) - 8 * k - 7) - 1) // 2
+        return i, k + i + 1 - n * (n - 1) // 2 + (n - i) * (n - i - 1) // 2
+
+    def pairs(self, begin=0, end=None):
+        """Triplets (i, j, value) of the pairs from the *begin*-th to the *end*-th smallest value (excluded)."""
+
+        if end is None:
+            end = len(self)
+        for position in range(begin, end):
+            i, j = self.pair(position)
+            yield i, j, self.values[position]
+
+    def threshold_position(self, threshold=None):
+        """Number of pairs whose value is <= *threshold* (all of them if *threshold* is None)."""
+
+        if threshold is None:
+            return len(self)
+        return bisect.bisect_right(self.values, threshold)
+
+    def _extremum(self, position, diagonal, better):
+        if len(self):
+            i, j = self.pair(position)
+            candidate = (self.values[position], i, j)
+        else:
+            candidate = None
+
+        if diagonal is not None and len(self._dissimilarity):
+            value = self._dissimilarity.get_by_pos(diagonal, diagonal)
+            if candidate is None or better(value, candidate[0]) or \
+                    (value == candidate[0] and (diagonal, diagonal) < candidate[1:]):
+                candidate = (value, diagonal, diagonal)
+
+        return candidate
+
+    def minimum(self, xx=False):
+        """Triplet (value, i, j) of the first (line by line) pair of minimal value. None if no pair.
+
+        :param xx: considering the (i, i) pairs or not.
+        """
+
+        return self._extremum(0, self._diagonal_min if xx else None, lambda value, other: value < other)
+
+    def maximum(self, xx=False):
+        """Triplet (value, i, j) of the first (line by line) pair of maximal value. None if no pair.
+
+        :param xx: considering the (i, i) pairs or not.
+        """
+
+        position = len(self) and bisect.bisect_left(self.values, self.values[-1])
+        return self._extremum(position, self._diagonal_max if xx else None, lambda value, other: value > other)
+
+    def neighbours(self, i):
+        """Positions of all the elements (i included) sorted by their value to i. Ties are in position order."""
+
+        if i not in self._neighbours:
+            get_by_pos = self._dissimilarity.get_by_pos
+            self._neighbours[i] = array("l", sorted(range(len(self._dissimilarity)),
+                                                    key=lambda j: get_by_pos(i, j)))
+        return self._neighbours[i]
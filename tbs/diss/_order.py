@@ -19,8 +19,13 @@ def min(d, element_subset=None, indices=False, xx=False, index=False):
               where self(*minx*, *miny*) = *value*.
 
     :rtype: a value or a :class:`dict`.
+
+    .. note:: O(1) on the whole base set if the index of *d* is built (see :meth:`tbs.diss.Diss.value_index`).
     """
 
+    if not element_subset and not index and _value_index(d) is not None:
+        return _indexed_extremum(d, d.value_index().minimum(xx), indices, 'min')
+
     mind = None
     minx = None
     miny = None
@@ -78,8 +83,13 @@ def max(d, element_subset=None, indices=False, xx=False, index=False):
               where self(*maxx*, *maxy*) = *value*.
 
     :rtype: a value or a :class:`dict`.
+
+    .. note:: O(1) on the whole base set if the index of *d* is built (see :meth:`tbs.diss.Diss.value_index`).
     """
 
+    if not element_subset and not index and _value_index(d) is not None:
+        return _indexed_extremum(d, d.value_index().maximum(xx), indices, 'max')
+
     maxd = None
     maxx = None
     maxy = None
@@ -128,8 +138,14 @@ def rank(d, element_subset=None):
               a dict also taken its keys in Y. r[x][y] is the rank of y for x
               (d(x, y) is the r[x][y] smallest value of {d(x, y) | y in Y}).
               By convention, rank begins at 0.
+
+    .. note:: on the whole base set, the neighbours of each element are sorted once if the index of *d* is built
+              (see :meth:`tbs.diss.Diss.value_index`).
     """
 
+    if not element_subset and _value_index(d) is not None:
+        return _indexed_rank(d)
+
     if not element_subset:
         element_subset = list(d)
     else:
@@ -148,3 +164,40 @@ def rank(d, element_subset=None):
                 pos += 1
             r[x][y] = pos
     return r
+
+
+def _value_index(d):
+    value_index = getattr(d, "value_index", None)
+    return value_index and value_index(False)
+
+
+def _indexed_extremum(d, extremum, indices, key):
+    if extremum is None:
+        value, x, y = None, None, None
+    else:
+        value, x, y = extremum[0], d.label_by_pos(extremum[1]), d.label_by_pos(extremum[2])
+
+    if not indices:
+        return value
+    else:
+        return {'x': x,
+                'y': y,
+                key: value}
+
+
+def _indexed_rank(d):
+    value_index = d.value_index()
+    elems = list(d)
+
+    r = dict()
+    for i, x in enumerate(elems):
+        r[x] = dict()
+        neighbours = value_index.neighbours(i)
+        pos = 0
+        value = d.get_by_pos(i, neighbours[0])
+        for j in neighbours:
+            if d.get_by_pos(i, j) != value:
+                value = d.get_by_pos(i, j)
+                pos += 1
+            r[x][elems[j]] = pos
+    return r
@@ -7,11 +7,13 @@
 """
 
 __all__ = ["GammaFree", "is_gamma_free_matrix",
-           "box_lattice",
-           "to_string",
+           "box_lattice", "BoxLattice",
+           "batch_box_lattices", "BatchResult",
+           "to_string", "write_string",
            "draw_to_pyplot"]
 
 from ._gamma_free import GammaFree, is_gamma_free_matrix
-from ._box_lattice import box_lattice
-from ._to_string import to_string
+from ._box_lattice import box_lattice, BoxLattice
+from ._batch import batch_box_lattices, BatchResult
+from ._to_string import to_string, write_string
 from ._draw_pyplot import draw_to_pyplot
@@ -0,0 +1,128 @@
+"""Batch processing of many context matrices.
+
+Each matrix is doubly lexically reordered, approximated into a Gamma-free matrix (by adding 1) and its boxes are
+extracted. Matrices are sent to the worker processes by chunks, as the column indices of the 1 of their lines, and
+results come back as soon as a chunk is done. Results are compact: permutations, added cells and a
+:class:`tbs.gamma_free.BoxLattice`, all picklable.
+"""
+
+import concurrent.futures
+import itertools
+import os
+from array import array
+
+from ..contextmatrix._context_matrix import DOUBLY_LEXICAL_ENGINES, matrix_from_ones
+from ..contextmatrix._overlay_matrix import OverlayMatrix
+from ..contextmatrix._partition_refinement import lines_ones
+from ._box_lattice import BoxLattice
+from ._gamma_free import GammaFree, approximation_delta
+
+__author__ = 'fbrucker'
+
+__all__ = ["BatchResult", "batch_box_lattices"]
+
+
+class BatchResult(object):
+    """Result of the batch processing of a matrix.
+
+    Attributes:
+        index(int): position of the matrix in the batch.
+        lines(array): doubly lexical order. Line i of the reordered matrix is line lines[i] of the matrix.
+        columns(array): doubly lexical order. Column j of the reordered matrix is column columns[j] of the matrix.
+        added(list): (line, column) cells of the reordered matrix set to 1 by the Gamma-free approximation.
+        boxes(BoxLattice): boxes of the approximated matrix.
+    """
+
+    __slots__ = ("index", "lines", "columns", "added", "boxes")
+
+    def __init__(self, index, lines, columns, added, boxes):
+        self.index = index
+        self.lines = lines
+        self.columns = columns
+        self.added = added
+        self.boxes = boxes
+
+    def __getstate__(self):
+        return self.index, self.lines, self.columns, self.added, self.boxes
+
+    def __setstate__(self, state):
+        self.index, self.lines, self.columns, self.added, self.boxes = state
+
+    def gamma_free(self, context_matrix):
+        """Reordered and approximated *context_matrix*, the matrix of index :attr:`index` in the batch.
+
+        Returns(GammaFree): a context matrix with an "overlay" storage (see :class:`tbs.contextmatrix.OverlayMatrix`).
+        """
+
+        context_matrix = GammaFree.from_context_matrix(context_matrix)
+        context_matrix.reorder_lines(self.lines)
+        context_matrix.reorder_columns(self.columns)
+
+        return GammaFree(OverlayMatrix(context_matrix.matrix, self.added), context_matrix.elements,
+                         context_matrix.attributes, storage="overlay")
+
+
+def _process(index, matrix_lines_ones, number_columns, engine):
+    matrix = matrix_from_ones(matrix_lines_ones, number_columns)
+    lines, columns = DOUBLY_LEXICAL_ENGINES[engine](matrix, None)
+    reordered = tuple(tuple(matrix[i][j] for j in columns) for i in lines)
+
+    added = approximation_delta(reordered)
+    boxes = BoxLattice.from_matrix(OverlayMatrix(reordered, added))
+
+    return BatchResult(index, array("l", lines), array("l", columns), added, boxes)
+
+
+def _process_chunk(chunk, engine):
+    return [_process(index, matrix_lines_ones, number_columns, engine)
+            for index, matrix_lines_ones, number_columns in chunk]
+
+
+def batch_box_lattices(matrices, engine="blocks", max_workers=None, chunksize=16):
+    """Reorder, approximate and extract the boxes of many matrices.
+
+    For each matrix, equivalent to `box_lattice(GammaFree.from_approximation(context_matrix.reorder_doubly_lexical()),
+    compact=True)`.
+
+    Args:
+        matrices(iterable): 0/1 matrices or :class:`tbs.contextmatrix.ContextMatrix`. Read lazily.
+        engine(str): doubly lexical order engine (see :meth:`tbs.contextmatrix.ContextMatrix.reorder_doubly_lexical`).
+        max_workers(int): number of processes. Matrices are processed in the current process if equal to 1, in a
+            :class:`concurrent.futures.ProcessPoolExecutor` of *max_workers* processes otherwise (None for the number
+            of processors).
+        chunksize(int): number of matrices sent at once to a process.
+
+    Returns: generator of :class:`BatchResult`, in completion order (use :attr:`BatchResult.index` to match the
+        matrices).
+    """
+
+    if engine not in DOUBLY_LEXICAL_ENGINES:
+        raise ValueError("unknown engine " + repr(engine) + ". Must be in " + repr(sorted(DOUBLY_LEXICAL_ENGINES)))
+
+    def compact(index, matrix):
+        matrix = getattr(matrix, "matrix", matrix)
+        return index, lines_ones(matrix), len(matrix[0])
+
+    tasks = itertools.starmap(compact, enumerate(matrices))
+    chunks = iter(lambda: list(itertools.islice(tasks, chunksize)), [])
+
+    if max_workers == 1:
+        for chunk in chunks:
+            for result in _process_chunk(chunk, engine):
+                yield result
+        return
+
+    number_workers = max_workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        pending = set()
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is not None:
+                pending.add(executor.submit(_process_chunk, chunk, engine))
+                if len(pending) < 2 * number_workers:
+                    continue
+
+            while pending and (chunk is None or len(pending) >= 2 * number_workers):
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        yield result
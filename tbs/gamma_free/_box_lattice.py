@@ -1,12 +1,14 @@
 __author__ = 'fbrucker'
 
-__all__ = ["box_lattice"]
+__all__ = ["box_lattice", "BoxLattice"]
+
+from array import array
 
 from ..graph import DirectedGraph
 from ..dismantlable import DismantlableLattice
 
 
-def box_lattice(doubly_lexically_ordered_gamma_free):
+def box_lattice(doubly_lexically_ordered_gamma_free, compact=False):
     """Box lattice associated with a doubly lexically ordered gamma free context matrix
 
     The context matrix must be gamma free (otherwise `box_lattice(gamma_free.gamma_free.reorder_doubly_lexical())`). 
@@ -16,49 +18,188 @@ def box_lattice(doubly_lexically_ordered_gamma_free):
 
     Args:
         doubly_lexically_ordered_gamma_free(GammaFree): doubly lexically ordered gama free context matrix.
+        compact(bool): if True, return a :class:`BoxLattice` whose boxes are integers. The lattice is not built.
 
     Returns(DismantlableLattice): lattice associated with the gamma free context matrix.
     """
 
-    box_hase_diagram = DirectedGraph()
+    boxes = BoxLattice.from_matrix(doubly_lexically_ordered_gamma_free.matrix)
+    if compact:
+        return boxes
+
+    return boxes.lattice()
+
+
+class BoxLattice(object):
+    """Boxes of a doubly lexically ordered gamma free matrix and the Hasse diagram of their lattice.
+
+    Box *k* is an integer. Its top left corner is (line_begin[k], column_begin[k]) and its bottom right corner
+    (line_end[k], column_end[k]): the four arrays are stored in parallel. The boxes covering box *k* are
+    ``above_indices[above_indptr[k]:above_indptr[k + 1]]`` (compressed sparse row format).
+
+    Lines and columns are the ones of the matrix with a last line (bottom) and a last column (top) full of 1.
+    """
+
+    def __init__(self, line_begin, column_begin, line_end, column_end, above_indptr, above_indices, bottom, top):
+        self.line_begin = line_begin
+        self.column_begin = column_begin
+        self.line_end = line_end
+        self.column_end = column_end
+        self.above_indptr = above_indptr
+        self.above_indices = above_indices
+        self.bottom = bottom
+        self.top = top
+        self._under = None
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Boxes of a doubly lexically ordered and Gamma free 0/1 matrix. See :func:`box_lattice`."""
 
-    box_matrix = ClusterLineFromMatrix.box_matrix(doubly_lexically_ordered_gamma_free.matrix)
+        indices, line_begin, column_begin, line_end, column_end = ClusterLineFromMatrix.box_indices(matrix)
+        number_columns = len(indices[0])
 
-    pile = [box_matrix[-1][0]]
+        bottom = indices[-1][0]
+        top = indices[0][-1]
 
-    while pile:
-        current = pile.pop()
-        (line_begin, column_begin), (line_end, column_end) = current
+        above_boxes = [None] * len(line_begin)
+        above_boxes[bottom] = []
+        pile = [bottom]
 
-        column = column_begin
-        last_above = None
+        while pile:
+            current = pile.pop()
+            current_above = above_boxes[current]
+            line_begin_current, column_end_current = line_begin[current], column_end[current]
 
-        while column <= column_end:
-            line = line_begin - 1
-            while line >= 0 and box_matrix[line][column] is None:
-                line -= 1
+            column = column_begin[current]
+            last_above = None
 
-            if line >= 0:
-                above = box_matrix[line][column]
-                box_hase_diagram.update([(current, above)])
+            while column <= column_end_current:
+                line = line_begin_current - 1
+                while line >= 0 and indices[line][column] < 0:
+                    line -= 1
 
-                pile.append(above)
-                last_above = above
-                column = last_above[1][1] + 1
-            else:
+                if line >= 0:
+                    above = indices[line][column]
+                    current_above.append(above)
+                    last_above = above
+                    column = column_end[above] + 1
+                else:
+                    column += 1
+
+            column = column_end_current + 1
+            while column < number_columns and indices[line_begin_current][column] < 0:
                 column += 1
 
-        column = column_end + 1
+            if column < number_columns:
+                above = indices[line_begin_current][column]
+                if last_above is None or line_end[last_above] < line_begin[above]:
+                    current_above.append(above)
+
+            for above in current_above:
+                if above_boxes[above] is None:
+                    above_boxes[above] = []
+                    pile.append(above)
+
+        above_indptr = array("l", [0])
+        above_indices = array("l")
+        for current_above in above_boxes:
+            if current_above:
+                above_indices.extend(sorted(set(current_above)))
+            above_indptr.append(len(above_indices))
+
+        return cls(line_begin, column_begin, line_end, column_end, above_indptr, above_indices, bottom, top)
+
+    def __len__(self):
+        return len(self.line_begin)
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def box(self, k):
+        """Box *k* as a ((line, column), (line, column)) couple of top left and bottom right corners."""
+
+        return (self.line_begin[k], self.column_begin[k]), (self.line_end[k], self.column_end[k])
+
+    def above(self, k):
+        """Boxes covering box *k*."""
+
+        return self.above_indices[self.above_indptr[k]:self.above_indptr[k + 1]]
+
+    def under(self, k):
+        """Boxes covered by box *k*. The reverse Hasse diagram is computed on first call."""
+
+        if self._under is None:
+            self._under = [array("l") for k in range(len(self))]
+            for current in range(len(self)):
+                for above in self.above(current):
+                    self._under[above].append(current)
+
+        return self._under[k]
+
+    def edges(self):
+        """Hasse diagram edges (box, covering box)."""
+
+        for current in range(len(self)):
+            for above in self.above(current):
+                yield current, above
+
+    def hierarchical_decomposition(self):
+        """ Decompose the lattice into hierarchies.
 
-        while column < len(box_matrix[0]) and box_matrix[line_begin][column] is None:
-            column += 1
+        Same algorithm as :meth:`tbs.dismantlable.DismantlableLattice.hierarchical_decomposition`, on the Hasse
+        diagram (the lattice is not built). Sup-irreducible boxes are examined by increasing index.
 
-        if column < len(box_matrix[0]):
-            above = box_matrix[line_begin][column]
-            if last_above is None or last_above[1][0] < above[0][0]:
-                box_hase_diagram.update([(current, above)])
+        Returns(array): hierarchical level of each box (0 is the first hierarchy).
+        """
+
+        height = array("l", [-1]) * len(self)
+        degree = [len(self.above(k)) for k in range(len(self))]
+        sup_irreducibles = {k for k in range(len(self)) if len(self.under(k)) == 1}
+        next_neighbor = dict()
+        current_height = 0
+
+        while sup_irreducibles:
+            current_chains = set()
+            deleted_sup_irreducibles = set()
+            for current_sup_irreducible in sorted(sup_irreducibles):
+                possible_chain = set()
+                vertex = current_sup_irreducible
+                is_hierarchical = False
+                while degree[vertex] <= 1:
+                    possible_chain.add(vertex)
+                    if degree[vertex] == 0 or vertex in current_chains:
+                        is_hierarchical = True
+                        break
+                    vertex = next_neighbor.get(vertex, self.above(vertex)[0])
+                if is_hierarchical:
+                    deleted_sup_irreducibles.add(current_sup_irreducible)
+                    current_chains.update(possible_chain)
+
+            for x in current_chains:
+                height[x] = current_height
+                for y in self.under(x):
+                    degree[y] -= 1
+                    if degree[y] == 1:
+                        for z in self.above(y):
+                            if height[z] < 0:
+                                next_neighbor[y] = z
+                                break
+            current_height += 1
+
+            sup_irreducibles.difference_update(deleted_sup_irreducibles)
+
+        height[self.bottom] = max(height) + 1
+        return height
+
+    def lattice(self):
+        """Lattice whose elements are the boxes as couples of corners (see :meth:`box`).
+
+        Returns(DismantlableLattice): lattice associated with the gamma free context matrix.
+        """
 
-    return DismantlableLattice(box_hase_diagram)
+        box = self.box
+        return DismantlableLattice(DirectedGraph.from_edges((box(current), box(above))
+                                                            for current, above in self.edges()))
 
 
 class ClusterLineFromMatrix(object):
@@ -77,67 +218,139 @@ class ClusterLineFromMatrix(object):
         :return: a matrix with the same dimensions.
         """
 
-        matrix = [current_line for current_line in cls(matrix)]
+        indices, line_begin, column_begin, line_end, column_end = cls.box_indices(matrix)
+        boxes = [((line_begin[k], column_begin[k]), (line_end[k], column_end[k])) for k in range(len(line_begin))]
+
+        return tuple(tuple(k >= 0 and boxes[k] or None for k in line) for line in indices)
+
+    @classmethod
+    def box_indices(cls, matrix):
+        """ Box index matrix.
+
+        Boxes are numbered from 0, line by line from top to bottom and from left to right. Cell (i, j) is the
+        index of its box or -1 (if no box cluster). Box *k* corners are (line_begin[k], column_begin[k]) and
+        (line_end[k], column_end[k]).
+
+        :param matrix: doubly lexically ordered and Gamma free 0/1 matrix
+        :return: (index matrix as a list of arrays, line_begin, column_begin, line_end, column_end)
+        """
+
+        correspondence = dict()
+        line_begin, column_begin = array("l"), array("l")
+        line_end, column_end = array("l"), array("l")
+
+        indices = []
+        for i, line in enumerate(cls(matrix)):
+            line_indices = array("l", [-1]) * len(line)
+            for j, elem in enumerate(line):
+                if elem is None:
+                    continue
+                k = correspondence.get(elem)
+                if k is None:
+                    k = correspondence[elem] = len(line_begin)
+                    line_begin.append(i)
+                    column_begin.append(j)
+                    line_end.append(i)
+                    column_end.append(j)
+                else:
+                    line_end[k] = i
+                    column_end[k] = j
+                line_indices[j] = k
+            indices.append(line_indices)
+
+        return indices, line_begin, column_begin, line_end, column_end
+
+    @classmethod
+    def boxes(cls, matrix):
+        """ Boxes, as soon as they are closed.
+
+        Lines are read one at a time and a box is yielded once the line below its bottom edge has been read. Only
+        the current and previous lines and the open boxes are kept in memory, thus *matrix* can be a lazy matrix
+        (for instance a :class:`tbs.contextmatrix.MappedBitMatrix`). The matrix is read twice (see
+        :meth:`__init__`).
+
+        Boxes are ((l1, c1), (l2, c2)) couples (see :meth:`box_matrix`), yielded in the order of their bottom line,
+        then of their top left corner.
 
-        cluster_correspondence = {None: None}
+        :param matrix: doubly lexically ordered and Gamma free 0/1 matrix
+        """
 
-        for i, line in enumerate(matrix):
+        open_boxes = dict()
+        for i, line in enumerate(cls(matrix)):
+            line_clusters = set()
             for j, elem in enumerate(line):
                 if elem is None:
                     continue
-                if elem not in cluster_correspondence:
-                    cluster_correspondence[elem] = ((i, j), (i, j))
+                line_clusters.add(elem)
+                box = open_boxes.get(elem)
+                if box is None:
+                    open_boxes[elem] = [(i, j), (i, j)]
                 else:
-                    begin, end = cluster_correspondence[elem]
-                    cluster_correspondence[elem] = (begin, (i, j))
+                    box[1] = (i, j)
 
-        return tuple(tuple(cluster_correspondence[x] for x in line) for line in matrix)
+            for elem in [elem for elem in open_boxes if elem not in line_clusters]:
+                yield tuple(open_boxes.pop(elem))
+
+        for box in open_boxes.values():
+            yield tuple(box)
 
     def __init__(self, matrix):
         """
 
-        :param matrix:   doubly lexically ordered and Gamma free 0/1 matrix.
+        :param matrix:   doubly lexically ordered and Gamma free 0/1 matrix. It is not copied and its lines are read
+            on demand.
 
         Add a last column full of 1 (top) and a last line full of 1 (bottom.
         """
 
-        self.matrix = [list(line) + [1] for line in matrix]
-        self.matrix.append([1] * (len(matrix[0]) + 1))
+        self.matrix = matrix
+        self.number_lines = len(matrix) + 1
+        self.number_columns = len(matrix[0]) + 1
 
         self.current_line = None
         self.previous_line = None
-        self.number_cluster = len(self.matrix)
+        self.number_cluster = self.number_lines
         self.column_difference = self._compute_column_difference()
 
+    def _line(self, line):
+        """Line *line* with the last 1 column. The last line is full of 1."""
+
+        if line < len(self.matrix):
+            return list(self.matrix[line]) + [1]
+        return [1] * self.number_columns
+
     def __iter__(self):
-        for line in range(len(self.matrix)):
-            self.current_line = [None] * len(self.matrix[line])
+        previous_values = None
+        for line in range(self.number_lines):
+            values = self._line(line)
+            self.current_line = [None] * self.number_columns
             cut = False
-            for column in range(len(self.matrix[line]) - 1, -1, -1):
-                if self.matrix[line][column] == 0:
+            for column in range(self.number_columns - 1, -1, -1):
+                if values[column] == 0:
                     continue
 
-                if line and not cut and self.matrix[line - 1][column] == 1:
+                if line and not cut and previous_values[column] == 1:
                     self.current_line[column] = self.previous_line[column]
-                elif (line and self.matrix[line - 1][column] == 0) or cut or line == 0:
+                elif (line and previous_values[column] == 0) or cut or line == 0:
                     cut = True
                     self.current_line[column] = self.number_cluster
                     self.number_cluster += 1
 
-            for column in range(len(self.matrix[0]) - 1):
-                if self.matrix[line][column] == self.matrix[line][column + 1] == 1 \
-                        and line > self.column_difference[column]:
+            for column in range(self.number_columns - 1):
+                if values[column] == values[column + 1] == 1 and line > self.column_difference[column]:
                     self.current_line[column + 1] = self.current_line[column]
 
             yield self.current_line
             self.previous_line = self.current_line
+            previous_values = values
 
     def _compute_column_difference(self):
-        column_difference = [-1] * len(self.matrix[0])
-        for j in range(len(self.matrix[0]) - 2, -1, -1):
-            for i in range(len(self.matrix) - 1, -1, -1):
-                if column_difference[j] == -1 and self.matrix[i][j] != self.matrix[i][j + 1]:
+        """Last line where columns j and j + 1 differ (-1 if equal), in one pass over the lines."""
+
+        column_difference = [-1] * self.number_columns
+        for i in range(self.number_lines):
+            values = self._line(i)
+            for j in range(self.number_columns - 1):
+                if values[j] != values[j + 1]:
                     column_difference[j] = i
-                    break
         return column_difference
-
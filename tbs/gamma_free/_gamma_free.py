@@ -1,7 +1,10 @@
 __author__ = 'fbrucker'
 
+import heapq
 
-from ..contextmatrix import ContextMatrix
+from ..contextmatrix import ContextMatrix, OverlayMatrix
+from ..contextmatrix._context_matrix import STORAGES, matrix_from_ones
+from ..contextmatrix._partition_refinement import lines_ones
 from ._gamma_free_column_ordering import gamma_free_column_order
 
 
@@ -20,33 +23,110 @@ class GammaFree(ContextMatrix):
         """
 
         gamma_free = cls.from_context_matrix(context_matrix)
-        new_matrix = list(list(line) for line in gamma_free.matrix)
-        approximate_gamma_free(new_matrix)
-        gamma_free._matrix = tuple(tuple(line) for line in new_matrix)
+        storage = gamma_free.storage
+        if not hasattr(gamma_free.matrix, "ones"):
+            new_matrix = list(list(line) for line in gamma_free.matrix)
+            approximate_gamma_free(new_matrix)
+            gamma_free._matrix = STORAGES[storage](new_matrix)
+            return gamma_free
+
+        matrix_lines_ones = lines_ones(gamma_free.matrix)
+        was_gamma_free, added = gamma_free_lines_top_down(matrix_lines_ones, True)
+        if not was_gamma_free:
+            for i, j in added:
+                matrix_lines_ones[i].append(j)
+            gamma_free._matrix = STORAGES[storage](matrix_from_ones(matrix_lines_ones, len(gamma_free.attributes),
+                                                                    storage))
 
         return gamma_free
 
+    @classmethod
+    def from_approximation_delta(cls, context_matrix, top_down=True):
+        """Gamma Free approximation of a context matrix, as a delta.
+
+        *context_matrix* is neither copied nor modified: the returned Gamma-free context matrix has an "overlay"
+        storage (see :class:`tbs.contextmatrix.OverlayMatrix`) whose lines are computed on demand from the matrix of
+        *context_matrix* and the delta.
+
+        Args:
+            context_matrix(ContextMatrix): a possibly non Gamma-free context matrix.
+            top_down(bool): approximation by adding 1 (see :func:`gamma_free_matrix_top_down`) if True, by removing
+                1 (see :func:`gamma_free_matrix_bottom_up`) otherwise.
+
+        Returns: (Gamma-free context matrix, delta). The delta is the list of the (line, column) cells flipped from
+            0 to 1 (*top_down*) or from 1 to 0. Its length is the approximation error.
+        """
+
+        delta = approximation_delta(context_matrix.matrix, top_down)
+        gamma_free = cls(OverlayMatrix(context_matrix.matrix, delta, top_down and 1 or 0),
+                         context_matrix.elements, context_matrix.attributes, storage="overlay")
+
+        return gamma_free, delta
+
     def is_gamma_free(self):
         """ Check whether the current order is Gamma free or not.
         """
 
         return is_gamma_free_matrix(self.matrix)
 
-    def reorder_gamma_free_from_strongly_chordal_element_order(self):
+    def reorder_gamma_free_from_strongly_chordal_element_order(self, engine="graph"):
         """ Gamma free column ordering.
 
             One assume that it is possible, thas is that the lines form a strongly chordal order.
 
-
+        :param engine: "graph" or "signatures" (faster, for large matrices). See
+            :func:`tbs.gamma_free._gamma_free_column_ordering.gamma_free_column_order`.
         """
 
-        column_order = gamma_free_column_order(self)
+        column_order = gamma_free_column_order(self, engine)
         self.reorder_columns(column_order)
         return self
 
 
 def is_gamma_free_matrix(matrix):
-    return gamma_free_matrix_top_down(matrix)
+    """True if the matrix is Gamma-free (see :func:`first_gamma`)."""
+
+    return first_gamma(matrix) is None
+
+
+class _LineOnes(dict):
+    """Line given by its 1: missing columns are 0."""
+
+    def __missing__(self, key):
+        return 0
+
+
+def first_gamma(matrix):
+    """A Gamma of the matrix, if any.
+
+    A Gamma is a couple of lines i < i_next and a couple of columns j < j_next such that (i, j), (i, j_next) and
+    (i_next, j) are 1 and (i_next, j_next) is 0. The matrix has a Gamma iff there is one with j_next the next 1 of
+    line i after j and i_next the next 1 of column j below i.
+
+    Lines are swept from bottom to top, keeping for each column its last 1 seen (the next 1 below the current line).
+    Thus each 1 is checked in O(1) and the complexity is O(L) where L is the number of 1, plus the time to list the
+    1 of each line (O(n * m) for a list of lists).
+
+    :param matrix: 0/1 matrix
+    :return: None if the matrix is Gamma-free, a (i, j, i_next, j_next) Gamma otherwise.
+    """
+
+    matrix_lines_ones = lines_ones(matrix)
+    lines = matrix
+    if hasattr(matrix, "ones"):
+        lines = [_LineOnes.fromkeys(line, 1) for line in matrix_lines_ones]
+
+    below = dict()
+    for i in reversed(range(len(matrix_lines_ones))):
+        line = matrix_lines_ones[i]
+        for j, j_next in zip(line, line[1:]):
+            i_next = below.get(j)
+            if i_next is not None and not lines[i_next][j_next]:
+                return i, j, i_next, j_next
+        for j in line:
+            below[j] = i
+
+    return None
 
 
 def approximate_gamma_free(matrix):
@@ -60,13 +140,50 @@ def approximate_gamma_free(matrix):
     gamma_free_matrix_top_down(matrix, True)
 
 
+def approximation_delta(matrix, top_down=True):
+    """Cells to flip to approximate *matrix* into a Gamma-free matrix. The matrix is not modified.
+
+    :param matrix: 0/1 matrix
+    :param top_down: if True, cells set to 1 by :func:`gamma_free_lines_top_down`, cells set to 0 by
+        :func:`gamma_free_lines_bottom_up` otherwise.
+    :return: list of (line, column) cells.
+    """
+
+    engine = top_down and gamma_free_lines_top_down or gamma_free_lines_bottom_up
+    return engine(lines_ones(matrix), True)[1]
+
+
 def gamma_free_matrix_top_down(matrix, transform_to_gamma_free=False):
     """ adds 1
 
-    :param matrix:
-    :param transform_to_gamma_free:
-    :return:
+    See :func:`gamma_free_lines_top_down`. The check alone uses :func:`first_gamma`, whose complexity depends on the
+    number of 1 for matrices having a `ones(i)` method (see :class:`tbs.contextmatrix.SparseMatrix`). The
+    transformation scans the list of lists cell by cell, which is faster as soon as the approximation is dense. Use
+    :func:`approximation_delta` to approximate a read-only storage.
+
+    :param matrix: 0/1 matrix. Must be a modifiable list of lists if *transform_to_gamma_free* is True.
+    :param transform_to_gamma_free: if True, the added 1 are set in *matrix*.
+    :raises ValueError: if *transform_to_gamma_free* is True and *matrix* is a read-only storage (see
+        :class:`tbs.contextmatrix.ContextMatrix`).
+    :return: True if the matrix was Gamma-free.
     """
+
+    if not transform_to_gamma_free:
+        return first_gamma(matrix) is None
+
+    _check_modifiable(matrix)
+    return _scan_top_down(matrix)
+
+
+def _check_modifiable(matrix):
+    if hasattr(matrix, "storage"):
+        raise ValueError("cannot transform a read-only " + repr(matrix.storage) + " matrix. Needs a list of lists, " +
+                         "use approximation_delta otherwise")
+
+
+def _scan_top_down(matrix):
+    """Top-down approximation of a list of lists, looking for the next 1 below and on the right cell by cell."""
+
     was_gamma_free = True
     for i in range(len(matrix)):
         for j in range(len(matrix[i])):
@@ -85,10 +202,7 @@ def gamma_free_matrix_top_down(matrix, transform_to_gamma_free=False):
 
                 if matrix[i_next][j_next] == 0:
                     was_gamma_free = False
-                    if transform_to_gamma_free:
-                        matrix[i_next][j_next] = 1
-                    else:
-                        return was_gamma_free
+                    matrix[i_next][j_next] = 1
 
     return was_gamma_free
 
@@ -96,45 +210,107 @@ def gamma_free_matrix_top_down(matrix, transform_to_gamma_free=False):
 def gamma_free_matrix_bottom_up(matrix, transform_to_gamma_free=False):
     """ adds 0
 
-    :param matrix:
-    :param transform_to_gamma_free:
-    :return:
+    See :func:`gamma_free_lines_bottom_up`.
+
+    :param matrix: 0/1 matrix. Must be a modifiable list of lists if *transform_to_gamma_free* is True.
+    :param transform_to_gamma_free: if True, the removed 1 are set to 0 in *matrix*.
+    :raises ValueError: if *transform_to_gamma_free* is True and *matrix* is a read-only storage.
+    :return: True if the matrix was Gamma-free.
     """
+
+    if transform_to_gamma_free:
+        _check_modifiable(matrix)
+
+    was_gamma_free, removed = gamma_free_lines_bottom_up(lines_ones(matrix), transform_to_gamma_free)
+    for i, j in removed:
+        matrix[i][j] = 0
+
+    return was_gamma_free
+
+
+def gamma_free_lines_top_down(matrix_lines_ones, transform_to_gamma_free=False):
+    """Gamma-free approximation by adding 1, lines being read from top to bottom.
+
+    For each 1 at (i, j) (line by line, from left to right), let i_next be the line of the next 1 below it and
+    j_next the column of the next 1 on its right. If cell (i_next, j_next) is 0 there is a Gamma and it is set to 1.
+
+    Lines are given by the column indices of their 1. The next 1 below of each column is the top of a heap of lines,
+    thus the complexity is O((L + A) log n) where L is the number of 1 and A the number of added 1.
+
+    :param matrix_lines_ones: for each line, the column indices of its 1.
+    :param transform_to_gamma_free: if False, stops at the first Gamma found.
+    :return: (was Gamma-free, list of the (line, column) cells set to 1).
+    """
+
+    lines = [set(line) for line in matrix_lines_ones]
+    columns = dict()
+    for i, line in enumerate(matrix_lines_ones):
+        for j in line:
+            columns.setdefault(j, []).append(i)
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+
     was_gamma_free = True
-    for i in range(len(matrix) - 1, -1, -1):
-        j = 0
-        while j < len(matrix[i]):
-            if matrix[i][j] == 0:
-                j += 1
+    added = []
+    for i in range(len(lines)):
+        line = sorted(lines[i])
+        for j, j_next in zip(line, line[1:]):
+            below = columns[j]
+            while below and below[0] <= i:
+                heappop(below)
+            if not below:
                 continue
 
-            i_next = i + 1
-            while i_next < len(matrix) and matrix[i_next][j] == 0:
-                i_next += 1
+            line_next = lines[below[0]]
+            if j_next not in line_next:
+                was_gamma_free = False
+                if not transform_to_gamma_free:
+                    return was_gamma_free, added
+                line_next.add(j_next)
+                heappush(columns[j_next], below[0])
+                added.append((below[0], j_next))
 
-            if i_next == len(matrix):
-                j += 1
-                continue
+    return was_gamma_free, added
 
-            j_next = j + 1
-            while j_next < len(matrix[i]):
-                while j_next < len(matrix[i]) and matrix[i][j_next] == 0:
-                    j_next += 1
 
-                if j_next == len(matrix[i]):
-                    j_next = j + 1
-                    break
+def gamma_free_lines_bottom_up(matrix_lines_ones, transform_to_gamma_free=False):
+    """Gamma-free approximation by removing 1, lines being read from bottom to top.
 
-                if matrix[i_next][j_next] == 0:
-                    was_gamma_free = False
-                    if transform_to_gamma_free:
-                        matrix[i][j_next] = 0
-                    else:
-                        return was_gamma_free
-                else:
-                    break
-
-            j = j_next
-    return was_gamma_free
+    For each 1 at (i, j) (from left to right) having a 1 below it, at line i_next, the following 1 of line i at
+    columns j_next such that (i_next, j_next) is 0 are removed, until a 1 at (i_next, j_next) is found. The process
+    continues with this 1.
+
+    Lines below line i are not modified anymore, thus the next 1 below of each column is kept in a table and the
+    complexity is O(L log m) where L is the number of 1 (lines are sorted).
+
+    :param matrix_lines_ones: for each line, the column indices of its 1.
+    :param transform_to_gamma_free: if False, stops at the first Gamma found.
+    :return: (was Gamma-free, list of the (line, column) cells set to 0).
+    """
+
+    lines = [set(line) for line in matrix_lines_ones]
+    below = dict()
+
+    was_gamma_free = True
+    removed = []
+    for i in reversed(range(len(lines))):
+        line = sorted(lines[i])
+        index = 0
+        while index < len(line):
+            i_next = below.get(line[index])
+            index += 1
+            if i_next is None:
+                continue
+
+            while index < len(line) and line[index] not in lines[i_next]:
+                was_gamma_free = False
+                if not transform_to_gamma_free:
+                    return was_gamma_free, removed
+                lines[i].remove(line[index])
+                removed.append((i, line[index]))
+                index += 1
 
+        for j in lines[i]:
+            below[j] = i
 
+    return was_gamma_free, removed
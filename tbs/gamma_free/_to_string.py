@@ -3,7 +3,7 @@ import math
 from ._box_lattice import box_lattice
 
 
-def to_string(doubly_lexically_ordered_gamma_free):
+def to_string(doubly_lexically_ordered_gamma_free, lines=None, columns=None):
     """string representation with a doubly lexically ordered gamma free context matrix
 
     The context matrix must be gamma free (otherwise `box_lattice(gamma_free.gamma_free.reorder_doubly_lexical())`).
@@ -11,268 +11,238 @@ def to_string(doubly_lexically_ordered_gamma_free):
 
     Args:
         doubly_lexically_ordered_gamma_free(GammaFree): doubly lexically ordered gama free context matrix.
+        lines(tuple): (start, stop) range of the lines to render, the bottom line being line number of elements.
+            All if None.
+        columns(tuple): (start, stop) range of the columns to render, the top column being column number of
+            attributes. All if None.
 
     Returns(str): lattice matrixical representation
     """
 
-    lattice = box_lattice(doubly_lexically_ordered_gamma_free)
-    boxes = list(lattice)
+    return "\n".join(_box_rows_renderer(doubly_lexically_ordered_gamma_free).rows(lines, columns))
 
-    attributes_labels = [str(x) for x in doubly_lexically_ordered_gamma_free.attributes] + ["⊤"]
-    elements_labels = [str(x) for x in doubly_lexically_ordered_gamma_free.elements] + ["⊥"]
 
-    box_label = {value: attributes_labels[value[0][1]] for value in boxes}
-    box_label[lattice.bottom] = elements_labels[-1]
-    box_label[lattice.top] = attributes_labels[-1]
+def write_string(doubly_lexically_ordered_gamma_free, f, lines=None, columns=None):
+    """Write the string representation (see :func:`to_string`) line by line.
 
-    return BoxesToString(boxes,
-                         elements_labels, attributes_labels,
-                         box_label,
-                         lattice).run()
+    Only two text rows are built at the same time.
 
+    Args:
+        doubly_lexically_ordered_gamma_free(GammaFree): doubly lexically ordered gama free context matrix.
+        f: file object opened in text mode. Each row ends with a new line.
+        lines(tuple): (start, stop) range of the lines to render. All if None.
+        columns(tuple): (start, stop) range of the columns to render. All if None.
+    """
 
-class BoxesToString(object):
-    def __init__(self, boxes, line_labels, column_labels, boxes_labels, lattice=None):
-
-        self.lattice = lattice
+    for row in _box_rows_renderer(doubly_lexically_ordered_gamma_free).rows(lines, columns):
+        f.write(row)
+        f.write("\n")
 
-        self.boxes = boxes
-        self.line_labels = line_labels  # [label_line_0, ..., label_line_n-1]
-        self.column_labels = column_labels  # [column_line_0, ..., column_line_n-1]
-        self.boxes_labels = boxes_labels  # {box: box_label, ...}
 
-        self.column_length = self.compute_length()
+def _box_rows_renderer(doubly_lexically_ordered_gamma_free):
+    boxes = box_lattice(doubly_lexically_ordered_gamma_free, compact=True)
 
-        self.ascii_matrix = AsciiMatrix(self.column_length, self.line_labels, self.column_labels)
+    attributes_labels = [str(x) for x in doubly_lexically_ordered_gamma_free.attributes] + ["⊤"]
+    elements_labels = [str(x) for x in doubly_lexically_ordered_gamma_free.elements] + ["⊥"]
 
-    def draw_right_edge(self, max_x, min_y, max_y, neighbor_min_x):
+    box_label = [attributes_labels[boxes.column_begin[k]] for k in boxes]
+    box_label[boxes.bottom] = elements_labels[-1]
+    box_label[boxes.top] = attributes_labels[-1]
 
-        line_edge = (min_y + max_y) // 2
-        if (max_y - min_y + 1) % 2 == 1:
-            line = self.ascii_matrix.matrix[line_edge + 1]
-            border = self.ascii_matrix.border_right[line_edge + 1]
-        else:
-            line = self.ascii_matrix.border_bottom[line_edge + 1]
-            border = self.ascii_matrix.border_corner[line_edge + 1]
-
-        for j in range(max_x + 1, neighbor_min_x - 1):
-            line[j + 1] = AsciiCharacter.edge_right(line[j + 1])
-            border[j + 1] = AsciiCharacter.edge_right(border[j + 1])
-        line[neighbor_min_x - 1 + 1] = AsciiCharacter.edge_right(line[neighbor_min_x - 1 + 1])
-
-    def draw_up_edge(self, min_y, neighbor_max_x, neighbor_max_y, neighbor_min_x):
-        if (neighbor_max_x - neighbor_min_x + 1) % 2 == 1:
-            line = self.ascii_matrix.matrix
-            border = self.ascii_matrix.border_bottom
-        else:
-            line = self.ascii_matrix.border_right
-            border = self.ascii_matrix.border_corner
+    return BoxRowsRenderer(boxes, elements_labels, attributes_labels, box_label)
 
-        column_label = (neighbor_max_x + neighbor_min_x) // 2
-        for i in range(neighbor_max_y + 1, min_y):
-            line[i + 1][column_label + 1] = AsciiCharacter.edge_up(line[i + 1][column_label + 1])
-        for i in range(neighbor_max_y + 1, min_y - 1):
-            border[i + 1][column_label + 1] = AsciiCharacter.edge_up(border[i + 1][column_label + 1])
 
-    def run(self):
-        for box in self.boxes:
+class AsciiCharacter:
+    LABEL_BORDER_RIGHT = "|"
+    LABEL_BORDER_BOTTOM = "-"
+    BORDER = "|"
+    CORNER = "+"
+    BOTTOM = "-"
+    EMPTY = " "
+    EMPTY_CLUSTER = "."
+    EDGE_UP = "|"
+    EDGE_RIGHT = "-"
+    EDGE_INTERSECTION = "*"
 
-            min_y, min_x = box[0]
-            max_y, max_x = box[1]
+    @classmethod
+    def replace(cls, char_to_replace, by_intersection, default_char):
+        return char_to_replace == by_intersection and AsciiCharacter.EDGE_INTERSECTION or default_char
 
-            self.draw_box(min_x, max_x, min_y, max_y, str(self.boxes_labels[box]))
 
-            if self.lattice:
-                for neighbor in self.lattice.above(box):
-                    if neighbor not in self.boxes:
-                        continue
+class BoxRowsRenderer(object):
+    """Text rows of the boxes of a doubly lexically ordered gamma free matrix, rendered one at a time.
 
-                    neighbor_min_y, neighbor_min_x = neighbor[0]
-                    neighbor_max_y, neighbor_max_x = neighbor[1]
+    Each box is a framed rectangle, labelled in its middle, with edges ("-" to the right, "|" up, "*" where they
+    cross) to the boxes covering it. Rows are drawn into a preallocated list of characters per text row. A border
+    never overwrites the corner of another box (see :meth:`_stroke`). A matrix line is drawn on two text rows (cells
+    then bottom borders) and a column on its cell width plus one border character. All the drawings of a box (fill,
+    borders, label and edges to the boxes above it) are on a single range of text rows, thus a row only depends on
+    the boxes whose range contains it.
+    """
 
-                    if neighbor_min_x > max_x + 1:
-                        self.draw_right_edge(max_x, min_y, max_y, neighbor_min_x)
-                    elif neighbor_max_y + 1 < min_y:
-                        self.draw_up_edge(min_y, neighbor_max_x, neighbor_max_y, neighbor_min_x)
+    def __init__(self, boxes, line_labels, column_labels, boxes_labels):
+        """
 
-        return self.ascii_matrix.final_matrix()
+        :param boxes: :class:`tbs.gamma_free.BoxLattice`
+        :param line_labels: labels of the lines (the last one is the bottom).
+        :param column_labels: labels of the columns (the last one is the top).
+        :param boxes_labels: label of each box.
+        """
 
-    def compute_length(self):
+        self.boxes = boxes
+        self.line_labels = line_labels
+        self.column_labels = column_labels
+        self.boxes_labels = boxes_labels
+
+        self.column_length = self._compute_length()
+        self.column_position = [0]
+        for length in self.column_length:
+            self.column_position.append(self.column_position[-1] + length + 1)
+        self.width = self.column_position[-1]
+        self.number_rows = 2 * (len(line_labels) + 1)
+
+        self.row_begin = []
+        self.right_edges = []
+        self.up_edges = []
+        for k in range(len(boxes)):
+            row_begin = 2 * boxes.line_begin[k] + 1
+            right_edges = []
+            up_edges = []
+            for neighbor in boxes.above(k):
+                if boxes.column_begin[neighbor] > boxes.column_end[k] + 1:
+                    right_edges.append(neighbor)
+                elif boxes.line_end[neighbor] + 1 < boxes.line_begin[k]:
+                    up_edges.append(neighbor)
+                    row_begin = min(row_begin, 2 * boxes.line_end[neighbor] + 4)
+            self.row_begin.append(row_begin)
+            self.right_edges.append(right_edges)
+            self.up_edges.append(up_edges)
+
+    def _compute_length(self):
+        boxes = self.boxes
         column_length = [len(str(x)) for x in self.column_labels]
 
-        for box, box_label in self.boxes_labels.items():
-            label_length = len(str(box_label))
-            number_separation = box[1][1] - box[0][1]
+        for k in range(len(boxes)):
+            label_length = len(str(self.boxes_labels[k]))
+            number_separation = boxes.column_end[k] - boxes.column_begin[k]
 
-            min_column_length = math.ceil(
-                (label_length - number_separation) / (number_separation + 1))
+            min_column_length = math.ceil((label_length - number_separation) / (number_separation + 1))
 
-            for j in range(box[0][1], box[1][1] + 1):
+            for j in range(boxes.column_begin[k], boxes.column_end[k] + 1):
                 column_length[j] = max(column_length[j], min_column_length)
 
         column_length.insert(0, max([len(str(element)) for element in self.line_labels]))
 
         return column_length
 
-    def draw_box(self, min_x, max_x, min_y, max_y, label):
-        self.inner_box(max_x, max_y, min_x, min_y)
-        self.border_box(max_x, max_y, min_x, min_y)
-        self.label_box(label, max_x, max_y, min_x, min_y)
-
-    def inner_box(self, max_x, max_y, min_x, min_y):
-        AsciiCharacter.fill_empty_cluster(self.ascii_matrix.border_corner, min_x, max_x - 1, min_y, max_y - 1)
-        AsciiCharacter.fill_empty_cluster(self.ascii_matrix.border_bottom, min_x, max_x - 1, min_y, max_y - 1)
-        AsciiCharacter.fill_empty_cluster(self.ascii_matrix.border_right, min_x, max_x - 1, min_y, max_y)
-        AsciiCharacter.fill_empty_cluster(self.ascii_matrix.matrix, min_x, max_x, min_y, max_y)
-
-    def border_box(self, max_x, max_y, min_x, min_y):
-        # noinspection PyArgumentList
-        for i in range(min_y, max_y + 1):
-            self.ascii_matrix.border_right[i + 1][max_x + 1] = AsciiCharacter.BORDER
-            self.ascii_matrix.border_right[i + 1][min_x + 1 - 1] = AsciiCharacter.BORDER
-
-        for i in range(min_y, max_y):
-            self.ascii_matrix.border_corner[i + 1][max_x + 1] = AsciiCharacter.BORDER
-            self.ascii_matrix.border_corner[i + 1][min_x + 1 - 1] = AsciiCharacter.BORDER
-
-        for j in range(min_x, max_x + 1):
-            self.ascii_matrix.border_bottom[min_y - 1 + 1][j + 1] = \
-                AsciiCharacter.BOTTOM * len(self.ascii_matrix.border_bottom[min_y - 1 + 1][j + 1])
-            self.ascii_matrix.border_bottom[max_y + 1][j + 1] = \
-                AsciiCharacter.BOTTOM * len(self.ascii_matrix.border_bottom[max_y + 1][j + 1])
-
-        for j in range(min_x, max_x):
-            self.ascii_matrix.border_corner[min_y - 1 + 1][j + 1] = AsciiCharacter.BOTTOM
-            self.ascii_matrix.border_corner[max_y + 1][j + 1] = AsciiCharacter.BOTTOM
-
-        self.ascii_matrix.border_corner[min_y - 1 + 1][min_x - 1 + 1] = AsciiCharacter.CORNER
-        self.ascii_matrix.border_corner[max_y + 1][min_x - 1 + 1] = AsciiCharacter.CORNER
-        self.ascii_matrix.border_corner[min_y - 1 + 1][max_x + 1] = AsciiCharacter.CORNER
-        self.ascii_matrix.border_corner[max_y + 1][max_x + 1] = AsciiCharacter.CORNER
-
-    def label_box(self, label, max_x, max_y, min_x, min_y):
-        line_label = (min_y + max_y) // 2
-        if (max_y - min_y + 1) % 2 == 1:
-            line = self.ascii_matrix.matrix[line_label + 1]
-            border = self.ascii_matrix.border_right[line_label + 1]
-        else:
-            line = self.ascii_matrix.border_bottom[line_label + 1]
-            border = self.ascii_matrix.border_corner[line_label + 1]
+    def _cell(self, column):
+        """First position and length of the cell of column *column* (0 is the label column)."""
 
-        vertex_label = label.center(max_x - min_x + sum(self.column_length[min_x + 1:max_x + 2]), AsciiCharacter.EMPTY)
-        offset = 0
+        return self.column_position[column], self.column_length[column]
 
-        for j in range(min_x, max_x):
-            line[j + 1] = vertex_label[offset:offset + self.column_length[j + 1]]
-            offset += self.column_length[j + 1]
-            border[j + 1] = vertex_label[offset]
-            offset += 1
-        line[max_x + 1] = vertex_label[offset:]
+    def _initial_row(self, row):
+        line, is_border = divmod(row, 2)
+        if line == 0 and is_border:
+            return list(AsciiCharacter.CORNER.join(AsciiCharacter.LABEL_BORDER_BOTTOM * length
+                                                   for length in self.column_length) + AsciiCharacter.CORNER)
+        if is_border:
+            return list(AsciiCharacter.EMPTY * self.column_length[0] + AsciiCharacter.CORNER +
+                        AsciiCharacter.EMPTY * (self.width - self.column_length[0] - 1))
 
-
-class AsciiCharacter:
-    LABEL_BORDER_RIGHT = "|"
-    LABEL_BORDER_BOTTOM = "-"
-    BORDER = "|"
-    CORNER = "+"
-    BOTTOM = "-"
-    EMPTY = " "
-    EMPTY_CLUSTER = "."
-    EDGE_UP = "|"
-    EDGE_RIGHT = "-"
-    EDGE_INTERSECTION = "*"
-
-    @classmethod
-    def edge_up(cls, str_to_replace):
-        middle = len(str_to_replace) // 2
-        return AsciiCharacter.replace(str_to_replace[middle], AsciiCharacter.EDGE_RIGHT, AsciiCharacter.EDGE_UP).join(
-            [str_to_replace[:middle], str_to_replace[middle + 1:]])
-
-    @classmethod
-    def edge_right(cls, str_to_replace):
-        edge = ""
-        for char in str_to_replace:
-            edge += AsciiCharacter.replace(char, AsciiCharacter.EDGE_UP, AsciiCharacter.EDGE_RIGHT)
-        return edge
-
-    @classmethod
-    def replace(cls, char_to_replace, by_intersection, default_char):
-        return char_to_replace == by_intersection and AsciiCharacter.EDGE_INTERSECTION or default_char
-
-    @classmethod
-    def init_matrix(cls, line_labels, column_labels, column_length):
-        ascii_matrix = []
-        for j in range(len(line_labels) + 1):
-            ascii_matrix.append(
-                [AsciiCharacter.EMPTY_CLUSTER.center(length, AsciiCharacter.EMPTY) for length in column_length])
-
-        ascii_matrix[0][0] = AsciiCharacter.EMPTY * len(ascii_matrix[0][0])
-        for i in range(len(line_labels)):
-            ascii_matrix[i + 1][0] = str(line_labels[i]).ljust(column_length[0], AsciiCharacter.EMPTY)
-        for i in range(len(column_labels)):
-            ascii_matrix[0][i + 1] = str(column_labels[i]).center(column_length[i + 1], AsciiCharacter.EMPTY)
-
-        return ascii_matrix
-
-    @classmethod
-    def fill_empty_cluster(cls, matrix, min_x, max_x, min_y, max_y):
-        """ + 1 on line and column because inner matrix."""
-        # noinspection PyArgumentList
-        for j in range(min_x, max_x + 1):
-            # noinspection PyArgumentList
-            for i in range(min_y, max_y + 1):
-                matrix[i + 1][j + 1] = AsciiCharacter.EMPTY * len(matrix[i + 1][j + 1])
-
-
-class AsciiMatrix(object):
-    def __init__(self, column_length, line_order, column_order):
-        self.column_length = column_length
-        self.matrix = AsciiCharacter.init_matrix(line_order, column_order, column_length)
-        self.border_right = self.init_right()
-        self.border_bottom = self.init_matrix_bottom()
-        self.border_corner = self.init_matrix_corner()
-
-    def init_right(self):
-        border_right = []
-        for i in range(len(self.matrix)):
-            border_right.append([AsciiCharacter.EMPTY] * len(self.matrix[0]))
-
-        for line in border_right:
-            line[0] = AsciiCharacter.LABEL_BORDER_RIGHT
-
-        return border_right
-
-    def init_matrix_bottom(self):
-        border_bottom = []
-        for j in range(len(self.matrix)):
-            border_bottom.append([AsciiCharacter.EMPTY * length for length in self.column_length])
-
-        for j in range(len(border_bottom[0])):
-            border_bottom[0][j] = AsciiCharacter.LABEL_BORDER_BOTTOM * self.column_length[j]
-
-        return border_bottom
-
-    def init_matrix_corner(self):
-        matrix_corner = []
-        for i in range(len(self.matrix)):
-            matrix_corner.append([AsciiCharacter.EMPTY] * len(self.matrix[0]))
-        matrix_corner[0] = [AsciiCharacter.CORNER] * len(self.matrix[0])
-
-        for line in matrix_corner:
-            line[0] = AsciiCharacter.CORNER
-        return matrix_corner
-
-    def final_matrix(self):
-        final_matrix = []
-        for i in range(len(self.matrix)):
-            line = []
-            for j in range(len(self.matrix[i])):
-                line.append(self.matrix[i][j])
-                line.append(self.border_right[i][j])
-            final_matrix.append(line)
-            line = []
-            for j in range(len(self.matrix[i])):
-                line.append(self.border_bottom[i][j])
-                line.append(self.border_corner[i][j])
-            final_matrix.append(line)
-        return "\n".join(["".join(line) for line in final_matrix])
+        if line == 0:
+            first = AsciiCharacter.EMPTY * self.column_length[0]
+            cells = [str(label).center(length, AsciiCharacter.EMPTY)
+                     for label, length in zip(self.column_labels, self.column_length[1:])]
+        else:
+            first = str(self.line_labels[line - 1]).ljust(self.column_length[0], AsciiCharacter.EMPTY)
+            cells = [AsciiCharacter.EMPTY_CLUSTER.center(length, AsciiCharacter.EMPTY)
+                     for length in self.column_length[1:]]
+
+        return list(first + AsciiCharacter.LABEL_BORDER_RIGHT + AsciiCharacter.EMPTY.join(cells) +
+                    AsciiCharacter.EMPTY)
+
+    def _stroke(self, row, buffer, x, character):
+        """Write the border *character* at position *x* of text row *row*, unless it is the corner of another box.
+
+        Corners of the label row and of the label column are not box corners. Keeping the corners of the boxes makes
+        the drawing independent of the order of the boxes.
+        """
+
+        if row == 1 or x < self.column_position[1] or buffer[x] != AsciiCharacter.CORNER:
+            buffer[x] = character
+
+    def _draw(self, k, row, buffer):
+        """Draw the part of box *k* on text row *row* into *buffer*."""
+
+        boxes = self.boxes
+        min_x, max_x = boxes.column_begin[k], boxes.column_end[k]
+        min_y, max_y = boxes.line_begin[k], boxes.line_end[k]
+        begin = self.column_position[min_x + 1]
+        last_begin, last_length = self._cell(max_x + 1)
+        end = last_begin + last_length
+
+        if 2 * min_y + 1 <= row <= 2 * max_y + 3:
+            if row == 2 * min_y + 1 or row == 2 * max_y + 3:
+                for x in range(begin, end):
+                    self._stroke(row, buffer, x, AsciiCharacter.BOTTOM)
+                buffer[begin - 1] = buffer[end] = AsciiCharacter.CORNER
+            elif row % 2 == 0:
+                buffer[begin:end] = AsciiCharacter.EMPTY * (end - begin)
+                buffer[begin - 1] = buffer[end] = AsciiCharacter.BORDER
+            else:
+                buffer[begin:last_begin] = AsciiCharacter.EMPTY * (last_begin - begin)
+                self._stroke(row, buffer, begin - 1, AsciiCharacter.BORDER)
+                self._stroke(row, buffer, end, AsciiCharacter.BORDER)
+
+            if row == 2 * ((min_y + max_y) // 2 + 1) + (max_y - min_y) % 2:
+                label = str(self.boxes_labels[k]).center(end - begin, AsciiCharacter.EMPTY)[:end - begin]
+                buffer[begin:begin + len(label)] = label
+
+                for neighbor in self.right_edges[k]:
+                    neighbor_begin, neighbor_length = self._cell(boxes.column_begin[neighbor])
+                    for x in range(self.column_position[max_x + 2], neighbor_begin + neighbor_length):
+                        buffer[x] = AsciiCharacter.replace(buffer[x], AsciiCharacter.EDGE_UP,
+                                                           AsciiCharacter.EDGE_RIGHT)
+
+        for neighbor in self.up_edges[k]:
+            if 2 * boxes.line_end[neighbor] + 4 <= row <= 2 * min_y:
+                neighbor_min_x, neighbor_max_x = boxes.column_begin[neighbor], boxes.column_end[neighbor]
+                position, length = self._cell((neighbor_max_x + neighbor_min_x) // 2 + 1)
+                if (neighbor_max_x - neighbor_min_x + 1) % 2 == 1:
+                    x = position + length // 2
+                else:
+                    x = position + length
+                buffer[x] = AsciiCharacter.replace(buffer[x], AsciiCharacter.EDGE_RIGHT, AsciiCharacter.EDGE_UP)
+
+    def rows(self, lines=None, columns=None):
+        """Text rows, from top to bottom.
+
+        :param lines: (start, stop) range of the lines to render (the last line is the bottom). All if None.
+        :param columns: (start, stop) range of the columns to render (the last column is the top). All if None.
+            The labels are always rendered.
+        :return: generator of strings.
+        """
+
+        line_start, line_stop = lines or (0, len(self.line_labels))
+        column_start, column_stop = columns or (0, len(self.column_labels))
+        line_stop = min(line_stop, len(self.line_labels))
+        column_stop = max(min(column_stop, len(self.column_labels)), column_start)
+        label_end = self.column_position[1]
+        window_begin, window_end = self.column_position[column_start + 1], self.column_position[column_stop + 1]
+
+        selected_rows = [0, 1] + [row for line in range(line_start, line_stop) for row in (2 * line + 2, 2 * line + 3)]
+
+        order = sorted(range(len(self.boxes)), key=self.row_begin.__getitem__)
+        position = 0
+        active = set()
+        for row in selected_rows:
+            while position < len(order) and self.row_begin[order[position]] <= row:
+                active.add(order[position])
+                position += 1
+            active = {k for k in active if 2 * self.boxes.line_end[k] + 3 >= row}
+
+            buffer = self._initial_row(row)
+            for k in sorted(active):
+                self._draw(k, row, buffer)
+
+            yield "".join(buffer[:label_end]) + "".join(buffer[window_begin:window_end])
@@ -1,5 +1,79 @@
+from array import array
+
+
 def concepts_from_dlo_gamma_free_matrix(matrix):
-    return line_concept_from_dlo_gamma_free_matrix(matrix).intersection(column_concept_from_dlo_gamma_free_matrix(matrix))
+    return set(iter_concepts_from_dlo_gamma_free_matrix(matrix))
+
+
+def iter_concepts_from_dlo_gamma_free_matrix(matrix):
+    """Concepts of a doubly lexically ordered Gamma-free matrix, lazily.
+
+    Cell (i, j) is a concept iff it is both a line concept (see :func:`line_concept_from_dlo_gamma_free_matrix`) and
+    a column concept (see :func:`column_concept_from_dlo_gamma_free_matrix`). Both scans are merged: lines are read
+    from bottom to top and from right to left, keeping the line flag and one flag per column. Only the 1 of the
+    current and previous lines are looked at (using the `ones(i)` method of the matrix if any).
+
+    :param matrix: doubly lexically ordered Gamma-free 0/1 matrix
+    :return: generator of (line, column) cells, from the bottom line to the top one and from right to left.
+    """
+
+    for i, columns in _lines_concepts(matrix):
+        for j in columns:
+            yield i, j
+
+
+def _lines_concepts(matrix):
+    """Columns of the concepts of each line, from bottom to top (see :func:`iter_concepts_from_dlo_gamma_free_matrix`).
+    """
+
+    if hasattr(matrix, "ones"):
+        def line_ones(i):
+            return list(matrix.ones(i))
+    else:
+        def line_ones(i):
+            return [j for j, x in enumerate(matrix[i]) if x]
+
+    if not len(matrix):
+        return
+
+    column_is_new = bytearray(len(matrix[0]))
+    ones = line_ones(len(matrix) - 1)
+    for i in range(len(matrix) - 1, -1, -1):
+        ones_above = i and line_ones(i - 1) or []
+        is_one, is_one_above = set(ones), set(ones_above)
+
+        columns = []
+        line_is_new = False
+        for j in reversed(ones):
+            if not i or j not in is_one_above:
+                line_is_new = True
+            if not j or j - 1 not in is_one:
+                column_is_new[j] = 1
+
+            if line_is_new and column_is_new[j]:
+                columns.append(j)
+
+        yield i, columns
+        ones = ones_above
+
+
+def concepts_array_from_dlo_gamma_free_matrix(matrix):
+    """Concepts of a doubly lexically ordered Gamma-free matrix, as a flat array of coordinates.
+
+    Same concepts and order as :func:`iter_concepts_from_dlo_gamma_free_matrix`, without creating a tuple per
+    concept.
+
+    :param matrix: doubly lexically ordered Gamma-free 0/1 matrix
+    :return: array('i') [i_0, j_0, i_1, j_1, ...].
+    """
+
+    coordinates = array("i")
+    for i, columns in _lines_concepts(matrix):
+        for j in columns:
+            coordinates.append(i)
+            coordinates.append(j)
+
+    return coordinates
 
 
 def line_concept_from_dlo_gamma_free_matrix(matrix):
@@ -1,9 +1,9 @@
 from PIL import Image
 import colorsys
 
-from ..dismantlable import DismantlableLattice
+from ._box_lattice import BoxLattice
 
-__all__ = ["create_image_from_dlo_gamma_free_matrix"]
+__all__ = ["create_image_from_dlo_gamma_free_matrix", "create_image_tiles_from_dlo_gamma_free_matrix"]
 
 
 def color_space_colors(number_colors):
@@ -20,22 +20,86 @@ def color_space_grey(number_colors):
     return rgb_tuples
 
 
-def create_image_from_dlo_gamma_free_matrix(matrix, color_space=color_space_colors, pixel_size=1):
+def create_image_from_dlo_gamma_free_matrix(matrix, color_space=color_space_colors, pixel_size=1, boxes=None):
+    """Image of the boxes of a doubly lexically ordered Gamma-free matrix.
 
-    # height = hierarchical_height_from_lattice(from_dlo_gamma_free_matrix.lattice(matrix))
-    height = DismantlableLattice.from_dlo_matrix(matrix).hierarchical_decomposition()
-    height_colors = color_space(max(height.values()) + 1)
+    Each box is a rectangle of pixels colored according to its hierarchical level (see
+    :meth:`tbs.gamma_free.BoxLattice.hierarchical_decomposition`). Rectangles are filled at once with
+    :meth:`PIL.Image.Image.paste`.
 
-    image_matrix = Image.new("RGB", (len(matrix[0]) * pixel_size, len(matrix) * pixel_size), "white")
-    for cluster in {key for key in height if key not in ("TOP", "BOTTOM")}:
-        # for cluster in boxes_i:
-        min_i, min_j = cluster[0]
-        max_i, max_j = cluster[1]
-        color = height_colors[height[cluster]]
-        # color = (0, 0, 0)
-        for i in range(min_i * pixel_size, (max_i + 1) * pixel_size):
-            for j in range(min_j * pixel_size, (max_j + 1) * pixel_size):
-                image_matrix.putpixel((j, i), color)
+    Args:
+        matrix: doubly lexically ordered Gamma-free 0/1 matrix.
+        color_space: function returning a list of the given number of RGB colors.
+        pixel_size(int): side of the square of pixels of a cell.
+        boxes(BoxLattice): boxes of *matrix* (see :func:`tbs.gamma_free.box_lattice`), computed if None.
 
-    return image_matrix
+    Returns(PIL.Image.Image): the image.
+    """
 
+    boxes, colors = _boxes_colors(matrix, color_space, boxes)
+
+    image = Image.new("RGB", (len(matrix[0]) * pixel_size, len(matrix) * pixel_size), "white")
+    _paste_boxes(image, boxes, colors, range(len(boxes)), pixel_size, 0, 0)
+
+    return image
+
+
+def create_image_tiles_from_dlo_gamma_free_matrix(matrix, tile_size=1024, color_space=color_space_colors,
+                                                  pixel_size=1, boxes=None):
+    """Image of the boxes of a doubly lexically ordered Gamma-free matrix, by tiles.
+
+    Same image as :func:`create_image_from_dlo_gamma_free_matrix`, cut into square tiles (smaller on the right and
+    bottom borders) so that the whole image is never in memory. Tiles are generated line by line, from left to
+    right.
+
+    Args:
+        matrix: doubly lexically ordered Gamma-free 0/1 matrix.
+        tile_size(int): side of a tile, in pixels.
+        color_space: function returning a list of the given number of RGB colors.
+        pixel_size(int): side of the square of pixels of a cell.
+        boxes(BoxLattice): boxes of *matrix* (see :func:`tbs.gamma_free.box_lattice`), computed if None.
+
+    Returns: generator of ((x, y), tile) where (x, y) is the position of the top left corner of the tile in the
+        image and tile a :class:`PIL.Image.Image`.
+    """
+
+    boxes, colors = _boxes_colors(matrix, color_space, boxes)
+
+    width, height = len(matrix[0]) * pixel_size, len(matrix) * pixel_size
+
+    bands = [[] for y in range(0, height, tile_size)]
+    for k in range(len(boxes)):
+        top = boxes.line_begin[k] * pixel_size
+        bottom = min((boxes.line_end[k] + 1) * pixel_size, height)
+        for band in range(top // tile_size, (bottom - 1) // tile_size + 1):
+            bands[band].append(k)
+
+    for band, band_boxes in enumerate(bands):
+        y = band * tile_size
+        for x in range(0, width, tile_size):
+            tile = Image.new("RGB", (min(tile_size, width - x), min(tile_size, height - y)), "white")
+            _paste_boxes(tile, boxes, colors, band_boxes, pixel_size, x, y)
+            yield (x, y), tile
+
+
+def _boxes_colors(matrix, color_space, boxes):
+    if boxes is None:
+        boxes = BoxLattice.from_matrix(matrix)
+
+    height = boxes.hierarchical_decomposition()
+    height_colors = color_space(max(height) + 1)
+
+    return boxes, [height_colors[h] for h in height]
+
+
+def _paste_boxes(image, boxes, colors, box_indices, pixel_size, x, y):
+    """Fill the boxes in *box_indices* on *image*, whose top left corner is pixel (x, y). Boxes are clipped."""
+
+    width, height = image.size
+    for k in box_indices:
+        left = max(boxes.column_begin[k] * pixel_size - x, 0)
+        right = min((boxes.column_end[k] + 1) * pixel_size - x, width)
+        top = max(boxes.line_begin[k] * pixel_size - y, 0)
+        bottom = min((boxes.line_end[k] + 1) * pixel_size - y, height)
+        if left < right and top < bottom:
+            image.paste(colors[k], (left, top, right, bottom))
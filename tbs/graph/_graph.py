@@ -90,8 +90,15 @@ class Graph(MixedGraph):
         :return: a graph with vertex set equal to the elements of *dissimilarity* and *xy*
                  is an edge iff *dissimilarity*\ (x, y) <= *threshold*.
         :rtype: :class:`Graph`
+
+        .. note:: only the pairs of value <= *threshold* are read if the index of *dissimilarity* is built (see
+                  :meth:`tbs.diss.Diss.value_index`).
         """
 
+        if getattr(dissimilarity, "value_index", None) and dissimilarity.value_index(False) is not None:
+            for threshold, graph in cls.from_dissimilarity_thresholds(dissimilarity, [threshold]):
+                return graph
+
         elems = list(dissimilarity)
 
         self = cls(elems)
@@ -103,6 +110,43 @@ class Graph(MixedGraph):
 
         return self
 
+    @classmethod
+    def from_dissimilarity_thresholds(cls, dissimilarity, thresholds):
+        """Threshold graphs of *dissimilarity* at increasing heights.
+
+        The pairs are read once, by increasing values, from the index of *dissimilarity* (built if needed, see
+        :meth:`tbs.diss.Diss.value_index`): each graph is the previous one plus the edges of the new pairs.
+
+        :param dissimilarity: to be converted in graphs.
+        :type dissimilarity: :class:`diss.Diss`
+
+        :param thresholds: increasing heights. :const:`None` for the maximal value of *dissimilarity*.
+        :type thresholds: iterable
+
+        :return: generator of couples (threshold, graph), graph being :meth:`from_dissimilarity`\ (*dissimilarity*,
+                 threshold). The same graph is updated and yielded each time: copy it to keep it.
+
+        :raises: :exc:`ValueError` if the thresholds are not increasing.
+        """
+
+        value_index = dissimilarity.value_index()
+        elems = list(dissimilarity)
+
+        self = cls(elems)
+        position = 0
+        for threshold in thresholds:
+            end = value_index.threshold_position(threshold)
+            if end < position:
+                raise ValueError("thresholds must be increasing.")
+
+            for i, j, value in value_index.pairs(position, end):
+                x, y = elems[i], elems[j]
+                self.update([(x, y)])
+                self[x, y] = value
+            position = end
+
+            yield threshold, self
+
     def __repr__(self):
         undirected, directed = self._edges
         return "".join(["Graph(",
@@ -12,6 +12,7 @@ import random
 
 from . import gamma_free
 from .contextmatrix import ContextMatrix
+from .contextmatrix._context_matrix import matrix_from_ones
 from .gamma_free import GammaFree
 
 
@@ -20,7 +21,8 @@ __author__ = 'fbrucker'
 __all__ = ["randomize_edges",
            "random_01_matrix",
            "shuffle_line_and_column_from_context_matrix",
-           "random_gamma_free_01_matrix"]
+           "random_gamma_free_01_matrix",
+           "random_gamma_free_matrix"]
 
 
 def randomize_edges(graph, probability_of_remaining_an_edge=0.5, probability_of_being_an_edge=0.5):
@@ -80,6 +82,53 @@ def random_gamma_free_01_matrix(number_lines, number_column, probability_of_1=.5
     return context_matrix.matrix
 
 
+def random_gamma_free_matrix(number_lines, number_columns, probability_of_extension=.5, seed=None,
+                             storage="sparse"):
+    """Random 0/1-matrix admitting a gamma free order, built directly from a random tree.
+
+    Lines are the vertices of a random rooted tree. Each column is a path going up the tree: it starts at a random
+    vertex and is extended to the parent of its last vertex with probability *probability_of_extension*. The
+    incidence matrix of vertices and upward paths of a rooted tree is totally balanced.
+
+    No dense matrix is built: time and memory are proportional to the number of lines, columns and 1.
+
+    Args:
+        number_lines(int): number of lines (vertices of the tree).
+        number_columns(int): number of columns (paths).
+        probability_of_extension(float): probability of extending a path to the parent of its last vertex.
+        seed: seed of the random generator (see :class:`random.Random`). Same seed, same matrix.
+        storage(str): matrix storage (see :func:`tbs.contextmatrix.ContextMatrix.__init__`). "sparse" for a
+            :class:`tbs.contextmatrix.SparseMatrix`, "bits" for a packed :class:`tbs.contextmatrix.BitMatrix`.
+
+    Returns: the matrix, to be given to :class:`tbs.contextmatrix.ContextMatrix` with the same *storage*.
+    """
+
+    if number_lines <= 0:
+        if number_columns:
+            raise ValueError("columns need lines")
+        return matrix_from_ones([], 0, storage)
+
+    generator = random.Random(seed)
+    randrange = generator.randrange
+    random_number = generator.random
+
+    lines = list(range(number_lines))
+    generator.shuffle(lines)
+    parent = [None] * number_lines
+    for k in range(1, number_lines):
+        parent[lines[k]] = lines[randrange(k)]
+
+    lines_ones = [[] for i in range(number_lines)]
+    for j in range(number_columns):
+        i = randrange(number_lines)
+        lines_ones[i].append(j)
+        while parent[i] is not None and random_number() < probability_of_extension:
+            i = parent[i]
+            lines_ones[i].append(j)
+
+    return matrix_from_ones(lines_ones, number_columns, storage)
+
+
 def shuffle_line_and_column_from_context_matrix(context_matrix):
     """
     line_order[i] = original line of index i
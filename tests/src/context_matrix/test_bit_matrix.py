@@ -0,0 +1,109 @@
+import unittest
+
+from tbs.contextmatrix import ContextMatrix, BitMatrix
+
+
+class TestBitMatrix(unittest.TestCase):
+    def setUp(self):
+        self.matrix = ((1, 0, 0, 1, 0),
+                       (1, 1, 1, 1, 1),
+                       (0, 1, 0, 1, 0),
+                       (0, 0, 1, 0, 1))
+        self.bit_matrix = BitMatrix(self.matrix)
+
+    def test_create(self):
+        self.assertEqual(self.matrix, self.bit_matrix)
+        self.assertEqual(4, len(self.bit_matrix))
+        self.assertEqual(5, len(self.bit_matrix[0]))
+        self.assertEqual(0b01001, self.bit_matrix.line(0))
+        self.assertEqual(1, self.bit_matrix[-1][-1])
+        self.assertEqual(self.matrix, BitMatrix.from_ones([[0, 3], [0, 1, 2, 3, 4], [1, 3], [2, 4]], 5))
+
+    def test_columns(self):
+        self.assertEqual(0b0011, self.bit_matrix.column(0))
+        self.assertEqual(0b0111, self.bit_matrix.column(3))
+        self.assertEqual([1, 3], list(self.bit_matrix.ones(2)))
+
+    def test_intersections(self):
+        self.assertEqual(2, self.bit_matrix.lines_intersection(0, 1))
+        self.assertEqual(0, self.bit_matrix.lines_intersection(2, 3))
+        self.assertEqual(2, self.bit_matrix.columns_intersection(1, 3))
+        self.assertEqual(11, self.bit_matrix.count())
+
+    def test_transpose(self):
+        self.assertEqual(tuple(zip(*self.matrix)), self.bit_matrix.transpose())
+        self.assertEqual(self.bit_matrix, self.bit_matrix.transpose().transpose())
+
+    def test_reorder(self):
+        self.assertEqual((self.matrix[3], self.matrix[0], self.matrix[2], self.matrix[1]),
+                         self.bit_matrix.reorder_lines([3, 0, 2, 1]))
+        self.assertEqual(tuple((line[4], line[3], line[2], line[0], line[1]) for line in self.matrix),
+                         self.bit_matrix.reorder_columns([4, 3, 2, 0, 1]))
+
+    def test_insert(self):
+        self.bit_matrix.column(0)
+        bit_matrix = self.bit_matrix.insert_line(1, (0, 1, 1, 0, 0)).insert_column(2, (1, 0, 1, 1, 0))
+        matrix = ((1, 0, 1, 0, 1, 0),
+                  (0, 1, 0, 1, 0, 0),
+                  (1, 1, 1, 1, 1, 1),
+                  (0, 1, 1, 0, 1, 0),
+                  (0, 0, 0, 1, 0, 1))
+        self.assertEqual(matrix, bit_matrix)
+        self.assertEqual(0b01101, bit_matrix.column(2))
+        self.assertEqual(BitMatrix(matrix).transpose(), bit_matrix.transpose())
+        self.assertEqual(self.matrix, self.bit_matrix)
+        self.assertEqual((0b1101, 0b1010), (self.bit_matrix.insert_column(2, (1, 0, 1, 1)).column(2),
+                                            self.bit_matrix.insert_column(2, (1, 0, 1, 1)).column(3)))
+
+
+class TestContextMatrixBits(unittest.TestCase):
+    def setUp(self):
+        matrix = ((1, 0, 0, 1, 0),
+                  (1, 1, 1, 1, 1),
+                  (0, 1, 0, 1, 0),
+                  (0, 0, 1, 0, 1))
+
+        self.context_matrix = ContextMatrix(matrix, elements=(1, 2, 3, 4), attributes=(5, 6, 7, 8, 9),
+                                            storage="bits")
+        self.dense = ContextMatrix(matrix, elements=(1, 2, 3, 4), attributes=(5, 6, 7, 8, 9))
+
+    def test_storage(self):
+        self.assertEqual("bits", self.context_matrix.storage)
+        self.assertEqual("dense", self.dense.storage)
+        self.assertRaises(ValueError, ContextMatrix, ((1, ), ), storage="unknown")
+
+    def test_same_api(self):
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertEqual(str(self.dense), str(self.context_matrix))
+        self.assertEqual(self.dense.json(), self.context_matrix.json())
+
+        new_context = eval(repr(self.context_matrix))
+        self.assertEqual("bits", new_context.storage)
+        self.assertEqual(self.context_matrix.matrix, new_context.matrix)
+
+    def test_transpose(self):
+        transpose = self.context_matrix.transpose()
+        self.assertEqual("bits", transpose.storage)
+        self.assertEqual(self.dense.transpose().matrix, transpose.matrix)
+        self.assertEqual(self.context_matrix.elements, transpose.attributes)
+
+    def test_reorder(self):
+        self.context_matrix.reorder_elements([3, 2, 1, 4])
+        self.dense.reorder_elements([3, 2, 1, 4])
+        self.context_matrix.reorder_attributes([9, 8, 7, 5, 6])
+        self.dense.reorder_attributes([9, 8, 7, 5, 6])
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertEqual(self.dense.elements, self.context_matrix.elements)
+        self.assertEqual(self.dense.attributes, self.context_matrix.attributes)
+
+    def test_sub_matrix(self):
+        sub_matrix = self.context_matrix.submatrix_elements([4, 2])
+        self.assertEqual("bits", sub_matrix.storage)
+        self.assertEqual((2, 4), sub_matrix.elements)
+        self.assertEqual(self.dense.submatrix_elements([4, 2]).matrix, sub_matrix.matrix)
+
+    def test_doubly_lexical(self):
+        self.context_matrix.reorder_doubly_lexical()
+        self.dense.reorder_doubly_lexical()
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertTrue(self.context_matrix.is_doubly_lexically_ordered())
@@ -1,8 +1,12 @@
+import random
 import unittest
+from unittest.mock import patch
 
 from tbs.contextmatrix._order import Node, ColumnBlock, RowBlock, row_ordering_from_last_row_block, \
-    column_ordering_from_last_column_block
-from tbs.contextmatrix import ContextMatrix
+    column_ordering_from_last_column_block, doubly_lexical_violation, is_doubly_lexically_ordered, doubly_lexical_order
+from tbs.contextmatrix._components import connected_components, components_doubly_lexical_order, _block_order
+from tbs.contextmatrix._partition_refinement import partition_refinement_doubly_lexical_order
+from tbs.contextmatrix import ContextMatrix, SparseMatrix
 
 
 class TestNode(unittest.TestCase):
@@ -124,3 +128,80 @@ class TestIsaDoublyLexicallyOrdered(unittest.TestCase):
         context_matrix = ContextMatrix([[0, 1],
                                         [1, 0]])
         self.assertFalse(context_matrix.is_doubly_lexically_ordered())
+
+    def test_violation(self):
+        self.assertIsNone(doubly_lexical_violation([[1, 0], [0, 1]]))
+        self.assertEqual(("lines", 0, 1), doubly_lexical_violation([[0, 1], [1, 0]]))
+        self.assertEqual(("columns", 1, 2), doubly_lexical_violation([[1, 1, 0],
+                                                                      [0, 1, 1],
+                                                                      [1, 1, 1]]))
+        context_matrix = ContextMatrix([[0, 1, 1],
+                                        [1, 1, 0]], storage="bits")
+        self.assertEqual(("lines", 0, 1), context_matrix.doubly_lexical_violation())
+
+    def test_same_as_definition(self):
+        def definition(matrix):
+            for i in range(len(matrix)):
+                for j in range(len(matrix[i])):
+                    if matrix[i][j] == 0:
+                        continue
+                    for j_next in range(j + 1, len(matrix[i])):
+                        if matrix[i][j_next] == 0 and not any(matrix[i_next][j] == 0 and matrix[i_next][j_next] == 1
+                                                              for i_next in range(i + 1, len(matrix))):
+                            return False
+                    for i_next in range(i + 1, len(matrix)):
+                        if matrix[i_next][j] == 0 and not any(matrix[i][j_next] == 0 and matrix[i_next][j_next] == 1
+                                                              for j_next in range(j + 1, len(matrix[i]))):
+                            return False
+            return True
+
+        random.seed(5)
+        for k in range(200):
+            matrix = [[random.randint(0, 1) for j in range(4)] for i in range(4)]
+            if k % 2:
+                matrix = ContextMatrix(matrix).reorder_doubly_lexical().matrix
+            for storage in ("dense", "bits", "sparse", "view"):
+                context_matrix = ContextMatrix(matrix, storage=storage)
+                self.assertEqual(definition(matrix), context_matrix.is_doubly_lexically_ordered())
+
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        self.matrix = [[0, 1, 0, 0, 1],
+                       [0, 0, 0, 0, 0],
+                       [1, 0, 0, 1, 0],
+                       [0, 1, 0, 0, 0],
+                       [0, 0, 0, 1, 0]]
+
+    def test_connected_components(self):
+        zero_lines, zero_columns, components = connected_components(self.matrix)
+        self.assertEqual([1], zero_lines)
+        self.assertEqual([2], zero_columns)
+        self.assertEqual(sorted([([0, 3], [1, 4]), ([2, 4], [0, 3])]), sorted(components))
+
+    def test_components_order(self):
+        for max_workers in (1, 2):
+            lines, columns = components_doubly_lexical_order(self.matrix, max_workers=max_workers)
+            self.assertEqual(1, lines[0])
+            self.assertEqual(2, columns[0])
+            self.assertTrue(is_doubly_lexically_ordered([[self.matrix[i][j] for j in columns] for i in lines]))
+
+    def test_components_preferred_order(self):
+        self.assertEqual(doubly_lexical_order([[1, 0], [0, 1]], [[1], [0]]),
+                         components_doubly_lexical_order([[1, 0], [0, 1]], [[1], [0]], max_workers=1))
+
+        order = [[4, 3], [1], [0, 2]]
+        self.assertEqual(doubly_lexical_order(self.matrix, order),
+                         components_doubly_lexical_order(self.matrix, order, max_workers=1))
+
+    def test_sparse_blocks(self):
+        with patch("tbs.contextmatrix._components.SparseMatrix", wraps=SparseMatrix) as sparse_matrix:
+            result = _block_order(partition_refinement_doubly_lexical_order, [[0, 2], [1]], 3, None)
+            _block_order(doubly_lexical_order, [[0, 2], [1]], 3, None)
+        sparse_matrix.from_ones.assert_called_once_with([[0, 2], [1]], 3)
+        self.assertEqual(partition_refinement_doubly_lexical_order([[1, 0, 1], [0, 1, 0]]), result)
+
+    def test_parallel(self):
+        context_matrix = ContextMatrix(self.matrix)
+        context_matrix.reorder_doubly_lexical(engine="refinement", parallel=True, max_workers=2)
+        self.assertTrue(context_matrix.is_doubly_lexically_ordered())
@@ -1,5 +1,9 @@
 import unittest
 import os
+import gzip
+import io
+import shutil
+import tempfile
 
 from tbs.contextmatrix import to_string
 import tbs.contextmatrix
@@ -72,3 +76,82 @@ class TestImport(unittest.TestCase):
         self.assertEqual(tuple(range(4)), reloaded_context_matrix.attributes)
         self.assertEqual(context_matrix.elements, reloaded_context_matrix.elements)
         f.close()
+
+    def test_load_stream(self):
+        f = open("../resources/test_table.txt")
+        context_matrix = tbs.contextmatrix.load(f, sep=None)
+        f.close()
+
+        f = open("../resources/test_table.txt")
+        streamed_context_matrix = tbs.contextmatrix.load_stream(f, sep=None, chunk_size=5)
+        f.close()
+        self.assertEqual("bits", streamed_context_matrix.storage)
+        self.assertEqual(context_matrix.matrix, streamed_context_matrix.matrix)
+        self.assertEqual(context_matrix.elements, streamed_context_matrix.elements)
+        self.assertEqual(context_matrix.attributes, streamed_context_matrix.attributes)
+
+        streamed_context_matrix = tbs.contextmatrix.load_stream("../resources/test_table.txt", sep=None,
+                                                                storage="sparse")
+        self.assertEqual("sparse", streamed_context_matrix.storage)
+        self.assertEqual(context_matrix.matrix, streamed_context_matrix.matrix)
+
+    def test_load_stream_gzip_and_mapped(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "table.txt.gz")
+            with gzip.open(path, "wt") as f:
+                f.write("# a comment\na,b,c\nx,1,0,1\n\ny,0,0,1\nz,1,1,1\n")
+
+            output = os.path.join(directory, "table.tbs")
+            context_matrix = tbs.contextmatrix.load_stream(path, output=output)
+            self.assertEqual("mapped", context_matrix.storage)
+            self.assertEqual(("x", "y", "z"), context_matrix.elements)
+            self.assertEqual(("a", "b", "c"), context_matrix.attributes)
+            self.assertEqual(((1, 0, 1), (0, 0, 1), (1, 1, 1)), context_matrix.matrix)
+            self.assertEqual(context_matrix.matrix, tbs.contextmatrix.load_binary(output).matrix)
+
+            sub_matrix = context_matrix.submatrix_elements(["z", "x"])
+            self.assertEqual("mapped", sub_matrix.storage)
+            self.assertEqual(((1, 0, 1), (1, 1, 1)), sub_matrix.matrix)
+            del context_matrix, sub_matrix
+        finally:
+            shutil.rmtree(directory)
+
+    def test_load_stream_file_objects(self):
+        content = b"a,b,c\nx,1,0,1\ny,0,0,1\n"
+        expected = tbs.contextmatrix.load_stream(io.StringIO(content.decode()))
+        for f in (io.BytesIO(content), io.BytesIO(gzip.compress(content))):
+            context_matrix = tbs.contextmatrix.load_stream(f, chunk_size=4)
+            self.assertFalse(f.closed)
+            self.assertEqual(("x", "y"), context_matrix.elements)
+            self.assertEqual(expected.matrix, context_matrix.matrix)
+
+    def test_binary(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "table.tbs")
+            context_matrix = tbs.contextmatrix.ContextMatrix([[1, 0, 0, 1, 0, 0, 0, 0, 1],
+                                                              [1, 1, 1, 1, 1, 0, 0, 0, 0],
+                                                              [0, 0, 0, 0, 0, 0, 0, 0, 0]],
+                                                             elements=("x", 1, (2, 3)), attributes="abcdefghi")
+            tbs.contextmatrix.save_binary(context_matrix, path)
+
+            loaded_context_matrix = tbs.contextmatrix.load_binary(path)
+            self.assertEqual("mapped", loaded_context_matrix.storage)
+            self.assertEqual(context_matrix.matrix, loaded_context_matrix.matrix)
+            self.assertEqual(context_matrix.elements, loaded_context_matrix.elements)
+            self.assertEqual(context_matrix.attributes, loaded_context_matrix.attributes)
+
+            sub_matrix = loaded_context_matrix.submatrix_elements([(2, 3), "x"])
+            self.assertEqual(context_matrix.submatrix_elements([(2, 3), "x"]).matrix, sub_matrix.matrix)
+
+            loaded_context_matrix = tbs.contextmatrix.load_binary(path, storage="sparse")
+            self.assertEqual("sparse", loaded_context_matrix.storage)
+            self.assertEqual(context_matrix.matrix, loaded_context_matrix.matrix)
+
+            with open(path, "wb") as f:
+                f.write(b"not a context matrix file")
+            self.assertRaises(ValueError, tbs.contextmatrix.load_binary, path)
+            del sub_matrix, loaded_context_matrix
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,43 @@
+import unittest
+
+from tbs.contextmatrix import ContextMatrix, MappedBitMatrix
+
+
+class TestMappedBitMatrix(unittest.TestCase):
+    def setUp(self):
+        self.matrix = ((1, 0, 0, 1, 0, 0, 0, 0, 1),
+                       (1, 1, 1, 1, 1, 0, 0, 0, 0),
+                       (0, 1, 0, 1, 0, 0, 0, 0, 1),
+                       (0, 0, 1, 0, 1, 0, 0, 0, 0))
+        self.mapped_matrix = MappedBitMatrix(self.matrix)
+
+    def test_create(self):
+        self.assertEqual(self.matrix, self.mapped_matrix)
+        self.assertEqual(4, len(self.mapped_matrix))
+        self.assertEqual(9, len(self.mapped_matrix[0]))
+        self.assertEqual(0b100001001, self.mapped_matrix.line(0))
+        self.assertEqual(0b0101, self.mapped_matrix.column(8))
+        self.assertEqual([1, 3, 8], list(self.mapped_matrix.ones(2)))
+
+    def test_from_buffer(self):
+        buffer = b"\xff" + b"\x09\x01" + b"\x1f\x00"
+        matrix = MappedBitMatrix.from_buffer(buffer, 2, 9, offset=1)
+        self.assertEqual(self.matrix[:2], matrix)
+
+    def test_reorder(self):
+        reordered = self.mapped_matrix.reorder_lines([3, 0, 2])
+        self.assertIs(self.mapped_matrix.buffer, reordered.buffer)
+        self.assertEqual((self.matrix[3], self.matrix[0], self.matrix[2]), reordered)
+        self.assertEqual((self.matrix[2], ), reordered.reorder_lines([2]))
+        self.assertEqual(tuple(zip(*self.matrix)), self.mapped_matrix.transpose())
+        self.assertEqual(tuple(line[::-1] for line in self.matrix),
+                         self.mapped_matrix.reorder_columns(list(reversed(range(9)))))
+
+    def test_context_matrix(self):
+        context_matrix = ContextMatrix(self.matrix, storage="mapped")
+        dense = ContextMatrix(self.matrix)
+        context_matrix.reorder_doubly_lexical()
+        dense.reorder_doubly_lexical()
+        self.assertEqual("mapped", context_matrix.storage)
+        self.assertEqual(dense.matrix, context_matrix.matrix)
+        self.assertTrue(context_matrix.is_doubly_lexically_ordered())
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from tbs.contextmatrix import ContextMatrix
@@ -158,6 +159,24 @@ class TestMatrix(unittest.TestCase):
         sub_matrix = self.context_matrix.submatrix_elements([2, 3, 1])
         self.assertEqual((1, 2, 3), sub_matrix.elements)
         self.assertEqual(self.context_matrix.attributes, sub_matrix.attributes)
+        self.assertRaises(ValueError, self.context_matrix.submatrix_elements, [2, 10])
+
+    def test_labels_index(self):
+        self.assertEqual(1, self.context_matrix.element_index(2))
+        self.assertEqual(4, self.context_matrix.attribute_index(9))
+        self.assertTrue(self.context_matrix.has_element(4))
+        self.assertFalse(self.context_matrix.has_element(5))
+        self.assertTrue(self.context_matrix.has_attribute(5))
+        self.assertRaises(ValueError, self.context_matrix.attribute_index, 1)
+
+        self.context_matrix.reorder_elements([4, 3, 2, 1])
+        self.context_matrix.reorder_attributes([9, 8, 7, 5, 6])
+        self.assertEqual(0, self.context_matrix.element_index(4))
+        self.assertEqual(3, self.context_matrix.attribute_index(5))
+
+        self.context_matrix.elements = ["a", "b", "c", "d"]
+        self.assertEqual(2, self.context_matrix.element_index("c"))
+        self.assertFalse(self.context_matrix.has_element(4))
 
 
 class TestDoublyLexicalOrdering(unittest.TestCase):
@@ -168,6 +187,98 @@ class TestDoublyLexicalOrdering(unittest.TestCase):
         self.assertEqual((1, 0), context_matrix.elements)
         self.assertEqual((1, 0), context_matrix.attributes)
 
+    def test_insert_rows(self):
+        context_matrix = ContextMatrix(((1, 1), (1, 0))).reorder_doubly_lexical()
+        context_matrix.insert_rows([(1, 0)], ["new"])
+        self.assertEqual(((1, 0), (0, 1), (1, 1)), context_matrix.matrix)
+        self.assertEqual(("new", 1, 0), context_matrix.elements)
+        self.assertEqual((1, 0), context_matrix.attributes)
+
+    def test_insert_rows_equal_columns(self):
+        context_matrix = ContextMatrix(((1, 1), ), ("a", ), ("x", "y")).reorder_doubly_lexical()
+        first, second = context_matrix.attributes
+        context_matrix.insert_rows([(1, 0)], ["b"])
+        self.assertEqual(((0, 1), (1, 1)), context_matrix.matrix)
+        self.assertEqual(("b", "a"), context_matrix.elements)
+        self.assertEqual((second, first), context_matrix.attributes)
+
+    def test_insert_columns(self):
+        context_matrix = ContextMatrix(((1, 1), (1, 0))).reorder_doubly_lexical()
+        context_matrix.insert_columns([(0, 0), (1, 1)], ["zero", "one"])
+        self.assertEqual(((0, 0, 1, 1), (0, 1, 1, 1)), context_matrix.matrix)
+        self.assertEqual((1, 0), context_matrix.elements)
+        self.assertEqual(("zero", 1, "one", 0), context_matrix.attributes)
+
+    def test_insert_keeps_order(self):
+        random.seed(7)
+        for k in range(100):
+            matrix = [[random.randint(0, 1) for j in range(4)] for i in range(4)]
+            context_matrix = ContextMatrix(matrix, storage=random.choice(("dense", "bits", "sparse", "view")))
+            context_matrix.reorder_doubly_lexical()
+            cells = {(element, attribute): context_matrix.matrix[i][j]
+                     for i, element in enumerate(context_matrix.elements)
+                     for j, attribute in enumerate(context_matrix.attributes)}
+
+            line = [random.randint(0, 1) for j in range(4)]
+            cells.update((("line", attribute), line[j]) for j, attribute in enumerate(context_matrix.attributes))
+            context_matrix.insert_rows([line], ["line"])
+            column = [random.randint(0, 1) for i in range(5)]
+            cells.update(((element, "column"), column[i]) for i, element in enumerate(context_matrix.elements))
+            context_matrix.insert_columns([column], ["column"])
+
+            self.assertTrue(context_matrix.is_doubly_lexically_ordered())
+            self.assertEqual(cells, {(element, attribute): context_matrix.matrix[i][j]
+                                     for i, element in enumerate(context_matrix.elements)
+                                     for j, attribute in enumerate(context_matrix.attributes)})
+
+    def test_insert_several(self):
+        random.seed(11)
+        for k in range(100):
+            matrix = [[random.randint(0, 1) for j in range(4)] for i in range(4)]
+            context_matrix = ContextMatrix(matrix, storage=random.choice(("dense", "bits", "sparse", "view")))
+            context_matrix.reorder_doubly_lexical()
+            cells = {(element, attribute): context_matrix.matrix[i][j]
+                     for i, element in enumerate(context_matrix.elements)
+                     for j, attribute in enumerate(context_matrix.attributes)}
+
+            lines = [[random.randint(0, 1) for j in range(4)] for index in range(3)]
+            for index, line in enumerate(lines):
+                cells.update((("line" + str(index), attribute), line[j])
+                             for j, attribute in enumerate(context_matrix.attributes))
+            context_matrix.insert_rows(lines, ["line0", "line1", "line2"])
+            columns = [[random.randint(0, 1) for i in range(7)] for index in range(3)]
+            for index, column in enumerate(columns):
+                cells.update(((element, "column" + str(index)), column[i])
+                             for i, element in enumerate(context_matrix.elements))
+            context_matrix.insert_columns(columns, ["column0", "column1", "column2"])
+
+            self.assertTrue(context_matrix.is_doubly_lexically_ordered())
+            self.assertEqual(cells, {(element, attribute): context_matrix.matrix[i][j]
+                                     for i, element in enumerate(context_matrix.elements)
+                                     for j, attribute in enumerate(context_matrix.attributes)})
+
+    def test_insert_new_storage(self):
+        for storage in ("dense", "bits", "sparse"):
+            context_matrix = ContextMatrix(((1, 1), (1, 0)), storage=storage).reorder_doubly_lexical()
+            matrix = context_matrix.matrix
+            view = ContextMatrix(matrix, storage="view")
+            context_matrix.insert_rows([(1, 0)], ["new"])
+            context_matrix.insert_columns([(0, 0, 0)], ["zero"])
+            self.assertEqual(((0, 1, 0), (0, 0, 1), (0, 1, 1)), context_matrix.matrix)
+            self.assertTrue(context_matrix.is_doubly_lexically_ordered())
+            self.assertEqual(((0, 1), (1, 1)), matrix)
+            self.assertEqual(((0, 1), (1, 1)), view.matrix)
+
+    def test_insert_preferred_order(self):
+        context_matrix = ContextMatrix(((1, 1), (1, 0))).reorder_doubly_lexical(order=[[0], [1]])
+        self.assertRaises(ValueError, context_matrix.insert_rows, [(1, 0)])
+        self.assertRaises(ValueError, context_matrix.insert_columns, [(1, 0)])
+        self.assertEqual(2, len(context_matrix.matrix))
+
+        context_matrix.reorder_doubly_lexical()
+        context_matrix.insert_rows([(1, 0)])
+        self.assertTrue(context_matrix.is_doubly_lexically_ordered())
+
 
 class TestFromCoverGraph(unittest.TestCase):
     def new_lattice(self):
@@ -0,0 +1,73 @@
+import unittest
+
+from tbs.contextmatrix import ContextMatrix, MatrixView, BitMatrix
+
+
+class TestMatrixView(unittest.TestCase):
+    def setUp(self):
+        self.matrix = ((1, 0, 0, 1, 0),
+                       (1, 1, 1, 1, 1),
+                       (0, 1, 0, 1, 0),
+                       (0, 0, 1, 0, 1))
+        self.view = MatrixView(self.matrix)
+
+    def test_create(self):
+        self.assertEqual(self.matrix, self.view)
+        self.assertIs(self.matrix, self.view.base)
+        self.assertEqual(4, len(self.view))
+        self.assertEqual(5, len(self.view[0]))
+        self.assertEqual(1, self.view[-1][-1])
+
+    def test_transpose(self):
+        transpose = self.view.transpose()
+        self.assertIs(self.matrix, transpose.base)
+        self.assertEqual(tuple(zip(*self.matrix)), transpose)
+        self.assertEqual(self.matrix, transpose.transpose())
+
+    def test_reorder(self):
+        lines = self.view.reorder_lines([3, 0, 2, 1])
+        self.assertIs(self.matrix, lines.base)
+        self.assertEqual((self.matrix[3], self.matrix[0], self.matrix[2], self.matrix[1]), lines)
+
+        columns = lines.reorder_columns([4, 3, 2, 0, 1])
+        self.assertEqual(tuple((line[4], line[3], line[2], line[0], line[1]) for line in lines), columns)
+        self.assertEqual(tuple(zip(*columns.materialize())), columns.transpose().materialize())
+
+    def test_other_base(self):
+        view = MatrixView(BitMatrix(self.matrix)).transpose().reorder_lines([4, 3, 2, 1, 0])
+        self.assertEqual(tuple(reversed(tuple(zip(*self.matrix)))), view)
+
+
+class TestContextMatrixView(unittest.TestCase):
+    def setUp(self):
+        self.matrix = ((1, 0, 0, 1, 0),
+                       (1, 1, 1, 1, 1),
+                       (0, 1, 0, 1, 0),
+                       (0, 0, 1, 0, 1))
+
+        self.context_matrix = ContextMatrix(self.matrix, elements=(1, 2, 3, 4), attributes=(5, 6, 7, 8, 9),
+                                            storage="view")
+        self.dense = ContextMatrix(self.matrix, elements=(1, 2, 3, 4), attributes=(5, 6, 7, 8, 9))
+
+    def test_no_copy(self):
+        self.assertEqual("view", self.context_matrix.storage)
+        self.context_matrix.reorder_elements([3, 2, 1, 4])
+        self.context_matrix.reorder_attributes([9, 8, 7, 5, 6])
+        self.assertIs(self.matrix, self.context_matrix.matrix.base)
+        self.assertIs(self.matrix, self.context_matrix.transpose().matrix.base)
+
+    def test_same_api(self):
+        self.context_matrix.reorder_elements([3, 2, 1, 4])
+        self.dense.reorder_elements([3, 2, 1, 4])
+        self.context_matrix.reorder_attributes([9, 8, 7, 5, 6])
+        self.dense.reorder_attributes([9, 8, 7, 5, 6])
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertEqual(self.dense.transpose().matrix, self.context_matrix.transpose().matrix)
+        self.assertEqual(str(self.dense), str(self.context_matrix))
+        self.assertEqual(self.dense.json(), self.context_matrix.json())
+
+    def test_doubly_lexical(self):
+        self.context_matrix.reorder_doubly_lexical()
+        self.dense.reorder_doubly_lexical()
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertTrue(self.context_matrix.is_doubly_lexically_ordered())
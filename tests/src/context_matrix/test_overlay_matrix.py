@@ -0,0 +1,39 @@
+import unittest
+
+from tbs.contextmatrix import ContextMatrix, OverlayMatrix, SparseMatrix
+
+
+class TestOverlayMatrix(unittest.TestCase):
+    def setUp(self):
+        self.base = ((1, 0, 0),
+                     (0, 1, 0))
+        self.overlay = OverlayMatrix(self.base, [(0, 2), (1, 0)])
+
+    def test_create(self):
+        self.assertEqual(((1, 0, 1), (1, 1, 0)), self.overlay)
+        self.assertIs(self.base, self.overlay.base)
+        self.assertEqual([(0, 2), (1, 0)], self.overlay.delta)
+        self.assertEqual([0, 2], self.overlay.ones(0))
+        self.assertEqual(((1, 0, 0), (0, 0, 0)), OverlayMatrix(self.base, [(1, 1)], value=0))
+
+    def test_unmodified_line(self):
+        overlay = OverlayMatrix(self.base, [(0, 1)])
+        self.assertIs(self.base[1], overlay[1])
+
+    def test_reorder(self):
+        self.assertEqual(((1, 1, 0), (1, 0, 1)), self.overlay.reorder_lines([1, 0]))
+        self.assertEqual(((1, 0, 1), (0, 1, 1)), self.overlay.reorder_columns([2, 1, 0]))
+        self.assertEqual(((1, 1), (0, 1), (1, 0)), self.overlay.transpose())
+        self.assertEqual([(0, 0)], self.overlay.submatrix_lines([1]).delta)
+
+    def test_sparse_base(self):
+        overlay = OverlayMatrix(SparseMatrix(self.base), [(0, 2), (1, 0)])
+        self.assertEqual(self.overlay, overlay)
+        self.assertEqual("sparse", overlay.transpose().base.storage)
+
+    def test_context_matrix(self):
+        context_matrix = ContextMatrix(self.overlay, storage="overlay")
+        self.assertIs(self.base, context_matrix.matrix.base)
+        context_matrix.reorder_doubly_lexical()
+        self.assertEqual("overlay", context_matrix.storage)
+        self.assertTrue(context_matrix.is_doubly_lexically_ordered())
@@ -0,0 +1,64 @@
+import unittest
+import random
+
+from tbs.contextmatrix._partition_refinement import partition_refinement_doubly_lexical_order, lines_ones
+from tbs.contextmatrix._order import is_doubly_lexically_ordered
+from tbs.contextmatrix import ContextMatrix, BitMatrix
+
+
+def reordered(matrix, lines, columns):
+    return [[matrix[i][j] for j in columns] for i in lines]
+
+
+class TestLinesOnes(unittest.TestCase):
+    def test_dense_and_bits(self):
+        matrix = ((1, 0, 1),
+                  (0, 0, 0),
+                  (0, 1, 1))
+        self.assertEqual([[0, 2], [], [1, 2]], lines_ones(matrix))
+        self.assertEqual([[0, 2], [], [1, 2]], lines_ones(BitMatrix(matrix)))
+
+
+class TestPartitionRefinement(unittest.TestCase):
+    def test_run(self):
+        matrix = [[1, 1, 1, 1, 1],
+                  [1, 0, 1, 1, 0],
+                  [0, 1, 1, 0, 0],
+                  [1, 1, 1, 0, 0],
+                  [0, 1, 0, 1, 1],
+                  [1, 0, 0, 1, 0]]
+
+        lines, columns = partition_refinement_doubly_lexical_order(matrix)
+        self.assertEqual(list(range(6)), sorted(lines))
+        self.assertEqual(list(range(5)), sorted(columns))
+        self.assertTrue(is_doubly_lexically_ordered(reordered(matrix, lines, columns)))
+
+    def test_run_no_gamma(self):
+        context_matrix = ContextMatrix([[1, 1, 1],
+                                        [1, 0, 1],
+                                        [0, 0, 1]])
+
+        context_matrix.reorder_doubly_lexical(engine="refinement")
+        self.assertEqual((2, 1, 0), context_matrix.elements)
+        self.assertEqual((1, 0, 2), context_matrix.attributes)
+
+    def test_random(self):
+        random.seed(42)
+        for i in range(200):
+            number_lines, number_columns = random.randint(1, 8), random.randint(1, 8)
+            probability = random.random()
+            matrix = [[random.random() < probability and 1 or 0 for j in range(number_columns)]
+                      for i in range(number_lines)]
+
+            lines, columns = partition_refinement_doubly_lexical_order(matrix)
+            self.assertTrue(is_doubly_lexically_ordered(reordered(matrix, lines, columns)))
+
+    def test_order(self):
+        matrix = [[1, 1],
+                  [1, 0],
+                  [0, 1]]
+        lines, columns = partition_refinement_doubly_lexical_order(matrix, [[0], [1, 2]])
+        self.assertEqual(0, lines[0])
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, ContextMatrix([[1]]).reorder_doubly_lexical, engine="unknown")
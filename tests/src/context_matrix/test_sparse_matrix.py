@@ -0,0 +1,98 @@
+import io
+import unittest
+
+from tbs.contextmatrix import ContextMatrix, SparseMatrix, load
+from tbs.gamma_free import GammaFree
+from tbs.gamma_free._gamma_free import is_gamma_free_matrix
+from tbs.gamma_free._box_lattice import box_lattice
+
+
+class TestSparseMatrix(unittest.TestCase):
+    def setUp(self):
+        self.matrix = ((1, 0, 0, 1, 0),
+                       (1, 1, 1, 1, 1),
+                       (0, 0, 0, 0, 0),
+                       (0, 0, 1, 0, 1))
+        self.sparse_matrix = SparseMatrix(self.matrix)
+
+    def test_create(self):
+        self.assertEqual(self.matrix, self.sparse_matrix)
+        self.assertEqual(4, len(self.sparse_matrix))
+        self.assertEqual(5, len(self.sparse_matrix[0]))
+        self.assertEqual(1, self.sparse_matrix[-1][-1])
+        self.assertEqual(0, self.sparse_matrix[0][2])
+        self.assertEqual(self.matrix, SparseMatrix.from_ones([[3, 0], [0, 1, 2, 3, 4], [], [2, 4]], 5))
+
+    def test_csr_csc(self):
+        indptr, indices = self.sparse_matrix.csr
+        self.assertEqual([0, 2, 7, 7, 9], list(indptr))
+        self.assertEqual([0, 3, 0, 1, 2, 3, 4, 2, 4], list(indices))
+        self.assertEqual([1, 3], list(self.sparse_matrix.column_ones(2)))
+        self.assertEqual([0, 1], list(self.sparse_matrix.column_ones(3)))
+        self.assertEqual([2, 4], list(self.sparse_matrix.ones(3)))
+        self.assertEqual(9, self.sparse_matrix.count())
+
+    def test_transpose(self):
+        self.assertEqual(tuple(zip(*self.matrix)), self.sparse_matrix.transpose())
+        self.assertEqual(self.sparse_matrix, self.sparse_matrix.transpose().transpose())
+
+    def test_reorder(self):
+        self.assertEqual((self.matrix[3], self.matrix[0], self.matrix[2], self.matrix[1]),
+                         self.sparse_matrix.reorder_lines([3, 0, 2, 1]))
+        self.assertEqual(tuple((line[4], line[3], line[2], line[0], line[1]) for line in self.matrix),
+                         self.sparse_matrix.reorder_columns([4, 3, 2, 0, 1]))
+
+    def test_insert(self):
+        transpose = self.sparse_matrix.transpose()
+        sparse_matrix = self.sparse_matrix.insert_line(1, (0, 1, 1, 0, 0)).insert_column(2, (1, 0, 1, 1, 0))
+        matrix = ((1, 0, 1, 0, 1, 0),
+                  (0, 1, 0, 1, 0, 0),
+                  (1, 1, 1, 1, 1, 1),
+                  (0, 0, 1, 0, 0, 0),
+                  (0, 0, 0, 1, 0, 1))
+        self.assertEqual(matrix, sparse_matrix)
+        self.assertEqual([0, 2, 3], list(sparse_matrix.column_ones(2)))
+        self.assertEqual(self.matrix, self.sparse_matrix)
+        self.assertEqual(tuple(zip(*self.matrix)), transpose)
+
+
+class TestContextMatrixSparse(unittest.TestCase):
+    def setUp(self):
+        self.clusters = [{1, 2}, {1, 2, 3}, {3, 4}, {1, 2, 3, 4}]
+        self.context_matrix = ContextMatrix.from_clusters(self.clusters, [1, 2, 3, 4], storage="sparse")
+        self.dense = ContextMatrix.from_clusters(self.clusters, [1, 2, 3, 4])
+
+    def test_from_clusters(self):
+        self.assertEqual("sparse", self.context_matrix.storage)
+        self.assertEqual(self.dense.matrix, self.context_matrix.matrix)
+        self.assertEqual(str(self.dense), str(self.context_matrix))
+
+        new_context = eval(repr(self.context_matrix))
+        self.assertEqual("sparse", new_context.storage)
+        self.assertEqual(self.context_matrix.matrix, new_context.matrix)
+
+    def test_load(self):
+        f = io.StringIO(u"a b c\n1 1 0 1\n2 0 0 1\n")
+        context_matrix = load(f, sep=None, storage="sparse")
+        self.assertEqual("sparse", context_matrix.storage)
+        self.assertEqual(((1, 0, 1), (0, 0, 1)), context_matrix.matrix)
+        self.assertEqual(("1", "2"), context_matrix.elements)
+
+    def test_transpose_and_submatrix(self):
+        self.assertEqual(self.dense.transpose().matrix, self.context_matrix.transpose().matrix)
+        sub_matrix = self.context_matrix.submatrix_elements([4, 2])
+        self.assertEqual("sparse", sub_matrix.storage)
+        self.assertEqual(self.dense.submatrix_elements([4, 2]).matrix, sub_matrix.matrix)
+
+    def test_gamma_free(self):
+        for engine in ("blocks", "refinement"):
+            context_matrix = ContextMatrix.from_context_matrix(self.context_matrix)
+            context_matrix.reorder_doubly_lexical(engine=engine)
+            self.assertEqual("sparse", context_matrix.storage)
+            self.assertTrue(context_matrix.is_doubly_lexically_ordered())
+            self.assertTrue(is_gamma_free_matrix(context_matrix.matrix))
+
+        self.dense.reorder_doubly_lexical()
+        self.context_matrix.reorder_doubly_lexical()
+        self.assertEqual(box_lattice(GammaFree.from_context_matrix(self.dense)),
+                         box_lattice(GammaFree.from_context_matrix(self.context_matrix)))
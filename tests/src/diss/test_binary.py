@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+
+import tbs.diss
+from tbs.diss import Diss
+
+
+class TestDissBinary(unittest.TestCase):
+    def setUp(self):
+        self.d = Diss(["a", "b", "c", "d"]).update_by_pos(lambda i, j: i + j / 4.)
+        self.d.set_by_pos(2, 2, 1.5)
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def save(self, d, typecode="d"):
+        with open(self.path, "wb") as f:
+            tbs.diss.save_binary(d, f, typecode)
+
+    def test_load(self):
+        self.save(self.d)
+        with open(self.path, "rb") as f:
+            d = tbs.diss.load_binary(f)
+        self.assertEqual("condensed", d.storage)
+        self.assertEqual(self.d, d)
+        self.assertEqual(1.5, d("c", "c"))
+        self.assertEqual(list("abcd"), list(d))
+        self.assertEqual(self.d.restriction(["b", "d"]), d.restriction(["b", "d"]))
+        self.assertEqual(tbs.diss.max(self.d), tbs.diss.max(d))
+        self.assertRaises(TypeError, d.set_by_pos, 0, 1, 3)
+
+    def test_float32_from_condensed(self):
+        self.save(Diss.from_condensed(list(self.d), self.d.condensed), "f")
+        with open(self.path, "rb") as f:
+            d = tbs.diss.load_binary(f)
+        self.assertEqual(self.d.condensed, d.condensed)
+        self.assertEqual(0, d("c", "c"))
+
+    def test_float32_to_float64(self):
+        self.save(self.d, "f")
+        with open(self.path, "rb") as f:
+            d = tbs.diss.load_binary(f)
+
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            for typecode in ("d", "f"):
+                with open(path, "wb") as f:
+                    tbs.diss.save_binary(d, f, typecode)
+                with open(path, "rb") as f:
+                    self.assertEqual(self.d, tbs.diss.load_binary(f))
+        finally:
+            os.remove(path)
+
+    def test_writable(self):
+        self.save(self.d)
+        with open(self.path, "r+b") as f:
+            d = tbs.diss.load_binary(f, writable=True)
+        d["a", "d"] = 10
+        del d
+        with open(self.path, "rb") as f:
+            self.assertEqual(10, tbs.diss.load_binary(f)("d", "a"))
+
+    def test_add_remove(self):
+        self.save(self.d)
+        with open(self.path, "rb") as f:
+            d = tbs.diss.load_binary(f)
+        d.remove("b")
+        d.add("e", 2)
+        self.d.remove("b")
+        self.d.add("e", 2)
+        self.assertEqual(self.d, d)
+
+    def test_not_binary(self):
+        with open(self.path, "wb") as f:
+            tbs.diss.save(self.d, io.TextIOWrapper(f)).flush()
+        with open(self.path, "rb") as f:
+            self.assertRaises(ValueError, tbs.diss.load_binary, f)
@@ -48,4 +48,25 @@ class TestDissComparison(unittest.TestCase):
         self.assertFalse(dprim > d)
         self.assertTrue(dprim < d)
         self.assertFalse(d < dprim)
-        self.assertFalse(d == dprim)
\ No newline at end of file
+        self.assertFalse(d == dprim)
+
+    def test_label_alignment(self):
+        d = Diss(range(4)).update(lambda x, y: x + y, True)
+        reversed_d = Diss(reversed(range(4))).update(d, True)
+        self.assertTrue(d == reversed_d)
+        reversed_d[0, 3] = 5
+        self.assertTrue(d < reversed_d)
+        self.assertTrue(reversed_d >= d)
+        self.assertEqual(8, (d + reversed_d)(3, 0))
+        self.assertEqual(list(d), list(d - reversed_d))
+
+    def test_condensed(self):
+        d = Diss(range(4), storage="condensed").update(lambda x, y: x + y + 1, True)
+        lists = Diss(range(4)).update(d, True)
+        for result, expected in ((d + d, lists + lists), (d * lists, lists * lists), (d / d, lists / lists),
+                                 (-d, -lists), (abs(-d), lists)):
+            self.assertEqual("condensed", result.storage)
+            self.assertEqual(expected, result)
+        d += 1
+        self.assertEqual(1, d(0, 0))
+        self.assertTrue(d > lists)
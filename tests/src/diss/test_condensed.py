@@ -0,0 +1,67 @@
+import unittest
+from array import array
+
+from tbs.diss import Diss
+
+
+class TestCondensedStorage(unittest.TestCase):
+    def setUp(self):
+        self.lists = Diss(range(4)).update_by_pos(lambda i, j: 10 * i + j)
+        self.condensed = Diss(range(4), storage="condensed").update_by_pos(lambda i, j: 10 * i + j)
+
+    def test_pdist_layout(self):
+        self.assertEqual(array("d", [1, 2, 3, 12, 13, 23]), self.condensed.condensed)
+        self.assertEqual(self.condensed.condensed, self.lists.condensed)
+
+    def test_api(self):
+        self.assertEqual("condensed", self.condensed.storage)
+        self.assertEqual(self.lists, self.condensed)
+        self.assertEqual(13, self.condensed(3, 1))
+        self.assertEqual(0, self.condensed.get_by_pos(2, 2))
+        self.condensed.set_by_pos(3, 0, 7)
+        self.assertEqual(7, self.condensed.condensed[2])
+        self.assertEqual(frozenset([1, 2, 7, 12, 13, 23]), self.condensed.values())
+        self.assertEqual(frozenset([0, 1, 2, 7, 12, 13, 23]), self.condensed.values(True))
+
+    def test_add_remove(self):
+        self.condensed.add(4, 5)
+        self.lists.add(4, 5)
+        self.assertEqual(self.lists, self.condensed)
+        self.assertEqual(5, self.condensed(4, 4))
+        self.condensed.remove(1)
+        self.lists.remove(1)
+        self.assertEqual(self.lists, self.condensed)
+        self.assertEqual(array("d", [2, 3, 5, 23, 5, 5]), self.condensed.condensed)
+
+    def test_copy(self):
+        copy = self.condensed.copy()
+        self.assertEqual("condensed", copy.storage)
+        self.assertEqual("condensed", self.condensed.restriction([1, 2]).storage)
+        self.assertEqual("condensed", (copy + copy).storage)
+        copy[0, 1] = 100
+        self.assertEqual(1, self.condensed(0, 1))
+
+    def test_from_condensed(self):
+        values = array("d", [1, 2, 3, 12, 13, 23])
+        diss = Diss.from_condensed("abcd", values)
+        self.assertEqual(list("abcd"), list(diss))
+        self.assertIs(values, diss.condensed)
+        self.assertEqual(13, diss("d", "b"))
+        self.assertEqual(Diss.from_condensed(range(4), memoryview(values)), self.lists)
+        self.assertEqual(Diss.from_condensed(range(4), [1, 2, 3, 12, 13, 23]), self.lists)
+        self.assertRaises(ValueError, Diss.from_condensed, range(3), values)
+        self.assertRaises(ValueError, Diss.from_condensed, range(4), values[1:])
+
+    def test_from_condensed_small(self):
+        self.assertEqual(0, len(Diss.from_condensed([], [], [])))
+        self.assertEqual(0, len(Diss.from_condensed([], [])))
+        self.assertEqual(["a"], list(Diss.from_condensed("a", [], [5])))
+        self.assertEqual(5, Diss.from_condensed("a", [], [5])("a", "a"))
+        self.assertRaises(ValueError, Diss.from_condensed, "ab", [])
+
+    def test_from_strided_buffer(self):
+        values = array("d", [1, 0, 2, 0, 3, 0, 12, 0, 13, 0, 23, 0])
+        self.assertEqual(Diss.from_condensed(range(4), memoryview(values)[::2]), self.lists)
+
+    def test_unknown_storage(self):
+        self.assertRaises(ValueError, Diss, range(3), 0, "matrix")
@@ -68,4 +68,31 @@ class TestDissModification(unittest.TestCase):
         self.assertEqual(len(self.d), 5)
         
         self.assertRaises(ValueError, self.d.add, 9)
-        self.assertRaises(ValueError, self.d.remove, "not in d")
\ No newline at end of file
+        self.assertRaises(ValueError, self.d.remove, "not in d")
+
+    def test_bulk_update(self):
+        for storage in ("lists", "condensed"):
+            d = Diss(range(4), storage=storage)
+            d.update_by_pos(lambda x, y: [10 * i + j for i, j in zip(x, y)], vectorized=True)
+            self.assertEqual(Diss(range(4)).update_by_pos(lambda x, y: 10 * x + y), d)
+            d.update_by_pos(lambda x, y: [1] * len(x), True, vectorized=True)
+            self.assertEqual(1, d(2, 2))
+
+            d.update_condensed([1, 2, 3, 12, 13, 23])
+            self.assertEqual(13, d(3, 1))
+            self.assertEqual(1, d(3, 3))
+            d.update_condensed([1, 2, 3, 12, 13, 23], [0] * 4)
+            self.assertEqual(0, d(3, 3))
+            self.assertRaises(ValueError, d.update_condensed, [1, 2, 3])
+
+            self.assertEqual(storage, d.copy().storage)
+            self.assertEqual(d, d.copy())
+            restriction = d.restriction([3, 1])
+            self.assertEqual([3, 1], list(restriction))
+            self.assertEqual(13, restriction(1, 3))
+
+    def test_bulk_update_wrong_size(self):
+        for storage in ("lists", "condensed"):
+            d = Diss(range(3), storage=storage).update_by_pos(lambda x, y: x + y + 1, True)
+            self.assertRaises(ValueError, d.update_by_pos, lambda x, y: [7] * (len(x) + 1), True, True)
+            self.assertEqual(Diss(range(3)).update_by_pos(lambda x, y: x + y + 1, True), d)
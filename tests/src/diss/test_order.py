@@ -84,3 +84,35 @@ class TestOrder(unittest.TestCase):
                     self.assertEqual(r[x][y], 0)
                 else:
                     self.assertEqual(r[x][y], 1)
+
+
+class TestValueIndex(unittest.TestCase):
+    def setUp(self):
+        self.d = Diss(range(5)).update_by_pos(lambda x, y: (x * y) % 4, True)
+
+    def test_same_results(self):
+        expected = [diss.min(self.d, indices=True), diss.min(self.d, indices=True, xx=True),
+                    diss.max(self.d, indices=True), diss.max(self.d, indices=True, xx=True), diss.rank(self.d)]
+        self.d.value_index()
+        self.assertEqual(expected, [diss.min(self.d, indices=True), diss.min(self.d, indices=True, xx=True),
+                                    diss.max(self.d, indices=True), diss.max(self.d, indices=True, xx=True),
+                                    diss.rank(self.d)])
+
+    def test_sorted_pairs(self):
+        value_index = self.d.value_index()
+        self.assertEqual(10, len(value_index))
+        self.assertEqual(sorted(self.d.condensed), list(value_index.values))
+        self.assertEqual((0, 1, 0), next(value_index.pairs()))
+        self.assertEqual((1, 3), value_index.pair(9))
+        self.assertEqual(7, value_index.threshold_position(1))
+        self.assertEqual([0, 2, 4, 1, 3], list(value_index.neighbours(2)))
+
+    def test_invalidation(self):
+        value_index = self.d.value_index()
+        self.assertIs(value_index, self.d.value_index(False))
+        self.d[0, 1] = 7
+        self.assertIsNone(self.d.value_index(False))
+        self.d.value_index()
+        self.assertEqual(7, diss.max(self.d))
+        self.d += 1
+        self.assertIsNone(self.d.value_index(False))
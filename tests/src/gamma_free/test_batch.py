@@ -0,0 +1,39 @@
+import unittest
+import pickle
+
+from tbs.contextmatrix import ContextMatrix
+from tbs.gamma_free import GammaFree, box_lattice, batch_box_lattices
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.matrices = [[[1, 1, 0], [1, 0, 1], [0, 1, 1]],
+                         [[1, 0, 0, 1], [0, 1, 1, 0], [1, 1, 0, 0]],
+                         ContextMatrix([[0, 1], [1, 1]], elements=("x", "y"))]
+
+    def check(self, results):
+        self.assertEqual([0, 1, 2], sorted(result.index for result in results))
+        for result in results:
+            matrix = self.matrices[result.index]
+            if not isinstance(matrix, ContextMatrix):
+                matrix = ContextMatrix(matrix)
+            gamma_free = GammaFree.from_approximation(ContextMatrix.from_context_matrix(matrix).reorder_doubly_lexical())
+            result_gamma_free = result.gamma_free(matrix)
+            self.assertEqual(gamma_free.matrix, result_gamma_free.matrix)
+            self.assertEqual(gamma_free.elements, result_gamma_free.elements)
+
+            boxes = box_lattice(gamma_free, compact=True)
+            self.assertEqual([boxes.box(k) for k in boxes], [result.boxes.box(k) for k in result.boxes])
+            self.assertEqual(list(boxes.edges()), list(result.boxes.edges()))
+
+    def test_sequential(self):
+        results = list(batch_box_lattices(self.matrices, max_workers=1, chunksize=2))
+        self.check(results)
+        self.assertEqual([(1, 1)], results[0].added)
+        self.assertEqual(results[0].lines, pickle.loads(pickle.dumps(results[0])).lines)
+
+    def test_parallel(self):
+        self.check(list(batch_box_lattices(self.matrices, max_workers=2, chunksize=1)))
+
+    def test_engine(self):
+        self.assertRaises(ValueError, list, batch_box_lattices(self.matrices, engine="unknown"))
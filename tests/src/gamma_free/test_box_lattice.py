@@ -4,7 +4,8 @@ from tbs.dismantlable import DismantlableLattice
 from tbs.graph import DirectedGraph
 
 from tbs.gamma_free import GammaFree
-from tbs.gamma_free._box_lattice import ClusterLineFromMatrix, box_lattice
+from tbs.contextmatrix import MappedBitMatrix
+from tbs.gamma_free._box_lattice import ClusterLineFromMatrix, box_lattice, BoxLattice
 
 
 class TestMatrixClusterBase(unittest.TestCase):
@@ -75,4 +76,46 @@ class TestMatrixClusterAndBoxes(unittest.TestCase):
                                                           (c4, c3), (c3, t),
                                                           (c2, c1), (c2, c3),
                                                           (c1, t)])),
-            lattice)
\ No newline at end of file
+            lattice)
+
+    def test_boxes(self):
+        boxes = ClusterLineFromMatrix.boxes(self.matrix)
+        self.assertEqual(((0, 0), (0, 1)), next(boxes))
+        self.assertEqual([((0, 4), (0, 4)),
+                          ((1, 0), (1, 1)), ((1, 3), (1, 4)),
+                          ((2, 2), (2, 4)),
+                          ((3, 0), (3, 4))], list(boxes))
+
+    def test_boxes_lazy_matrix(self):
+        matrix = MappedBitMatrix(self.matrix)
+        self.assertEqual(list(ClusterLineFromMatrix.boxes(self.matrix)), list(ClusterLineFromMatrix.boxes(matrix)))
+        self.assertIs(matrix, ClusterLineFromMatrix(matrix).matrix)
+
+    def test_box_indices(self):
+        indices, line_begin, column_begin, line_end, column_end = ClusterLineFromMatrix.box_indices(self.matrix)
+        self.assertEqual([[0, 0, -1, -1, 1],
+                          [2, 2, -1, 3, 3],
+                          [-1, -1, 4, 4, 4],
+                          [5, 5, 5, 5, 5]], [list(line) for line in indices])
+        self.assertEqual([0, 0, 1, 1, 2, 3], list(line_begin))
+        self.assertEqual([1, 4, 1, 4, 4, 4], list(column_end))
+
+    def test_compact_lattice(self):
+        boxes = box_lattice(GammaFree(self.matrix), compact=True)
+        self.assertIsInstance(boxes, BoxLattice)
+        self.assertEqual(6, len(boxes))
+        self.assertEqual(((3, 0), (3, 4)), boxes.box(boxes.bottom))
+        self.assertEqual(((0, 4), (0, 4)), boxes.box(boxes.top))
+        self.assertEqual([2, 4], list(boxes.above(boxes.bottom)))
+        self.assertEqual([0, 3], list(boxes.above(2)))
+        self.assertEqual([2, 4], list(boxes.under(3)))
+        self.assertEqual([], list(boxes.above(boxes.top)))
+        self.assertEqual(7, len(list(boxes.edges())))
+        self.assertEqual(box_lattice(GammaFree(self.matrix)), boxes.lattice())
+
+    def test_hierarchical_decomposition(self):
+        boxes = box_lattice(GammaFree(self.matrix), compact=True)
+        height = boxes.hierarchical_decomposition()
+        self.assertEqual(len(boxes), len(height))
+        self.assertEqual(max(height), height[boxes.bottom])
+        self.assertEqual(0, height[boxes.top])
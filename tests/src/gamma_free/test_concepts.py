@@ -1,7 +1,9 @@
 import unittest
 
 from tbs.gamma_free.concepts import line_concept_from_dlo_gamma_free_matrix, \
-    column_concept_from_dlo_gamma_free_matrix, concepts_from_dlo_gamma_free_matrix
+    column_concept_from_dlo_gamma_free_matrix, concepts_from_dlo_gamma_free_matrix, \
+    iter_concepts_from_dlo_gamma_free_matrix, concepts_array_from_dlo_gamma_free_matrix
+from tbs.contextmatrix import SparseMatrix
 
 
 class TestConcepts(unittest.TestCase):
@@ -22,4 +24,14 @@ class TestConcepts(unittest.TestCase):
 
     def test_trace_from_context_matrix(self):
         self.assertEqual(concepts_from_dlo_gamma_free_matrix(self.matrix),
-                         {(0, 0), (2, 0)})
\ No newline at end of file
+                         {(0, 0), (2, 0)})
+
+    def test_iter_concepts(self):
+        concepts = iter_concepts_from_dlo_gamma_free_matrix(self.matrix)
+        self.assertEqual((2, 0), next(concepts))
+        self.assertEqual([(0, 0)], list(concepts))
+        self.assertEqual([(2, 0), (0, 0)], list(iter_concepts_from_dlo_gamma_free_matrix(SparseMatrix(self.matrix))))
+
+    def test_concepts_array(self):
+        self.assertEqual([2, 0, 0, 0], list(concepts_array_from_dlo_gamma_free_matrix(self.matrix)))
+        self.assertEqual("i", concepts_array_from_dlo_gamma_free_matrix(self.matrix).typecode)
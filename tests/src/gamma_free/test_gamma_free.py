@@ -1,7 +1,8 @@
 import unittest
 
-from tbs.gamma_free._gamma_free import GammaFree, gamma_free_matrix_top_down, gamma_free_matrix_bottom_up
-from tbs.contextmatrix import ContextMatrix
+from tbs.gamma_free._gamma_free import GammaFree, gamma_free_matrix_top_down, gamma_free_matrix_bottom_up, \
+    gamma_free_lines_top_down, gamma_free_lines_bottom_up, first_gamma
+from tbs.contextmatrix import ContextMatrix, SparseMatrix
 
 
 class TestIsGammaFree(unittest.TestCase):
@@ -27,6 +28,63 @@ class TestIsGammaFree(unittest.TestCase):
         self.assertTrue(gamma_free_matrix_bottom_up(self.matrix))
         self.assertEqual([[0, 1, 0, 0], [0, 1, 0, 1], [0, 0, 1, 1]], self.matrix)
 
+    def test_transform_read_only(self):
+        for storage in ("bits", "sparse", "overlay"):
+            matrix = ContextMatrix(self.matrix, storage=storage).matrix
+            self.assertFalse(gamma_free_matrix_top_down(matrix))
+            self.assertRaises(ValueError, gamma_free_matrix_top_down, matrix, True)
+            self.assertRaises(ValueError, gamma_free_matrix_bottom_up, matrix, True)
+
+
+class TestLinesEngines(unittest.TestCase):
+    def setUp(self):
+        self.lines_ones = [[1, 2], [1, 3], [2, 3]]
+
+    def test_first_gamma(self):
+        self.assertEqual((0, 1, 1, 2), first_gamma([[0, 1, 1, 0], [0, 1, 0, 1], [0, 0, 1, 1]]))
+        self.assertEqual((0, 1, 1, 2), first_gamma(SparseMatrix.from_ones(self.lines_ones, 4)))
+        self.assertIsNone(first_gamma([[0, 1, 1, 0], [0, 1, 1, 1], [0, 0, 1, 1]]))
+
+    def test_top_down(self):
+        self.assertEqual((False, []), gamma_free_lines_top_down(self.lines_ones))
+        self.assertEqual((False, [(1, 2)]), gamma_free_lines_top_down(self.lines_ones, True))
+        self.assertEqual((True, []), gamma_free_lines_top_down([[1, 2], [1, 2, 3], [2, 3]], True))
+
+    def test_bottom_up(self):
+        self.assertEqual((False, [(0, 2)]), gamma_free_lines_bottom_up(self.lines_ones, True))
+
+    def test_sparse_approximation(self):
+        context_matrix = ContextMatrix([[1, 1, 0], [1, 0, 1], [0, 1, 1]], storage="sparse")
+        approximation = GammaFree.from_approximation(context_matrix)
+        self.assertEqual("sparse", approximation.storage)
+        self.assertEqual(GammaFree.from_approximation(ContextMatrix(context_matrix.matrix)).matrix,
+                         approximation.matrix)
+
+
+class TestApproximationDelta(unittest.TestCase):
+    def setUp(self):
+        self.context_matrix = ContextMatrix([[1, 1, 0], [1, 0, 1], [0, 1, 1]])
+
+    def test_top_down(self):
+        gamma_free, delta = GammaFree.from_approximation_delta(self.context_matrix)
+        self.assertEqual([(1, 1)], delta)
+        self.assertEqual("overlay", gamma_free.storage)
+        self.assertIs(self.context_matrix.matrix, gamma_free.matrix.base)
+        self.assertEqual(GammaFree.from_approximation(self.context_matrix).matrix, gamma_free.matrix)
+        self.assertEqual(((1, 1, 0), (1, 0, 1), (0, 1, 1)), self.context_matrix.matrix)
+
+    def test_bottom_up(self):
+        gamma_free, delta = GammaFree.from_approximation_delta(self.context_matrix, top_down=False)
+        matrix = [list(line) for line in self.context_matrix.matrix]
+        gamma_free_matrix_bottom_up(matrix, True)
+        self.assertEqual(tuple(tuple(line) for line in matrix), gamma_free.matrix)
+        self.assertEqual([(0, 1)], delta)
+        self.assertTrue(gamma_free.is_gamma_free())
+
+    def test_gamma_free(self):
+        gamma_free, delta = GammaFree.from_approximation_delta(ContextMatrix([[1, 1], [0, 1]]))
+        self.assertEqual([], delta)
+
 
 class TestLimitCaseBottomUp(unittest.TestCase):
     def test_0_and_propagate(self):
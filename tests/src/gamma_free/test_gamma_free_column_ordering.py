@@ -2,7 +2,8 @@ import unittest
 
 from tbs.graph import DirectedGraph
 from tbs.gamma_free._gamma_free import GammaFree
-from tbs.gamma_free._gamma_free_column_ordering import _column_intersection_graphs, matrix_count_number_1_under, _order_refinement
+from tbs.gamma_free._gamma_free_column_ordering import _column_intersection_graphs, matrix_count_number_1_under, _order_refinement, \
+    _column_signatures_order, gamma_free_column_order
 
 
 class TestStronglyChordalToGammaFree(unittest.TestCase):
@@ -67,3 +68,25 @@ class TestStronglyChordalToGammaFree(unittest.TestCase):
 
         context_matrix.reorder_gamma_free_from_strongly_chordal_element_order()
         self.assertEqual(attributes_orig, context_matrix.attributes)
+
+    def test_signatures_order(self):
+        matrix = [[1, 0, 0, 1, 1, 0],
+                  [0, 1, 0, 0, 0, 1],
+                  [0, 0, 1, 1, 1, 1]]
+        order = _column_signatures_order(matrix)
+        self.assertEqual([0, 1, 2, 3, 4, 5], order)
+        graph = _column_intersection_graphs(matrix)
+        for x in graph:
+            for y in graph(x):
+                self.assertLess(order.index(x), order.index(y))
+
+        self.assertEqual([1, 0, 2], _column_signatures_order([[1, 1, 0], [1, 0, 1], [0, 0, 1]]))
+
+    def test_context_matrix_signatures(self):
+        context_matrix = GammaFree([[0, 1, 0, 0, 1, 0],
+                                    [0, 0, 0, 1, 0, 0],
+                                    [0, 1, 0, 1, 1, 0]])
+        context_matrix.reorder_gamma_free_from_strongly_chordal_element_order(engine="signatures")
+        self.assertEqual((0, 1, 2), context_matrix.elements)
+        self.assertTrue(context_matrix.is_gamma_free())
+        self.assertRaises(ValueError, gamma_free_column_order, context_matrix, "unknown")
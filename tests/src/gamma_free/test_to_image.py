@@ -0,0 +1,31 @@
+import unittest
+
+from PIL import Image
+
+from tbs.gamma_free.to_image import create_image_from_dlo_gamma_free_matrix, \
+    create_image_tiles_from_dlo_gamma_free_matrix, color_space_grey
+
+
+class TestToImage(unittest.TestCase):
+    def setUp(self):
+        self.matrix = [[1, 1, 0, 0],
+                       [1, 1, 0, 1],
+                       [0, 0, 1, 1]]
+
+    def test_image(self):
+        image = create_image_from_dlo_gamma_free_matrix(self.matrix, pixel_size=2)
+        self.assertEqual((8, 6), image.size)
+        self.assertEqual((255, 255, 255), image.getpixel((4, 0)))
+        self.assertEqual(image.getpixel((0, 0)), image.getpixel((3, 1)))
+        self.assertNotEqual(image.getpixel((0, 0)), image.getpixel((0, 2)))
+
+    def test_tiles(self):
+        image = create_image_from_dlo_gamma_free_matrix(self.matrix, color_space_grey, pixel_size=3)
+        tiles = list(create_image_tiles_from_dlo_gamma_free_matrix(self.matrix, 5, color_space_grey, pixel_size=3))
+        self.assertEqual([(0, 0), (5, 0), (10, 0), (0, 5), (5, 5), (10, 5)], [position for position, tile in tiles])
+        self.assertEqual((2, 4), tiles[-1][1].size)
+
+        tiled_image = Image.new("RGB", image.size)
+        for position, tile in tiles:
+            tiled_image.paste(tile, position)
+        self.assertEqual(image.tobytes(), tiled_image.tobytes())
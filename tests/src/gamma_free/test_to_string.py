@@ -1,6 +1,8 @@
 import unittest
+import io
+from tbs.contextmatrix import ContextMatrix
 from tbs.dismantlable import DismantlableLattice
-from tbs.gamma_free import GammaFree, to_string
+from tbs.gamma_free import GammaFree, to_string, write_string
 from tbs.graph import DirectedGraph
 
 
@@ -44,3 +46,100 @@ class TestDismantlableLattice(unittest.TestCase):
                  " +-----------------+"
         
         self.assertEqual(string_repr, result)
+
+
+class TestBoxRows(unittest.TestCase):
+    def setUp(self):
+        self.context_matrix = GammaFree([[1, 1, 0, 0],
+                                         [1, 1, 0, 1],
+                                         [0, 0, 1, 1]], elements="xyz", attributes="abcd")
+        self.result = " |a b c d ⊤ " + "\n" + \
+                      "-+---+-+-+-+" + "\n" + \
+                      "x| a |---|⊤|" + "\n" + \
+                      " +---+ +-+-+" + "\n" + \
+                      "y| a |-| d |" + "\n" + \
+                      " +---+-+---+" + "\n" + \
+                      "z|.|.|  c  |" + "\n" + \
+                      " +---+-----+" + "\n" + \
+                      "⊥|    ⊥    |" + "\n" + \
+                      " +---------+"
+
+    def test_to_string(self):
+        self.assertEqual(self.result, to_string(self.context_matrix))
+
+    def test_write_string(self):
+        f = io.StringIO()
+        write_string(self.context_matrix, f)
+        self.assertEqual(self.result + "\n", f.getvalue())
+
+    def test_window(self):
+        result = " |c d ⊤ " + "\n" + \
+                 "-+-+-+-+" + "\n" + \
+                 "y|-| d |" + "\n" + \
+                 " +-+---+" + "\n" + \
+                 "z|  c  |" + "\n" + \
+                 " +-----+"
+        self.assertEqual(result, to_string(self.context_matrix, lines=(1, 3), columns=(2, 5)))
+
+
+class TestBaselineDrawing(unittest.TestCase):
+    def assert_drawing(self, matrix, result):
+        gamma_free = GammaFree.from_approximation(ContextMatrix(matrix).reorder_doubly_lexical())
+        self.assertEqual(result, to_string(gamma_free))
+
+    def test_up_edges(self):
+        self.assert_drawing([[0, 1, 1, 1, 1],
+                             [1, 1, 0, 0, 1],
+                             [0, 0, 0, 0, 0],
+                             [0, 1, 1, 0, 0]],
+                            " |0 3 4 2 1 ⊤ " + "\n" +
+                            "-+-+-+-+-+-+-+" + "\n" +
+                            "2|. . . . .|⊤|" + "\n" +
+                            " +-+ +-+ +-+-+" + "\n" +
+                            "1|0|-|4|-| 1 |" + "\n" +
+                            " +-+ +-+-+---+" + "\n" +
+                            "3|| . ||  2  |" + "\n" +
+                            " +|+---+-----+" + "\n" +
+                            "0|||    3    |" + "\n" +
+                            " +-+---------+" + "\n" +
+                            "⊥|     ⊥     |" + "\n" +
+                            " +-----------+")
+
+    def test_wide_box(self):
+        self.assert_drawing([[1, 1, 0, 1, 1],
+                             [1, 1, 0, 0, 0],
+                             [0, 1, 1, 0, 0],
+                             [1, 1, 1, 1, 0]],
+                            " |4 3 0 2 1 ⊤ " + "\n" +
+                            "-+-+-+-+-+---+" + "\n" +
+                            "1|. .|0|-|   |" + "\n" +
+                            " +-+-+-+ | ⊤ |" + "\n" +
+                            "0|4| 3 |.|   |" + "\n" +
+                            " +-+---+-+---+" + "\n" +
+                            "2|| .|.|  2  |" + "\n" +
+                            " +|+---+-----+" + "\n" +
+                            "3|||    3    |" + "\n" +
+                            " +-+---------+" + "\n" +
+                            "⊥|     ⊥     |" + "\n" +
+                            " +-----------+")
+
+    def test_bottom_line(self):
+        self.assert_drawing([[0, 1, 1, 0, 0],
+                             [1, 1, 1, 1, 1],
+                             [0, 0, 1, 1, 0],
+                             [0, 0, 0, 0, 0],
+                             [0, 1, 1, 1, 1]],
+                            " |0 4 1 3 2 ⊤ " + "\n" +
+                            "-+-+-+-+-+-+-+" + "\n" +
+                            "3|. . . . .|⊤|" + "\n" +
+                            " +   +-+ +-+-+" + "\n" +
+                            "0|. .|1|-| 2 |" + "\n" +
+                            " +   +-+-+---+" + "\n" +
+                            "2|. . ||  3  |" + "\n" +
+                            " + +---+-----+" + "\n" +
+                            "4|.|    4    |" + "\n" +
+                            " +-+---------+" + "\n" +
+                            "1|           |" + "\n" +
+                            " |     ⊥     |" + "\n" +
+                            "⊥|           |" + "\n" +
+                            " +-----------+")
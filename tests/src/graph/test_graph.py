@@ -47,6 +47,17 @@ class TestInit(unittest.TestCase):
         self.assertEqual(frozenset(d), frozenset(g))
         self.assertEqual({frozenset({1, 2})}, g.edges)
 
+    def test_from_dissimilarity_thresholds(self):
+        d = Diss(range(1, 5)).update(lambda x, y: x + y)
+        graphs = [(threshold, set(g.edges)) for threshold, g in Graph.from_dissimilarity_thresholds(d, [2, 4, 6, None])]
+        self.assertEqual([(2, set()),
+                          (4, {frozenset({1, 2}), frozenset({1, 3})}),
+                          (6, {frozenset({1, 2}), frozenset({1, 3}), frozenset({1, 4}), frozenset({2, 3}),
+                               frozenset({2, 4})}),
+                          (None, Graph.from_dissimilarity(d).edges)], graphs)
+        self.assertEqual(Graph.from_dissimilarity(Diss(d).update(d), 5).edges, Graph.from_dissimilarity(d, 5).edges)
+        self.assertRaises(ValueError, list, Graph.from_dissimilarity_thresholds(d, [4, 2]))
+
 
 class TestDifferencesWithMixedGraph(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,28 @@
+import unittest
+
+from tbs.randomize import random_gamma_free_matrix
+from tbs.contextmatrix import SparseMatrix, BitMatrix
+from tbs.gamma_free import GammaFree
+
+
+class TestRandomGammaFreeMatrix(unittest.TestCase):
+    def test_seed(self):
+        self.assertEqual(random_gamma_free_matrix(30, 20, seed=42), random_gamma_free_matrix(30, 20, seed=42))
+
+    def test_storage(self):
+        self.assertIsInstance(random_gamma_free_matrix(10, 5, seed=1), SparseMatrix)
+        self.assertIsInstance(random_gamma_free_matrix(10, 5, seed=1, storage="bits"), BitMatrix)
+        self.assertEqual(random_gamma_free_matrix(10, 5, seed=1),
+                         random_gamma_free_matrix(10, 5, seed=1, storage="bits"))
+
+    def test_every_column_has_a_1(self):
+        matrix = random_gamma_free_matrix(10, 30, seed=2, storage="dense")
+        self.assertEqual(10, len(matrix))
+        for j in range(30):
+            self.assertTrue(any(line[j] for line in matrix))
+
+    def test_gamma_free(self):
+        for seed in range(20):
+            context_matrix = GammaFree(random_gamma_free_matrix(12, 12, .8, seed=seed, storage="dense"))
+            context_matrix.reorder_doubly_lexical()
+            self.assertTrue(context_matrix.is_gamma_free())